@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+Benchmarks for the whole-publication analyses
+(link graph, orphan report, text extraction,
+search index, content statistics, diff,
+integrity verification, and validation),
+on a synthetic publication
+(see :mod:`benchmarks.generator`).
+
+    $ python benchmarks/bench_analysis.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from benchmarks import generator
+from yael import ContentStatistics
+from yael import LinkGraph
+from yael import OrphanReport
+from yael import Publication
+from yael import PublicationDiff
+from yael import SearchIndex
+from yael import ValidationReport
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+STATE = {}
+
+def setup():
+    if len(STATE) > 0:
+        return
+    STATE["path"] = generator.fixture(
+        manifest_size=2000,
+        spine_length=200,
+        paragraphs=100)
+    publication = Publication(path=STATE["path"])
+    STATE["publication"] = publication
+    STATE["rendition"] = publication.container.default_rendition
+    STATE["link_graph"] = LinkGraph(rendition=STATE["rendition"])
+    STATE["search_index"] = SearchIndex(publication=publication)
+    # the same edition, compressed and uncompressed
+    for compressed in [True, False]:
+        STATE[("diff", compressed)] = Publication(path=generator.fixture(
+            manifest_size=2000,
+            spine_length=200,
+            paragraphs=100,
+            compressed=compressed))
+
+def time_link_graph():
+    LinkGraph(rendition=STATE["rendition"], max_workers=1)
+
+def time_orphan_report():
+    OrphanReport(publication=STATE["publication"], link_graph=STATE["link_graph"])
+
+def time_text_chunks():
+    for chunk in STATE["publication"].text_chunks():
+        pass
+
+def time_search_index():
+    SearchIndex(publication=STATE["publication"])
+
+def time_search_phrase():
+    STATE["search_index"].search("alpha bravo charlie")
+
+def time_search_prefix():
+    STATE["search_index"].search("ch*")
+
+def time_diff(manifestation):
+    # compressed: central directories only;
+    # uncompressed: the files with the same size are read
+    PublicationDiff(
+        STATE["publication"],
+        STATE[("diff", manifestation == "compressed")])
+time_diff.params = [["compressed", "uncompressed"]]
+time_diff.param_names = ["manifestation"]
+
+def time_statistics():
+    # no cache, so that all the content documents are parsed
+    ContentStatistics(publication=STATE["publication"], max_workers=1)
+
+def time_verify(max_workers):
+    # every ZIP entry is decompressed and CRC-checked
+    STATE[("diff", True)].verify(max_workers=max_workers)
+time_verify.params = [[1, 4]]
+time_verify.param_names = ["max_workers"]
+
+def time_validate(source):
+    # model: the rules only;
+    # path: parsing with ValidationReport.PARSING_OPTIONS, then the rules
+    if source == "model":
+        STATE["publication"].validate()
+    else:
+        ValidationReport(path=STATE["path"])
+time_validate.params = [["model", "path"]]
+time_validate.param_names = ["source"]
+
+if __name__ == "__main__":
+    from benchmarks import run
+    run.run(["benchmarks.bench_analysis"])
+
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+Benchmarks for reading assets,
+(de)obfuscating fonts,
+and serializing a publication to JSON,
+computing the size of and copying an uncompressed publication,
+on a synthetic publication
+(see :mod:`benchmarks.generator`).
+
+    $ python benchmarks/bench_asset.py
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from benchmarks import generator
+from yael import Asset
+from yael import DirectoryIndex
+from yael import Obfuscation
+from yael import Publication
+import yael.util
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+MANIFESTATIONS = ["compressed", "uncompressed"]
+
+#: the internal path of an asset of each kind
+ASSETS = {
+    "xhtml": "OEBPS/Text/c10.xhtml",
+    "image": "OEBPS/Images/i10.png",
+    "font": "OEBPS/Fonts/f0.otf",
+}
+
+#: a (fake) 64 KB font
+FONT = bytes(bytearray(i % 256 for i in range(65536)))
+
+PUBLICATIONS = {}
+
+def setup():
+    if len(PUBLICATIONS) > 0:
+        return
+    PUBLICATIONS["compressed"] = Publication(path=generator.fixture(compressed=True))
+    PUBLICATIONS["uncompressed"] = Publication(path=generator.fixture(compressed=False))
+
+def time_contents(manifestation, kind):
+    PUBLICATIONS[manifestation].assets[ASSETS[kind]].contents
+time_contents.params = [MANIFESTATIONS, sorted(ASSETS)]
+time_contents.param_names = ["manifestation", "kind"]
+
+def time_contents_spine(manifestation):
+    publication = PUBLICATIONS[manifestation]
+    for internal_path in publication.container.default_rendition.pac_document.files_referenced_spine:
+        publication.assets[internal_path].contents
+time_contents_spine.params = [MANIFESTATIONS]
+time_contents_spine.param_names = ["manifestation"]
+
+def time_batch_contents_spine(manifestation):
+    publication = PUBLICATIONS[manifestation]
+    Asset.batch_contents(list(
+        publication.assets[p] for p in
+        publication.container.default_rendition.pac_document.files_referenced_spine))
+time_batch_contents_spine.params = [MANIFESTATIONS]
+time_batch_contents_spine.param_names = ["manifestation"]
+
+def time_size(indexed):
+    publication = PUBLICATIONS["uncompressed"]
+    if indexed:
+        publication.size
+    else:
+        yael.util.directory_size(publication.path)
+time_size.params = [[False, True]]
+time_size.param_names = ["indexed"]
+
+def time_directory_index():
+    DirectoryIndex(PUBLICATIONS["uncompressed"].path)
+
+def time_copy_all(kernel):
+    source = PUBLICATIONS["uncompressed"].path
+    destination = tempfile.mkdtemp(prefix="yael-bench-copy-")
+    try:
+        if kernel:
+            PUBLICATIONS["uncompressed"].directory_index.copy_all(destination)
+        else:
+            shutil.rmtree(destination)
+            shutil.copytree(source, destination)
+    finally:
+        shutil.rmtree(destination, True)
+time_copy_all.params = [[False, True]]
+time_copy_all.param_names = ["kernel"]
+
+def time_obfuscate_data(algorithm):
+    yael.util.obfuscate_data(FONT, generator.UNIQUE_IDENTIFIER, algorithm)
+time_obfuscate_data.params = [[Obfuscation.ADOBE, Obfuscation.IDPF]]
+time_obfuscate_data.param_names = ["algorithm"]
+
+def time_json_string(recursive):
+    PUBLICATIONS["compressed"].json_string(recursive=recursive)
+time_json_string.params = [[False, True]]
+time_json_string.param_names = ["recursive"]
+
+def time_json_string_clean():
+    PUBLICATIONS["compressed"].json_string(pretty=True, clean=True)
+
+if __name__ == "__main__":
+    from benchmarks import run
+    run.run(["benchmarks.bench_asset"])
+
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+Benchmarks for the import time of yael,
+measured with `python -X importtime` (Python 3.7 or later)
+in a child process, for some typical import statements.
+
+The value of each benchmark is the best, over a few runs,
+of the total cumulative import time of the modules
+imported by the statement (after the interpreter startup),
+in microseconds.
+
+    $ python benchmarks/bench_import.py
+"""
+
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+#: the import statements, by name
+STATEMENTS = {
+    "package": "import yael",
+    "parsing": "from yael import Parsing",
+    "publication": "from yael import Publication",
+    "simpleepub": "from yael import SimpleEPUB",
+    "all": "from yael import *",
+}
+
+#: the number of runs of each statement
+RUNS = 5
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+def _import_time(statement):
+    # return the cumulative import time, in microseconds,
+    # of the top-level modules imported by the given statement,
+    # that is, after the `site` module imported at startup
+    output = subprocess.check_output(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.STDOUT,
+        cwd=ROOT_DIRECTORY)
+    total = 0
+    for line in output.decode("utf-8").splitlines():
+        fields = line.split("|")
+        if (
+                (len(fields) != 3) or
+                (not fields[1].strip().isdigit()) or
+                (fields[2].startswith("  "))):
+            continue
+        if fields[2].strip() == "site":
+            total = 0
+        else:
+            total += int(fields[1])
+    return total
+
+def setup():
+    # compile the modules once (even if PYTHONDONTWRITEBYTECODE is set),
+    # so that the timed runs do not pay for it
+    subprocess.check_call(
+        [sys.executable, "-m", "compileall", "-q", "yael"],
+        cwd=ROOT_DIRECTORY)
+
+def track_import_time(name):
+    return min(_import_time(STATEMENTS[name]) for i in range(RUNS))
+track_import_time.params = [sorted(STATEMENTS)]
+track_import_time.param_names = ["statement"]
+track_import_time.unit = "us"
+
+if __name__ == "__main__":
+    from benchmarks import run
+    run.run(["benchmarks.bench_import"])
+
+
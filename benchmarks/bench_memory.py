@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+Benchmarks for the memory footprint of the model objects
+(bytes per instance, measured with `tracemalloc`),
+of a whole parsed synthetic publication
+(see :mod:`benchmarks.generator`),
+and for the access to their attributes.
+
+The peak memory (RSS) needed to parse large Navigation Documents,
+NCX TOCs, and Media Overlay Documents,
+in tree mode and in streaming mode
+(see :func:`yael.element.Element.parse_stream`),
+is measured in a child process, on POSIX systems.
+
+    $ python benchmarks/bench_memory.py
+"""
+
+import atexit
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from benchmarks import generator
+from yael import MOAudio
+from yael import MOPar
+from yael import MOText
+from yael import NavNode
+from yael import NCXTocNode
+from yael import OPFDC
+from yael import OPFItem
+from yael import OPFItemref
+from yael import OPFMeta3
+from yael import Parsing
+from yael import Publication
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+#: the model classes, by name
+CLASSES = dict((c.__name__, c) for c in [
+    MOAudio,
+    MOPar,
+    MOText,
+    NavNode,
+    NCXTocNode,
+    OPFDC,
+    OPFItem,
+    OPFItemref,
+    OPFMeta3,
+])
+
+#: the number of instances allocated to measure the size of one
+INSTANCES = 10000
+
+#: the number of attribute accesses of each timed run
+ACCESSES = 100000
+
+#: the documents parsed to measure the peak memory,
+#: with their class and internal path in the synthetic publication
+DOCUMENTS = {
+    "nav": ("NavDocument", "OEBPS/nav.xhtml"),
+    "ncx": ("NCXToc", "OEBPS/toc.ncx"),
+    "smil": ("MODocument", "OEBPS/Smil/s0.smil"),
+}
+
+#: the generator parameters of each document size
+SIZES = {
+    "small": dict(toc_breadth=30, smil_density=1000),
+    "large": dict(toc_breadth=300, smil_density=100000),
+}
+
+#: the script measuring the peak memory (in KB) of parsing a document
+#: (on Linux, ru_maxrss might be inherited from the parent process,
+#: hence the high water mark of the process is read from /proc)
+PEAK_RSS_SCRIPT = """
+import resource
+import sys
+sys.path.insert(0, sys.argv[1])
+import yael
+def peak():
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except IOError:
+        pass
+    if sys.platform == "darwin":
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+element_class = getattr(yael, sys.argv[2])
+before = peak()
+element = element_class()
+with open(sys.argv[3], "rb") as source:
+    if sys.argv[4] == "streaming":
+        element.parse_stream(source)
+    else:
+        element.parse_string(source.read())
+print(peak() - before)
+"""
+
+DOCUMENT_PATHS = {}
+
+ITEM = OPFItem()
+ITEM.v_href = "Text/c0.xhtml"
+
+def _traced(function):
+    # return the number of bytes allocated (and kept alive) by function()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = function()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return after - before
+
+def track_instance_size(name):
+    cls = CLASSES[name]
+    # do not count the list holding the instances
+    return float(_traced(lambda: [cls() for i in range(INSTANCES)])) / INSTANCES - 8
+track_instance_size.params = [sorted(CLASSES)]
+track_instance_size.param_names = ["class"]
+track_instance_size.unit = "bytes"
+
+def track_publication_size():
+    path = generator.fixture(smil_count=10)
+    return _traced(lambda: Publication(
+        path=path,
+        parsing_options=[Parsing.NAV, Parsing.NCX, Parsing.MEDIA_OVERLAY]))
+track_publication_size.unit = "bytes"
+
+def _document_path(document, size):
+    # write the given document of a synthetic publication to a temporary file
+    key = (document, size)
+    if key not in DOCUMENT_PATHS:
+        if len(DOCUMENT_PATHS) == 0:
+            directory = tempfile.mkdtemp(prefix="yael_bench_")
+            atexit.register(shutil.rmtree, directory, True)
+            DOCUMENT_PATHS[None] = directory
+        kwargs = dict(SIZES[size], smil_count=1, spine_length=5, manifest_size=10)
+        contents = dict(generator.files(**kwargs))[DOCUMENTS[document][1]]
+        path = os.path.join(DOCUMENT_PATHS[None], "%s_%s" % (document, size))
+        with open(path, "wb") as output_file:
+            output_file.write(contents)
+        DOCUMENT_PATHS[key] = path
+    return DOCUMENT_PATHS[key]
+
+def track_parse_peak_rss(document, size, mode):
+    root = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    output = subprocess.check_output([
+        sys.executable,
+        "-c",
+        PEAK_RSS_SCRIPT,
+        root,
+        DOCUMENTS[document][0],
+        _document_path(document, size),
+        mode])
+    return int(output.decode("ascii").strip())
+track_parse_peak_rss.params = [sorted(DOCUMENTS), sorted(SIZES), ["tree", "streaming"]]
+track_parse_peak_rss.param_names = ["document", "size", "mode"]
+track_parse_peak_rss.unit = "KB"
+
+def time_attribute_read():
+    item = ITEM
+    for i in range(ACCESSES):
+        item.v_href
+
+def time_attribute_write():
+    item = ITEM
+    for i in range(ACCESSES):
+        item.v_href = "Text/c1.xhtml"
+
+if __name__ == "__main__":
+    from benchmarks import run
+    run.run(["benchmarks.bench_memory"])
+
+
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+Benchmarks for parsing a Package Document
+with heavily refined EPUB 3 metadata:
+many contributors, each with `role`, `file-as`,
+and `alternate-script` refinements,
+the `role` being refined again (a refinement chain).
+
+    $ python benchmarks/bench_opf.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from yael import OPFPacDocument
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+#: the number of contributors
+CONTRIBUTORS = 2000
+
+#: the number of manifest items
+ITEMS = 2000
+
+STRINGS = {}
+
+def opf_string(contributors, items):
+    """
+    Return a Package Document string with the given number
+    of refined contributors and of manifest items.
+
+    :param contributors: the number of contributors
+    :type  contributors: int
+    :param items:        the number of manifest items
+    :type  items:        int
+    :rtype:              bytes
+    """
+    metadata = ['<dc:identifier id="uid">urn:uuid:bench</dc:identifier>']
+    for i in range(contributors):
+        metadata.append('<dc:contributor id="c%d">Name %d</dc:contributor>' % (i, i))
+        metadata.append('<meta refines="#c%d" property="role" scheme="marc:relators" id="r%d">trl</meta>' % (i, i))
+        metadata.append('<meta refines="#r%d" property="display-seq">%d</meta>' % (i, i))
+        metadata.append('<meta refines="#c%d" property="file-as">%d, Name</meta>' % (i, i))
+        metadata.append('<meta refines="#c%d" property="alternate-script" xml:lang="ja">%d</meta>' % (i, i))
+    manifest = []
+    spine = []
+    for i in range(items):
+        manifest.append('<item id="i%d" href="Text/c%d.xhtml" media-type="application/xhtml+xml"/>' % (i, i))
+        spine.append('<itemref idref="i%d"/>' % i)
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="uid">\n'
+        '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">\n%s\n</metadata>\n'
+        '<manifest>\n%s\n</manifest>\n'
+        '<spine>\n%s\n</spine>\n'
+        '</package>\n' % ("\n".join(metadata), "\n".join(manifest), "\n".join(spine))
+    ).encode("utf-8")
+
+def setup():
+    if len(STRINGS) > 0:
+        return
+    STRINGS["refined"] = opf_string(CONTRIBUTORS, ITEMS)
+
+def time_parse_refined():
+    OPFPacDocument(string=STRINGS["refined"], internal_path="OEBPS/content.opf")
+
+if __name__ == "__main__":
+    from benchmarks import run
+    run.run(["benchmarks.bench_opf"])
+
+
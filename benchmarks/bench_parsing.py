@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+Benchmarks for parsing a synthetic publication
+(see :mod:`benchmarks.generator`),
+compressed and uncompressed,
+with several combinations of :class:`yael.parsing.Parsing` options,
+and with several renditions, parsed eagerly or lazily,
+and for checking a parsed publication for changes.
+
+    $ python benchmarks/bench_parsing.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from benchmarks import generator
+from yael import Parsing
+from yael import Publication
+from yael import SimpleEPUB
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+#: the combinations of parsing options:
+#: the defaults, each feature disabled in turn, and all features disabled
+PARSING_OPTIONS = {
+    "default": [],
+    "no_asset_refs": [Parsing.NO_ASSET_REFS],
+    "no_encryption": [Parsing.NO_ENCRYPTION],
+    "no_media_overlay": [Parsing.NO_MEDIA_OVERLAY],
+    "no_multiple_renditions": [Parsing.NO_MULTIPLE_RENDITIONS],
+    "no_ncx": [Parsing.NO_NCX],
+    "no_nav": [Parsing.NO_NAV],
+    "none": [
+        Parsing.NO_ASSET_REFS,
+        Parsing.NO_ENCRYPTION,
+        Parsing.NO_MEDIA_OVERLAY,
+        Parsing.NO_MULTIPLE_RENDITIONS,
+        Parsing.NO_NCX,
+        Parsing.NO_NAV,
+    ],
+}
+
+MANIFESTATIONS = ["compressed", "uncompressed"]
+
+PATHS = {}
+
+PUBLICATIONS = {}
+
+def setup():
+    if len(PATHS) > 0:
+        return
+    PATHS["compressed"] = generator.fixture(compressed=True)
+    PATHS["uncompressed"] = generator.fixture(compressed=False)
+    PATHS["large"] = generator.fixture(
+        manifest_size=5000,
+        spine_length=500,
+        paragraphs=20,
+        toc_depth=3,
+        toc_breadth=12,
+        smil_count=100)
+    PATHS["renditions"] = generator.fixture(renditions=4)
+    for manifestation in MANIFESTATIONS:
+        PUBLICATIONS[manifestation] = Publication(path=PATHS[manifestation])
+
+def time_publication(manifestation, options):
+    Publication(path=PATHS[manifestation], parsing_options=PARSING_OPTIONS[options])
+time_publication.params = [MANIFESTATIONS, sorted(PARSING_OPTIONS)]
+time_publication.param_names = ["manifestation", "options"]
+
+def time_publication_large():
+    Publication(path=PATHS["large"])
+
+def time_publication_renditions(mode):
+    if mode == "all":
+        Publication(path=PATHS["renditions"])
+    elif mode == "selected":
+        Publication(path=PATHS["renditions"], rendition_criteria={"language": "fr"})
+    else:
+        publication = Publication(path=PATHS["renditions"], rendition_criteria={})
+        publication.parse_renditions()
+time_publication_renditions.params = [["all", "selected", "selected_then_parallel"]]
+time_publication_renditions.param_names = ["mode"]
+
+def time_refresh_unchanged(manifestation):
+    PUBLICATIONS[manifestation].refresh()
+time_refresh_unchanged.params = [MANIFESTATIONS]
+time_refresh_unchanged.param_names = ["manifestation"]
+
+def time_simpleepub(manifestation):
+    SimpleEPUB(path=PATHS[manifestation])
+time_simpleepub.params = [MANIFESTATIONS]
+time_simpleepub.param_names = ["manifestation"]
+
+if __name__ == "__main__":
+    from benchmarks import run
+    run.run(["benchmarks.bench_parsing"])
+
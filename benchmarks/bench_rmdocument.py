@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+Benchmarks for parsing a large Rendition Mapping Document
+(one location per page of a two-rendition comic)
+and for mapping references from one rendition to the other,
+with the index of :class:`yael.rmdocument.RMDocument`
+and with a scan of all the points.
+
+    $ python benchmarks/bench_rmdocument.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from benchmarks import generator
+from yael import RMDocument
+import yael.util
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+#: the number of pages (hence of locations)
+PAGES = 5000
+
+#: the full paths of the Package Documents of the two renditions
+SOURCE = "OEBPS/content.opf"
+TARGET = "OEBPS/content-r1.opf"
+
+DOCUMENTS = {}
+
+def setup():
+    if len(DOCUMENTS) > 0:
+        return
+    DOCUMENTS["string"] = generator._mapping_xhtml({
+        "spine_length": PAGES,
+        "renditions": 2,
+    }).encode("utf-8")
+    DOCUMENTS["parsed"] = RMDocument(
+        string=DOCUMENTS["string"],
+        internal_path=generator.MAPPING_XHTML)
+    DOCUMENTS["references"] = list(
+        "OEBPS/Text/c%d.xhtml" % i for i in range(0, PAGES, PAGES // 100))
+
+def _scan(rm_document, reference):
+    # the lookup without the index: scan the points of all the locations
+    for location in rm_document.locations:
+        found = False
+        for point in location.points:
+            if (point.v_epub_rendition == SOURCE) and (point.v_href == reference):
+                found = True
+        if found:
+            for point in location.points:
+                if point.v_epub_rendition == TARGET:
+                    return yael.util.split_reference(point.v_href).get("base")
+    return None
+
+def time_parse():
+    RMDocument(string=DOCUMENTS["string"], internal_path=generator.MAPPING_XHTML)
+
+def time_map_reference(indexed):
+    rm_document = DOCUMENTS["parsed"]
+    for reference in DOCUMENTS["references"]:
+        if indexed:
+            rm_document.map_reference(reference, SOURCE, TARGET)
+        else:
+            _scan(rm_document, reference)
+time_map_reference.params = [[False, True]]
+time_map_reference.param_names = ["indexed"]
+
+if __name__ == "__main__":
+    from benchmarks import run
+    run.run(["benchmarks.bench_rmdocument"])
+
+
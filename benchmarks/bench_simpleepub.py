@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+Benchmarks for the :class:`yael.simpleepub.SimpleEPUB` accessors,
+on a synthetic publication
+(see :mod:`benchmarks.generator`).
+
+    $ python benchmarks/bench_simpleepub.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from benchmarks import generator
+from yael import SimpleEPUB
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+#: the number of calls of each (cheap) accessor per timed run
+CALLS = 1000
+
+EBOOK = []
+
+def setup():
+    if len(EBOOK) > 0:
+        return
+    EBOOK.append(SimpleEPUB(path=generator.fixture(spine_length=200)))
+
+def _call(name):
+    ebook = EBOOK[0]
+    for i in range(CALLS):
+        getattr(ebook, name)
+
+def time_title():
+    _call("title")
+
+def time_author():
+    _call("author")
+
+def time_identifier():
+    _call("identifier")
+
+def time_language():
+    _call("language")
+
+def time_subjects():
+    _call("subjects")
+
+def time_unique_identifier():
+    _call("unique_identifier")
+
+def time_toc():
+    _call("toc")
+
+def time_landmarks():
+    _call("landmarks")
+
+def time_resolved_toc():
+    _call("resolved_toc")
+
+def time_resolved_spine():
+    _call("resolved_spine")
+
+def time_resolved_spine_linear():
+    _call("resolved_spine_linear")
+
+def time_internal_path_cover_image():
+    _call("internal_path_cover_image")
+
+def time_cover_image():
+    # reads the asset every time
+    ebook = EBOOK[0]
+    for i in range(CALLS // 10):
+        ebook.cover_image
+
+def time_spine_index_by_internal_path():
+    ebook = EBOOK[0]
+    for i in range(CALLS):
+        ebook.spine_index_by_internal_path("OEBPS/Text/c199.xhtml")
+
+def time_locate():
+    ebook = EBOOK[0]
+    for i in range(CALLS):
+        ebook.locate("OEBPS/Text/c150.xhtml#p10")
+
+if __name__ == "__main__":
+    from benchmarks import run
+    run.run(["benchmarks.bench_simpleepub"])
+
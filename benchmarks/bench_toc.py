@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+Benchmarks for parsing and flattening very large TOCs
+(NCX TOC and Navigation Document),
+with 100k nodes arranged in a wide or in a deep tree.
+
+The functions follow the `asv` naming conventions
+(`setup()` and `time_*()`, see :mod:`benchmarks.run`),
+and this file can also be run directly:
+
+    $ python benchmarks/bench_toc.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from yael import NavDocument
+from yael import NCXToc
+from yael import TOCIndex
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+#: total number of TOC nodes
+NODES = 100000
+
+#: nesting depth of the deep TOCs
+#: (lxml refuses documents deeper than 256 elements by default)
+DEPTH = 100
+
+STRINGS = {}
+
+def _wide_tree(nodes, breadth=100):
+    # two levels: `breadth` top-level nodes, each with the same number of children
+    tree = []
+    per_node = nodes // breadth - 1
+    for i in range(breadth):
+        tree.append((i, list((j, []) for j in range(per_node))))
+    return tree
+
+def _deep_tree(nodes, depth):
+    # `nodes // depth` chains, each `depth` nodes deep
+    tree = []
+    for i in range(nodes // depth):
+        chain = []
+        for j in reversed(range(depth)):
+            chain = [(j, chain)]
+        tree.extend(chain)
+    return tree
+
+def ncx_string(tree):
+    """
+    Return an NCX TOC string for the given tree,
+    a list of `(label, children)` tuples.
+    """
+    counter = [0]
+    parts = []
+    def emit(node):
+        # explicit stack, to support deep trees
+        stack = [("open", node)]
+        while len(stack) > 0:
+            action, (label, children) = stack.pop()
+            if action == "close":
+                parts.append("</navPoint>")
+                continue
+            counter[0] += 1
+            parts.append(
+                '<navPoint id="n%d" playOrder="%d"><navLabel><text>Entry %s</text></navLabel><content src="Text/c%d.xhtml#e%d"/>' % (
+                    counter[0], counter[0], label, counter[0] % 500, counter[0]))
+            stack.append(("close", (label, children)))
+            for child in reversed(children):
+                stack.append(("open", child))
+    for node in tree:
+        emit(node)
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/" version="2005-1">'
+        '<head><meta name="dtb:uid" content="urn:uuid:bench"/></head>'
+        '<docTitle><text>Benchmark</text></docTitle>'
+        '<navMap>%s</navMap></ncx>' % "".join(parts)).encode("utf-8")
+
+def nav_string(tree):
+    """
+    Return a Navigation Document string for the given tree,
+    a list of `(label, children)` tuples.
+    """
+    counter = [0]
+    parts = []
+    stack = [("open", node) for node in reversed(tree)]
+    while len(stack) > 0:
+        action, (label, children) = stack.pop()
+        if action == "close":
+            parts.append("</ol></li>" if len(children) > 0 else "</li>")
+            continue
+        counter[0] += 1
+        parts.append('<li><a href="Text/c%d.xhtml#e%d">Entry %s</a>' % (
+            counter[0] % 500, counter[0], label))
+        if len(children) > 0:
+            parts.append("<ol>")
+        stack.append(("close", (label, children)))
+        for child in reversed(children):
+            stack.append(("open", child))
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">'
+        '<head><title>Nav</title></head><body>'
+        '<nav epub:type="toc" id="toc"><h1>Contents</h1><ol>%s</ol></nav>'
+        '</body></html>' % "".join(parts)).encode("utf-8")
+
+def setup():
+    if len(STRINGS) > 0:
+        return
+    wide = _wide_tree(NODES)
+    deep = _deep_tree(NODES, DEPTH)
+    STRINGS["ncx_wide"] = ncx_string(wide)
+    STRINGS["ncx_deep"] = ncx_string(deep)
+    STRINGS["nav_wide"] = nav_string(wide)
+    STRINGS["nav_deep"] = nav_string(deep)
+
+def time_parse_ncx_wide():
+    NCXToc(string=STRINGS["ncx_wide"], internal_path="OEBPS/toc.ncx")
+
+def time_parse_ncx_deep():
+    NCXToc(string=STRINGS["ncx_deep"], internal_path="OEBPS/toc.ncx")
+
+def time_parse_nav_wide():
+    NavDocument(string=STRINGS["nav_wide"], internal_path="OEBPS/nav.xhtml")
+
+def time_parse_nav_deep():
+    NavDocument(string=STRINGS["nav_deep"], internal_path="OEBPS/nav.xhtml")
+
+def time_flatten_ncx_wide():
+    TOCIndex(toc=NCXToc(string=STRINGS["ncx_wide"], internal_path="OEBPS/toc.ncx"))
+
+def time_flatten_nav_deep():
+    TOCIndex(toc=NavDocument(string=STRINGS["nav_deep"], internal_path="OEBPS/nav.xhtml").toc)
+
+if __name__ == "__main__":
+    from benchmarks import run
+    run.run(["benchmarks.bench_toc"])
@@ -0,0 +1,439 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+Generator of synthetic EPUB 3 publications (with an EPUB 2 NCX TOC)
+for the benchmarks.
+
+The size and shape of the generated publication
+can be varied independently:
+
+* number of additional (image) assets in the manifest
+* number of content documents in the spine
+  (and of paragraphs in each of them)
+* depth and breadth of the TOC (Navigation Document and NCX TOC)
+* number of Media Overlay Documents (SMIL files),
+  and number of `<par>` elements in each of them
+* number of obfuscated fonts (IDPF or Adobe algorithm)
+* number of renditions (the additional ones sharing the content documents,
+  with alternating `rendition:layout` and `rendition:language` values,
+  and mapped to each other by a Rendition Mapping Document,
+  at the root of the container or in a subdirectory)
+* compressed (EPUB file) or uncompressed (directory) manifestation
+
+It can also be run directly:
+
+    $ python benchmarks/generator.py out.epub [key=value ...]
+    $ python benchmarks/generator.py outdir compressed=0 spine_length=500
+"""
+
+import atexit
+import os
+import posixpath
+import shutil
+import sys
+import tempfile
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from yael import Obfuscation
+import yael.util
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+#: the default generation parameters
+DEFAULTS = {
+    "compressed": True,
+    "manifest_size": 200,
+    "spine_length": 50,
+    "paragraphs": 50,
+    "toc_depth": 2,
+    "toc_breadth": 10,
+    "smil_count": 10,
+    "smil_density": 100,
+    "obfuscated_fonts": 2,
+    "obfuscation": Obfuscation.IDPF,
+    "renditions": 1,
+    "mapping_path": "mapping.xhtml",
+}
+
+#: the unique identifier (hence the obfuscation key)
+UNIQUE_IDENTIFIER = "urn:uuid:12345678-1234-1234-1234-123456789abc"
+
+#: the algorithm URIs in META-INF/encryption.xml
+ALGORITHMS = {
+    Obfuscation.IDPF: "http://www.idpf.org/2008/embedding",
+    Obfuscation.ADOBE: "http://ns.adobe.com/pdf/enc#RC",
+}
+
+CONTAINER_XML = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container"'
+    ' xmlns:rendition="http://www.idpf.org/2013/rendition">'
+    '<rootfiles>%s</rootfiles>%s'
+    '</container>')
+
+#: the default internal path of the Rendition Mapping Document
+MAPPING_XHTML = DEFAULTS["mapping_path"]
+
+#: the `rendition:layout` and `rendition:language` values
+#: of the additional renditions, in turn
+RENDITION_LAYOUTS = ["pre-paginated", "reflowable"]
+RENDITION_LANGUAGES = ["en", "fr", "de"]
+
+#: a tiny, valid PNG image
+PNG = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01"
+    b"\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\rIDATx\x9cc\xf8\x0f"
+    b"\x00\x00\x01\x01\x00\x05\x18\xd8N\x00\x00\x00\x00IEND\xaeB`\x82")
+
+#: a fake font, long enough to be affected by the obfuscation
+FONT = b"OTTO" + bytes(range(256)) * 16
+
+#: a fake MP3 file
+MP3 = b"ID3\x03\x00\x00\x00\x00\x00\x00" + (b"\xff\xfb\x90\x00" + b"\x00" * 413) * 10
+
+WORDS = [
+    "alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf",
+    "hotel", "india", "juliet", "kilo", "lima", "mike", "november",
+    "oscar", "papa", "quebec", "romeo", "sierra", "tango", "uniform",
+]
+
+def _toc_tree(depth, breadth):
+    # a complete tree with the given depth and breadth,
+    # as a list of (label, children) tuples
+    tree = []
+    for level in range(depth):
+        tree = list(("%d" % i, tree) for i in range(breadth))
+    return tree
+
+def _count_nodes(tree):
+    return sum(1 + _count_nodes(children) for label, children in tree)
+
+def _toc_targets(tree, spine_length, paragraphs):
+    # assign the TOC nodes, in pre-order, to the content documents,
+    # returning a list of (label, target, children) tuples
+    per_document = max(1, (_count_nodes(tree) + spine_length - 1) // spine_length)
+    counter = [0]
+    def walk(subtree, prefix):
+        result = []
+        for label, children in subtree:
+            index = counter[0]
+            counter[0] += 1
+            document = min(index // per_document, spine_length - 1)
+            paragraph = (index % per_document) * paragraphs // per_document
+            target = "Text/c%d.xhtml#p%d" % (document, paragraph)
+            if len(prefix) > 0:
+                label = prefix + "." + label
+            result.append((label, target, walk(children, label)))
+        return result
+    return walk(tree, "")
+
+def _nav_ol(nodes):
+    parts = []
+    def emit(nodes):
+        parts.append("<ol>")
+        for label, target, children in nodes:
+            parts.append('<li><a href="%s">Section %s</a>' % (target, label))
+            if len(children) > 0:
+                emit(children)
+            parts.append("</li>")
+        parts.append("</ol>")
+    emit(nodes)
+    return "".join(parts)
+
+def _ncx_points(nodes, counter):
+    parts = []
+    for label, target, children in nodes:
+        counter[0] += 1
+        parts.append(
+            '<navPoint id="np%d" playOrder="%d"><navLabel><text>Section %s</text></navLabel>'
+            '<content src="%s"/>%s</navPoint>' % (
+                counter[0], counter[0], label, target, _ncx_points(children, counter)))
+    return "".join(parts)
+
+def _content_document(index, spec):
+    paragraphs = []
+    manifest_size = spec["manifest_size"]
+    spine_length = spec["spine_length"]
+    for p in range(spec["paragraphs"]):
+        words = " ".join(WORDS[(index + p + k) % len(WORDS)] for k in range(30))
+        extra = ""
+        if (manifest_size > 0) and (p % 10 == 0):
+            extra = ' <img src="../Images/i%d.png" alt="image"/>' % (
+                (index * spec["paragraphs"] + p) % manifest_size)
+        if p % 7 == 0:
+            extra += ' <a href="c%d.xhtml#p%d">next</a>' % ((index + 1) % spine_length, p)
+        paragraphs.append('<p id="p%d">%s%s</p>' % (p, words, extra))
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">'
+        '<head><title>Chapter %d</title>'
+        '<link rel="stylesheet" type="text/css" href="../Styles/style.css"/></head>'
+        '<body><h1 id="h%d">Chapter %d</h1>%s</body></html>' % (
+            index, index, index, "".join(paragraphs)))
+
+def _smil_document(index, spec):
+    pars = []
+    for p in range(spec["smil_density"]):
+        pars.append(
+            '<par id="par%d"><text src="../Text/c%d.xhtml#p%d"/>'
+            '<audio src="../Audio/a.mp3" clipBegin="%d.000s" clipEnd="%d.000s"/></par>' % (
+                p, index, p % max(1, spec["paragraphs"]), p, p + 1))
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<smil xmlns="http://www.w3.org/ns/SMIL" xmlns:epub="http://www.idpf.org/2007/ops" version="3.0">'
+        '<body><seq id="seq1" epub:textref="../Text/c%d.xhtml">%s</seq></body></smil>' % (
+            index, "".join(pars)))
+
+def _opf_path(index):
+    if index == 0:
+        return "OEBPS/content.opf"
+    return "OEBPS/content-r%d.opf" % index
+
+def _container_xml(spec):
+    rootfiles = []
+    for i in range(max(1, spec["renditions"])):
+        attributes = ""
+        if i > 0:
+            attributes = ' rendition:layout="%s" rendition:language="%s"' % (
+                RENDITION_LAYOUTS[(i - 1) % len(RENDITION_LAYOUTS)],
+                RENDITION_LANGUAGES[(i - 1) % len(RENDITION_LANGUAGES)])
+        rootfiles.append(
+            '<rootfile full-path="%s" media-type="application/oebps-package+xml"%s/>' % (
+                _opf_path(i), attributes))
+    links = ""
+    if spec["renditions"] > 1:
+        links = (
+            '<links><link rel="mapping" href="%s" media-type="application/xhtml+xml"/></links>' % (
+                spec["mapping_path"]))
+    return CONTAINER_XML % ("".join(rootfiles), links)
+
+def _mapping_xhtml(spec):
+    # one location per spine item, with one point per rendition;
+    # the references are relative to the Rendition Mapping Document
+    directory = posixpath.dirname(spec.get("mapping_path", MAPPING_XHTML)) or "."
+    def relative(internal_path):
+        return posixpath.relpath(internal_path, directory)
+    locations = []
+    for i in range(spec["spine_length"]):
+        locations.append("<ul>%s</ul>" % "".join(
+            '<li><a epub:rendition="%s" href="%s"/></li>' % (
+                relative(_opf_path(r)), relative("OEBPS/Text/c%d.xhtml" % i))
+            for r in range(spec["renditions"])))
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">'
+        '<head><meta charset="utf-8"/></head><body>'
+        '<nav epub:type="resource-map">%s</nav>'
+        '</body></html>' % "".join(locations))
+
+def files(**kwargs):
+    """
+    Return the files of the synthetic publication
+    described by the given parameters
+    (see :data:`DEFAULTS`),
+    as a list of `(internal_path, bytes)` tuples,
+    starting with `mimetype`.
+    """
+    spec = dict(DEFAULTS)
+    spec.update(kwargs)
+    spine_length = max(1, spec["spine_length"])
+    spec["spine_length"] = spine_length
+    smil_count = min(spec["smil_count"], spine_length)
+    result = [
+        ("mimetype", b"application/epub+zip"),
+        ("META-INF/container.xml", _container_xml(spec).encode("utf-8")),
+    ]
+
+    items = [
+        '<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>',
+        '<item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>',
+        '<item id="css" href="Styles/style.css" media-type="text/css"/>',
+    ]
+    itemrefs = []
+    for i in range(spine_length):
+        media_overlay = ""
+        if i < smil_count:
+            media_overlay = ' media-overlay="s%d"' % i
+        items.append(
+            '<item id="c%d" href="Text/c%d.xhtml" media-type="application/xhtml+xml"%s/>' % (
+                i, i, media_overlay))
+        itemrefs.append('<itemref idref="c%d"/>' % i)
+        result.append((
+            "OEBPS/Text/c%d.xhtml" % i,
+            _content_document(i, spec).encode("utf-8")))
+    for i in range(smil_count):
+        items.append(
+            '<item id="s%d" href="Smil/s%d.smil" media-type="application/smil+xml"/>' % (i, i))
+        result.append((
+            "OEBPS/Smil/s%d.smil" % i,
+            _smil_document(i, spec).encode("utf-8")))
+    if smil_count > 0:
+        items.append('<item id="audio" href="Audio/a.mp3" media-type="audio/mpeg"/>')
+        result.append(("OEBPS/Audio/a.mp3", MP3))
+    for i in range(spec["manifest_size"]):
+        properties = ""
+        if i == 0:
+            properties = ' properties="cover-image"'
+        items.append(
+            '<item id="i%d" href="Images/i%d.png" media-type="image/png"%s/>' % (
+                i, i, properties))
+        result.append(("OEBPS/Images/i%d.png" % i, PNG))
+
+    font_faces = []
+    encrypted = []
+    for i in range(spec["obfuscated_fonts"]):
+        i_p_font = "OEBPS/Fonts/f%d.otf" % i
+        items.append(
+            '<item id="f%d" href="Fonts/f%d.otf" media-type="application/vnd.ms-opentype"/>' % (
+                i, i))
+        result.append((
+            i_p_font,
+            yael.util.obfuscate_data(FONT, UNIQUE_IDENTIFIER, spec["obfuscation"])))
+        font_faces.append(
+            '@font-face { font-family: "f%d"; src: url("../Fonts/f%d.otf"); }' % (i, i))
+        encrypted.append(
+            '<enc:EncryptedData><enc:EncryptionMethod Algorithm="%s"/>'
+            '<enc:CipherData><enc:CipherReference URI="%s"/></enc:CipherData>'
+            '</enc:EncryptedData>' % (ALGORITHMS[spec["obfuscation"]], i_p_font))
+    if len(encrypted) > 0:
+        result.append((
+            "META-INF/encryption.xml",
+            ('<?xml version="1.0" encoding="utf-8"?>'
+             '<encryption xmlns="urn:oasis:names:tc:opendocument:xmlns:container"'
+             ' xmlns:enc="http://www.w3.org/2001/04/xmlenc#">%s</encryption>' % (
+                 "".join(encrypted))).encode("utf-8")))
+    result.append((
+        "OEBPS/Styles/style.css",
+        ("%s\nbody { margin: 1em; }\n" % "\n".join(font_faces)).encode("utf-8")))
+
+    toc = _toc_targets(
+        _toc_tree(spec["toc_depth"], spec["toc_breadth"]),
+        spine_length,
+        max(1, spec["paragraphs"]))
+    result.append((
+        "OEBPS/nav.xhtml",
+        ('<?xml version="1.0" encoding="utf-8"?>'
+         '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">'
+         '<head><title>Navigation</title></head><body>'
+         '<nav epub:type="toc" id="toc"><h1>Contents</h1>%s</nav>'
+         '<nav epub:type="landmarks"><ol><li><a epub:type="bodymatter" href="Text/c0.xhtml">Start</a></li></ol></nav>'
+         '</body></html>' % _nav_ol(toc)).encode("utf-8")))
+    result.append((
+        "OEBPS/toc.ncx",
+        ('<?xml version="1.0" encoding="utf-8"?>'
+         '<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/" version="2005-1">'
+         '<head><meta name="dtb:uid" content="%s"/></head>'
+         '<docTitle><text>Synthetic Book</text></docTitle>'
+         '<navMap>%s</navMap></ncx>' % (
+             UNIQUE_IDENTIFIER, _ncx_points(toc, [0]))).encode("utf-8")))
+
+    metadata = (
+        '<dc:identifier id="uid">%s</dc:identifier>'
+        '<dc:title>Synthetic Book</dc:title>'
+        '<dc:creator id="creator">Jane Doe</dc:creator>'
+        '<meta refines="#creator" property="role" scheme="marc:relators">aut</meta>'
+        '<dc:language>en</dc:language>'
+        '<dc:publisher>Benchmarks</dc:publisher>'
+        '<dc:subject>Testing</dc:subject>'
+        '<meta property="dcterms:modified">2015-01-01T00:00:00Z</meta>' % UNIQUE_IDENTIFIER)
+    if smil_count > 0:
+        metadata += '<meta property="media:duration">0:10:00.000</meta>'
+    opf = (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="uid">'
+        '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">%s</metadata>'
+        '<manifest>%s</manifest>'
+        '<spine toc="ncx">%s</spine>'
+        '</package>' % (metadata, "".join(items), "".join(itemrefs))).encode("utf-8")
+    for i in range(max(1, spec["renditions"])):
+        result.append((_opf_path(i), opf))
+    if spec["renditions"] > 1:
+        result.append((spec["mapping_path"], _mapping_xhtml(spec).encode("utf-8")))
+    return result
+
+def generate(path, **kwargs):
+    """
+    Write the synthetic publication
+    described by the given parameters
+    (see :data:`DEFAULTS`)
+    to the given path,
+    as an EPUB file (`compressed=True`)
+    or as a directory (`compressed=False`),
+    and return the path.
+    """
+    compressed = kwargs.get("compressed", DEFAULTS["compressed"])
+    contents = files(**kwargs)
+    if compressed:
+        with zipfile.ZipFile(path, mode="w") as zip_file:
+            for internal_path, data in contents:
+                compression = zipfile.ZIP_DEFLATED
+                if internal_path == "mimetype":
+                    compression = zipfile.ZIP_STORED
+                zip_file.writestr(internal_path, data, compress_type=compression)
+    else:
+        for internal_path, data in contents:
+            a_p_file = os.path.join(path, *internal_path.split("/"))
+            if not os.path.isdir(os.path.dirname(a_p_file)):
+                os.makedirs(os.path.dirname(a_p_file))
+            with open(a_p_file, mode="wb") as output_file:
+                output_file.write(data)
+    return path
+
+FIXTURES = {}
+TEMPORARY_DIRECTORY = []
+
+def fixture(**kwargs):
+    """
+    Return the path of a synthetic publication
+    with the given parameters,
+    generated once per process in a temporary directory,
+    which is removed at exit.
+    """
+    key = tuple(sorted(kwargs.items()))
+    if key not in FIXTURES:
+        if len(TEMPORARY_DIRECTORY) == 0:
+            TEMPORARY_DIRECTORY.append(tempfile.mkdtemp(prefix="yael-bench-"))
+            atexit.register(shutil.rmtree, TEMPORARY_DIRECTORY[0], True)
+        name = "fixture%d" % len(FIXTURES)
+        if kwargs.get("compressed", DEFAULTS["compressed"]):
+            name += ".epub"
+        FIXTURES[key] = generate(
+            os.path.join(TEMPORARY_DIRECTORY[0], name),
+            **kwargs)
+    return FIXTURES[key]
+
+def _parse_value(value):
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+def main():
+    if len(sys.argv) < 2:
+        print("")
+        print("$ python %s out.epub [key=value ...]" % sys.argv[0])
+        print("$ python %s outdir compressed=0 [key=value ...]" % sys.argv[0])
+        print("")
+        print("Keys (and default values):")
+        for key in sorted(DEFAULTS):
+            print("  %s=%s" % (key, DEFAULTS[key]))
+        print("")
+        return
+    kwargs = {}
+    for argument in sys.argv[2:]:
+        key, value = argument.split("=", 1)
+        kwargs[key] = _parse_value(value)
+    if "compressed" in kwargs:
+        kwargs["compressed"] = bool(kwargs["compressed"])
+    print(generate(sys.argv[1], **kwargs))
+
+if __name__ == "__main__":
+    main()
+
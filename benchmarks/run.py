@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+A minimal runner for the benchmarks in this directory.
+
+Each `bench_*.py` module follows the `asv` conventions:
+an optional module-level `setup()` function,
+`time_*()` functions, timed with `timeit`
+(best of `--repeat` runs),
+and `track_*()` functions, returning the tracked value
+(e.g., a memory size, in the unit given by their `unit` attribute).
+A `time_*()` or `track_*()` function might have `params`
+(a list of lists of values) and `param_names` attributes,
+in which case it is timed for each combination of values.
+
+The timings can be saved to a JSON file,
+and compared with a previously saved baseline,
+reporting the benchmarks slower than `--threshold` times the baseline:
+
+    $ python benchmarks/run.py --save baseline.json
+    $ python benchmarks/run.py --compare baseline.json
+    $ python benchmarks/run.py -b parse -b toc --repeat 5
+
+The exit code is 1 if a regression is detected, 0 otherwise.
+"""
+
+import argparse
+import glob
+import importlib
+import itertools
+import json
+import os
+import re
+import sys
+import timeit
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, ROOT_DIRECTORY)
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+#: the default number of timed runs of each benchmark
+REPEAT = 3
+
+#: the default slowdown ratio reported as a regression
+THRESHOLD = 1.25
+
+def discover():
+    """
+    Return the names of the benchmark modules,
+    in alphabetical order.
+    """
+    directory = os.path.dirname(os.path.realpath(__file__))
+    return sorted(
+        "benchmarks." + os.path.splitext(os.path.basename(path))[0]
+        for path in glob.glob(os.path.join(directory, "bench_*.py")))
+
+def benchmarks(module):
+    """
+    Yield the `(name, callable)` benchmarks of the given module,
+    expanding the parameterized ones.
+    """
+    short_name = module.__name__.split(".")[-1]
+    names = sorted(
+        n for n in dir(module)
+        if n.startswith("time_") or n.startswith("track_"))
+    for name in names:
+        function = getattr(module, name)
+        params = getattr(function, "params", None)
+        if params == None:
+            yield ("%s.%s" % (short_name, name), function)
+            continue
+        if (len(params) > 0) and (not isinstance(params[0], (list, tuple))):
+            params = [params]
+        for values in itertools.product(*params):
+            yield (
+                "%s.%s(%s)" % (short_name, name, ", ".join(str(v) for v in values)),
+                (lambda f, v: (lambda: f(*v)))(function, values))
+
+def run(module_names, patterns=None, repeat=REPEAT, output=sys.stdout):
+    """
+    Run the benchmarks of the given modules
+    whose name matches one of the given regular expressions
+    (or all of them, if `patterns` is empty),
+    and return a dictionary mapping their names
+    to their best timings, in seconds
+    (or to their tracked values).
+    """
+    regexes = list(re.compile(p) for p in (patterns or []))
+    timings = {}
+    for module_name in module_names:
+        module = importlib.import_module(module_name)
+        selected = list(
+            (name, function) for name, function in benchmarks(module)
+            if (len(regexes) == 0) or any(r.search(name) for r in regexes))
+        if len(selected) == 0:
+            continue
+        if hasattr(module, "setup"):
+            module.setup()
+        for name, function in selected:
+            base_name = name.split(".", 1)[1].split("(")[0]
+            unit = getattr(getattr(module, base_name), "unit", "s")
+            if base_name.startswith("track_"):
+                best = function()
+            else:
+                best = min(timeit.repeat(function, number=1, repeat=repeat))
+            timings[name] = best
+            output.write("%-72s %10.4f %s\n" % (name, best, unit))
+            output.flush()
+    return timings
+
+def compare(timings, baseline, threshold=THRESHOLD, output=sys.stdout):
+    """
+    Compare the given timings with the given baseline,
+    print the ratios, and return the names of the regressions.
+    """
+    regressions = []
+    output.write("\n%-72s %10s %10s %7s\n" % ("benchmark", "baseline", "current", "ratio"))
+    for name in sorted(timings):
+        if name not in baseline:
+            continue
+        ratio = timings[name] / max(baseline[name], 1e-9)
+        flag = ""
+        if ratio > threshold:
+            flag = " REGRESSION"
+            regressions.append(name)
+        output.write("%-72s %10.4f %10.4f %7.2f%s\n" % (
+            name, baseline[name], timings[name], ratio, flag))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the yael benchmarks.")
+    parser.add_argument(
+        "-b", "--bench", action="append", default=[],
+        help="run only the benchmarks matching this regular expression (repeatable)")
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=REPEAT,
+        help="number of timed runs of each benchmark (default: %d)" % REPEAT)
+    parser.add_argument(
+        "--save", metavar="FILE",
+        help="save the timings to this JSON file")
+    parser.add_argument(
+        "--compare", metavar="FILE",
+        help="compare the timings with this JSON file")
+    parser.add_argument(
+        "--threshold", type=float, default=THRESHOLD,
+        help="slowdown ratio reported as a regression (default: %.2f)" % THRESHOLD)
+    args = parser.parse_args()
+
+    timings = run(discover(), args.bench, args.repeat)
+    if args.save != None:
+        with open(args.save, "w") as output_file:
+            json.dump(timings, output_file, indent=4, sort_keys=True)
+    if args.compare != None:
+        with open(args.compare, "r") as input_file:
+            baseline = json.load(input_file)
+        if len(compare(timings, baseline, args.threshold)) > 0:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
+
@@ -6,52 +6,8 @@
 for reading, manipulating, and writing EPUB 2/3 files.
 """
 
-from yael.asset import Asset
-from yael.container import Container
-from yael.dc import DC
-from yael.element import Element
-from yael.encryption import Encryption
-from yael.enckey import EncKey
-from yael.epub import EPUB
-from yael.jsonable import JSONAble
-from yael.manifestation import Manifestation
-from yael.marcrelator import MARCRelator
-from yael.mediatype import MediaType
-from yael.metadata import Metadata
-from yael.moaudio import MOAudio
-from yael.modocument import MODocument
-from yael.mopar import MOPar
-from yael.moseq import MOSeq
-from yael.motext import MOText
-from yael.namespace import Namespace
-from yael.navdocument import NavDocument
-from yael.navelement import NavElement
-from yael.navnode import NavNode
-from yael.ncxtoc import NCXToc
-from yael.ncxtocnode import NCXTocNode
-from yael.obfuscation import Obfuscation
-from yael.opfdc import OPFDC
-from yael.opfguide import OPFGuide
-from yael.opfitem import OPFItem
-from yael.opfitemref import OPFItemref
-from yael.opflink import OPFLink
-from yael.opfmanifest import OPFManifest
-from yael.opfmeta2 import OPFMeta2
-from yael.opfmeta3 import OPFMeta3
-from yael.opfmetadata import OPFMetadata
-from yael.opfmetadatum import OPFMetadatum
-from yael.opfpacdocument import OPFPacDocument
-from yael.opfreference import OPFReference
-from yael.opfspine import OPFSpine
-from yael.pacdocument import PacDocument
-from yael.parsing import Parsing
-from yael.publication import Publication
-from yael.rendition import Rendition
-from yael.rmdocument import RMDocument
-from yael.rmlocation import RMLocation
-from yael.rmpoint import RMPoint
-from yael.simpleepub import SimpleEPUB
-import yael.util
+import importlib
+import sys
 
 __author__ = "Alberto Pettarin"
 __copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
@@ -59,3 +15,96 @@ __license__ = "MIT"
 __version__ = "0.0.9"
 __email__ = "alberto@albertopettarin.it"
 __status__ = "Development"
+
+# the module defining each public name,
+# imported only when the name is first accessed (PEP 562)
+_LAZY_NAMES = {
+    "Asset": "yael.asset",
+    "AudioMap": "yael.audiomap",
+    "Container": "yael.container",
+    "ContentStatistics": "yael.contentstats",
+    "DC": "yael.dc",
+    "DirectoryIndex": "yael.directoryindex",
+    "Element": "yael.element",
+    "Encryption": "yael.encryption",
+    "EncKey": "yael.enckey",
+    "EPUB": "yael.epub",
+    "IntegrityReport": "yael.integrityreport",
+    "JSONAble": "yael.jsonable",
+    "LinkGraph": "yael.linkgraph",
+    "Manifestation": "yael.manifestation",
+    "MARCRelator": "yael.marcrelator",
+    "MediaType": "yael.mediatype",
+    "Metadata": "yael.metadata",
+    "MOAudio": "yael.moaudio",
+    "MODocument": "yael.modocument",
+    "MOPar": "yael.mopar",
+    "MOSeq": "yael.moseq",
+    "MOText": "yael.motext",
+    "Namespace": "yael.namespace",
+    "NavDocument": "yael.navdocument",
+    "NavElement": "yael.navelement",
+    "NavNode": "yael.navnode",
+    "NCXToc": "yael.ncxtoc",
+    "NCXTocNode": "yael.ncxtocnode",
+    "Obfuscation": "yael.obfuscation",
+    "OPFDC": "yael.opfdc",
+    "OPFGuide": "yael.opfguide",
+    "OPFItem": "yael.opfitem",
+    "OPFItemref": "yael.opfitemref",
+    "OPFLink": "yael.opflink",
+    "OPFManifest": "yael.opfmanifest",
+    "OPFMeta2": "yael.opfmeta2",
+    "OPFMeta3": "yael.opfmeta3",
+    "OPFMetadata": "yael.opfmetadata",
+    "OPFMetadatum": "yael.opfmetadatum",
+    "OPFPacDocument": "yael.opfpacdocument",
+    "OPFReference": "yael.opfreference",
+    "OPFSpine": "yael.opfspine",
+    "OrphanReport": "yael.orphanreport",
+    "PacDocument": "yael.pacdocument",
+    "PageListIndex": "yael.pagelistindex",
+    "Parsing": "yael.parsing",
+    "Profiler": "yael.profiling",
+    "Publication": "yael.publication",
+    "PublicationDiff": "yael.diff",
+    "Rendition": "yael.rendition",
+    "RMDocument": "yael.rmdocument",
+    "RMLocation": "yael.rmlocation",
+    "RMPoint": "yael.rmpoint",
+    "SearchIndex": "yael.search",
+    "SimpleEPUB": "yael.simpleepub",
+    "TextExtractor": "yael.textextractor",
+    "TOCIndex": "yael.tocindex",
+    "ValidationReport": "yael.validate",
+}
+
+# the submodules which are public names, too
+_LAZY_MODULES = ["util"]
+
+__all__ = sorted(list(_LAZY_NAMES) + _LAZY_MODULES)
+
+def _load(name):
+    # import the module defining the given public name,
+    # and cache the name in the namespace of this package
+    if name in _LAZY_MODULES:
+        value = importlib.import_module("yael." + name)
+    else:
+        value = getattr(importlib.import_module(_LAZY_NAMES[name]), name)
+    globals()[name] = value
+    return value
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if (name in _LAZY_NAMES) or (name in _LAZY_MODULES):
+            return _load(name)
+        raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+
+    def __dir__():
+        return sorted(set(list(globals()) + __all__))
+else:
+    # no module-level __getattr__: import everything now
+    for _name in __all__:
+        _load(_name)
+
+
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+An `asyncio` interface for opening Publications and reading assets,
+for services running an event loop (Python 3.5 or later).
+
+The blocking file and ZIP I/O, and the parsing,
+run in an executor, off the event loop,
+and the number of Publications opened (and assets read)
+at the same time is bounded by a semaphore,
+shared by all the callers running in the same event loop:
+
+    publication = await Publication.open_async("book.epub")
+    data = await publication.assets["OEBPS/Text/c1.xhtml"].read_async()
+
+By default, the work runs in the default executor of the event loop
+(a thread pool); another executor can be passed to each call,
+or set for all calls with :func:`yael.aio.set_executor`.
+A `concurrent.futures.ProcessPoolExecutor` can be used
+to parse Publications in other processes,
+in which case the parsed Publication is pickled
+back to the calling process.
+The active profiler (see :mod:`yael.profiling`)
+is propagated to the worker threads
+only on Python 3.7 or later (`contextvars`).
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import weakref
+
+try:
+    import contextvars
+except ImportError:
+    contextvars = None
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+#: the default maximum number of Publications opened
+#: (and assets read) at the same time, in each event loop
+MAX_CONCURRENCY = 64
+
+_STATE = {
+    "max_concurrency": MAX_CONCURRENCY,
+    "executor": None,
+}
+
+# the semaphore of each event loop
+_SEMAPHORES = weakref.WeakKeyDictionary()
+
+def set_max_concurrency(value):
+    """
+    Set the maximum number of Publications opened
+    (and assets read) at the same time, in each event loop.
+
+    The new value applies to the event loops
+    which have not started any operation yet.
+
+    :param value: the maximum number of concurrent operations
+    :type  value: int
+    """
+    if value < 1:
+        raise ValueError("The maximum concurrency must be positive")
+    _STATE["max_concurrency"] = value
+
+def set_executor(executor):
+    """
+    Set the executor used when none is passed to a call
+    (None for the default executor of the event loop).
+
+    :param executor: the executor
+    :type  executor: :class:`concurrent.futures.Executor`
+    """
+    _STATE["executor"] = executor
+
+def _semaphore(loop):
+    # return the semaphore of the given event loop, creating it if needed
+    semaphore = _SEMAPHORES.get(loop)
+    if semaphore == None:
+        semaphore = asyncio.Semaphore(_STATE["max_concurrency"])
+        _SEMAPHORES[loop] = semaphore
+    return semaphore
+
+async def _run(executor, function, *args):
+    # run function(*args) in the given executor (or in the default one),
+    # under the semaphore of the current event loop
+    loop = asyncio.get_event_loop()
+    if executor == None:
+        executor = _STATE["executor"]
+    if (
+            (contextvars != None) and
+            (not isinstance(executor, concurrent.futures.ProcessPoolExecutor))):
+        # propagate the context variables (e.g., the active profiler)
+        # to the worker thread (Python 3.7 or later)
+        function = functools.partial(contextvars.copy_context().run, function)
+    async with _semaphore(loop):
+        return await loop.run_in_executor(executor, function, *args)
+
+def _open_publication(path, parsing_options, rendition_criteria):
+    # import here, as yael.publication imports this module lazily
+    from yael.publication import Publication
+    return Publication(
+        path=path,
+        parsing_options=parsing_options,
+        rendition_criteria=rendition_criteria)
+
+def _read_asset(asset):
+    return asset.contents
+
+async def open_publication(
+        path,
+        parsing_options=None,
+        executor=None,
+        rendition_criteria=None):
+    """
+    Open and parse the Publication at the given path,
+    off the event loop.
+
+    :param path:            the path of the file or directory to be read
+    :type  path:            str
+    :param parsing_options: parsing options
+    :type  parsing_options: list of :class:`yael.parsing.Parsing` options
+    :param executor:        the executor running the I/O and the parsing
+                            (if None, the one set with
+                            :func:`yael.aio.set_executor`)
+    :type  executor:        :class:`concurrent.futures.Executor`
+    :param rendition_criteria: the criteria selecting the Rendition to be parsed
+                               (see :class:`yael.publication.Publication`)
+    :type  rendition_criteria: dict
+    :rtype:                 :class:`yael.publication.Publication`
+    """
+    return await _run(
+        executor,
+        _open_publication,
+        path,
+        parsing_options,
+        rendition_criteria)
+
+async def read_asset(asset, executor=None):
+    """
+    Read the contents of the given asset
+    (see :func:`yael.asset.Asset.contents`),
+    off the event loop.
+
+    :param asset:    the asset
+    :type  asset:    :class:`yael.asset.Asset`
+    :param executor: the executor running the I/O
+                     (if None, the one set with
+                     :func:`yael.aio.set_executor`)
+    :type  executor: :class:`concurrent.futures.Executor`
+    :rtype:          bytes
+    """
+    return await _run(executor, _read_asset, asset)
+
+
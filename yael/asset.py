@@ -15,12 +15,19 @@ The contents of the asset can be specified:
    and the corresponding `relative_path` (to a file)
 4. by specifying the `absolute_path` (pointing to a ZIP file on disk)
    and the corresponding `relative_path` (the ZIP entry name)
+
+In case 3, if the asset has a `directory_index`
+(see :class:`yael.directoryindex.DirectoryIndex`),
+the file is read through it, without checking its existence first.
 """
 
+import io
 import os
 import zipfile
+import zlib
 
 from yael.jsonable import JSONAble
+import yael.profiling
 import yael.util
 
 __author__ = "Alberto Pettarin"
@@ -45,6 +52,9 @@ class Asset(JSONAble):
 
     """
 
+    BLOCK_SIZE = 65536
+    """ The size, in bytes, of the blocks read from disk. """
+
     def __init__(
             self,
             absolute_path=None,
@@ -57,6 +67,7 @@ class Asset(JSONAble):
         self.data = data
         self.obfuscation_algorithm = None
         self.obfuscation_key = None
+        self.directory_index = None
 
     def json_object(self, recursive=True):
         obj = {
@@ -156,6 +167,19 @@ class Asset(JSONAble):
     def obfuscation_key(self, obfuscation_key):
         self.__obfuscation_key = obfuscation_key
 
+    @property
+    def directory_index(self):
+        """
+        The snapshot of the directory containing this asset, if any.
+
+        :rtype: :class:`yael.directoryindex.DirectoryIndex`
+        """
+        return self.__directory_index
+
+    @directory_index.setter
+    def directory_index(self, directory_index):
+        self.__directory_index = directory_index
+
     @property
     def contents(self):
         """
@@ -173,7 +197,13 @@ class Asset(JSONAble):
         :rtype: bytes
         """
 
-        raw_data = self.raw_contents
+        with yael.profiling.span(
+                "read",
+                yael.profiling.Profiler.CATEGORY_IO,
+                self.internal_path) as span:
+            raw_data = self.raw_contents
+            if raw_data != None:
+                span.add_bytes(len(raw_data))
         if self.obfuscation_key == None:
             return raw_data
 
@@ -198,6 +228,9 @@ class Asset(JSONAble):
         if self.data != None:
             return self.data
 
+        if self._is_indexed():
+            return self.directory_index.read(self.relative_path)
+
         try:
             if (
                     (self.absolute_path != None) and
@@ -229,4 +262,319 @@ class Asset(JSONAble):
 
         return None
 
+    @property
+    def raw_size(self):
+        """
+        The size, in bytes, of the raw contents of this asset,
+        obtained without reading them
+        (from the file system or from the ZIP central directory).
+
+        Return -1 if the size cannot be determined.
+
+        :rtype: int
+        """
+
+        if self.data != None:
+            return len(self.data)
+
+        if self._is_indexed():
+            entry = self.directory_index.entry(self.relative_path)
+            if entry == None:
+                return -1
+            return entry[0]
+
+        try:
+            if (
+                    (os.path.isdir(self.absolute_path)) or
+                    (self.relative_path == None)):
+                return os.path.getsize(self._uncompressed_path())
+            zip_file = zipfile.ZipFile(self.absolute_path, mode="r")
+            size = zip_file.getinfo(self.relative_path).file_size
+            zip_file.close()
+            return size
+        except:
+            pass
+        return -1
+
+    def crc(self, zip_file=None):
+        """
+        Return the CRC-32 of the raw contents of this asset.
+
+        For a ZIP entry, the CRC-32 is read from the ZIP central directory,
+        without decompressing the entry;
+        if `zip_file` is the ZIP file `absolute_path`, already opened,
+        its central directory is not read again.
+        Otherwise, the CRC-32 is computed from the raw contents,
+        reading them in blocks.
+
+        Return -1 if the CRC-32 cannot be determined.
+
+        :param zip_file: the (opened) ZIP file containing this asset
+        :type  zip_file: :class:`zipfile.ZipFile`
+        :rtype:          int
+        """
+
+        if self.data != None:
+            return zlib.crc32(self.data) & 0xffffffff
+
+        try:
+            if self._is_zip_entry():
+                if zip_file != None:
+                    return zip_file.getinfo(self.relative_path).CRC
+                zip_file = zipfile.ZipFile(self.absolute_path, mode="r")
+                crc = zip_file.getinfo(self.relative_path).CRC
+                zip_file.close()
+                return crc
+            crc = 0
+            with open(self._uncompressed_path(), mode="rb") as fil:
+                block = fil.read(Asset.BLOCK_SIZE)
+                while len(block) > 0:
+                    crc = zlib.crc32(block, crc)
+                    block = fil.read(Asset.BLOCK_SIZE)
+            return crc & 0xffffffff
+        except:
+            pass
+        return -1
+
+    def fingerprint(self, zip_file=None):
+        """
+        Return a fingerprint of the raw contents of this asset,
+        which changes when they change,
+        obtained without reading them when possible:
+
+        1. for a `data` object, its size and its CRC-32
+        2. for a file on disk, its size and its modification time
+           (from the directory index, if the asset has one)
+        3. for a ZIP entry, its size and its CRC-32
+           (from the ZIP central directory,
+           not read again if `zip_file` is the ZIP file
+           `absolute_path`, already opened)
+
+        Return None if the fingerprint cannot be determined
+        (e.g., the asset does not exist).
+
+        :param zip_file: the (opened) ZIP file containing this asset
+        :type  zip_file: :class:`zipfile.ZipFile`
+        :rtype:          tuple
+        """
+
+        if self.data != None:
+            return (len(self.data), zlib.crc32(self.data) & 0xffffffff)
+
+        if self._is_indexed():
+            return self.directory_index.entry(self.relative_path)
+
+        try:
+            if self._is_zip_entry():
+                if zip_file != None:
+                    info = zip_file.getinfo(self.relative_path)
+                else:
+                    zip_file = zipfile.ZipFile(self.absolute_path, mode="r")
+                    info = zip_file.getinfo(self.relative_path)
+                    zip_file.close()
+                return (info.file_size, info.CRC)
+            stat = os.stat(self._uncompressed_path())
+            return (stat.st_size, stat.st_mtime)
+        except:
+            pass
+        return None
+
+    def read_async(self, executor=None):
+        """
+        Return an awaitable reading the contents of this asset
+        (see :func:`yael.asset.Asset.contents`),
+        off the `asyncio` event loop
+        (see :mod:`yael.aio`, Python 3.5 or later):
+
+            data = await asset.read_async()
+
+        :param executor: the executor running the I/O
+                         (if None, the default one)
+        :type  executor: :class:`concurrent.futures.Executor`
+        :rtype:          awaitable of bytes
+        """
+        # imported here, as yael.aio requires Python 3.5 or later
+        import yael.aio
+        return yael.aio.read_asset(self, executor)
+
+    def open_stream(self, zip_file=None):
+        """
+        Open a binary, seekable, file-like object
+        over the raw contents of this asset,
+        without reading them in memory.
+
+        The caller is responsible for closing
+        the returned object.
+        Seeking inside a compressed (deflated) ZIP entry
+        requires decompressing the data up to the desired offset,
+        while seeking inside a stored ZIP entry is cheap.
+
+        If this asset is a ZIP entry, and `zip_file`
+        is the ZIP file `absolute_path`, already opened,
+        the entry is opened from it,
+        without reading the ZIP central directory again.
+        Closing the returned object does not close `zip_file`.
+
+        Return None if the asset cannot be opened.
+
+        :param zip_file: the (opened) ZIP file containing this asset
+        :type  zip_file: :class:`zipfile.ZipFile`
+        :rtype:          file-like object
+        """
+
+        if self.data != None:
+            return io.BytesIO(self.data)
+
+        if self._is_indexed():
+            return self.directory_index.open(self.relative_path)
+
+        try:
+            if (zip_file != None) and (self._is_zip_entry()):
+                return zip_file.open(self.relative_path, mode="r")
+            if (
+                    (os.path.isdir(self.absolute_path)) or
+                    (self.relative_path == None)):
+                return open(self._uncompressed_path(), mode="rb")
+            zip_file = zipfile.ZipFile(self.absolute_path, mode="r")
+            return _ZipEntryStream(zip_file, self.relative_path)
+        except:
+            pass
+        return None
+
+    def read_range(self, start, length):
+        """
+        Read `length` bytes of the raw contents of this asset,
+        starting at offset `start`,
+        without reading the whole asset.
+
+        Return None if the asset cannot be read.
+
+        :param start:  the offset of the first byte to be read
+        :type  start:  int
+        :param length: the number of bytes to be read
+        :type  length: int
+        :rtype:        bytes
+        """
+
+        if self.data != None:
+            return self.data[start:start+length]
+
+        stream = self.open_stream()
+        if stream == None:
+            return None
+        try:
+            stream.seek(start)
+            return stream.read(length)
+        except:
+            pass
+        finally:
+            stream.close()
+        return None
+
+    @staticmethod
+    def batch_contents(assets):
+        """
+        Return the contents of the given assets,
+        as a list in the same order,
+        with None for the assets that cannot be read.
+
+        The assets stored in the same ZIP file
+        are read opening it (and reading its central directory)
+        only once, instead of once per asset.
+
+        :param assets: the assets to be read
+        :type  assets: list of :class:`yael.asset.Asset`
+        :rtype:        list of bytes
+        """
+
+        zip_files = {}
+        accumulator = []
+        try:
+            for asset in assets:
+                contents = None
+                try:
+                    if asset._is_zip_entry():
+                        if asset.absolute_path not in zip_files:
+                            zip_files[asset.absolute_path] = zipfile.ZipFile(
+                                asset.absolute_path,
+                                mode="r")
+                        contents = zip_files[asset.absolute_path].read(
+                            asset.relative_path)
+                        if asset.obfuscation_key != None:
+                            contents = yael.util.obfuscate_data(
+                                data=contents,
+                                key=asset.obfuscation_key,
+                                algorithm=asset.obfuscation_algorithm)
+                    else:
+                        contents = asset.contents
+                except:
+                    pass
+                accumulator.append(contents)
+        finally:
+            for zip_file in zip_files.values():
+                zip_file.close()
+        return accumulator
+
+    def _is_indexed(self):
+        """
+        Return True if this asset is read through its directory index.
+        """
+        return (
+            (self.directory_index != None) and
+            (self.relative_path != None))
+
+    def _is_zip_entry(self):
+        """
+        Return True if this asset is an entry of a ZIP file on disk.
+        """
+        return (
+            (self.data == None) and
+            (not self._is_indexed()) and
+            (self.absolute_path != None) and
+            (self.relative_path != None) and
+            (os.path.isfile(self.absolute_path)))
+
+    def _uncompressed_path(self):
+        """
+        Return the path on disk of this (uncompressed) asset.
+        """
+        if self.relative_path == None:
+            return self.absolute_path
+        return yael.util.norm_join(self.absolute_path, self.relative_path)
+
+
+class _ZipEntryStream(object):
+    """
+    A file-like object over a ZIP entry,
+    which closes the underlying ZIP file when closed.
+    """
+
+    def __init__(self, zip_file, name):
+        self.zip_file = zip_file
+        try:
+            self.entry = zip_file.open(name, mode="r")
+        except:
+            # e.g., KeyError if the entry is not in the ZIP file
+            zip_file.close()
+            raise
+
+    def read(self, size=-1):
+        return self.entry.read(size)
+
+    def seek(self, offset, whence=0):
+        return self.entry.seek(offset, whence)
+
+    def tell(self):
+        return self.entry.tell()
+
+    def close(self):
+        self.entry.close()
+        self.zip_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
 
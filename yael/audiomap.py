@@ -0,0 +1,593 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+A time-to-byte map of an audio asset (MP3 or MP4/M4A file).
+
+The map allows extracting the bytes corresponding to a
+Media Overlay `<audio>` clip (`clipBegin`/`clipEnd`)
+without decoding or reading the whole audio asset:
+
+1. for MP3 files, by scanning the MPEG frame headers
+2. for MP4 files, by reading the `stts`, `stsz`, `stsc`, and `stco`/`co64`
+   sample tables inside the `moov` box
+
+The frame/sample tables are computed lazily,
+the first time they are needed,
+and then kept with the map object.
+"""
+
+import array
+import bisect
+import struct
+
+from yael.jsonable import JSONAble
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+class AudioMap(JSONAble):
+    """
+    Build the time-to-byte map of the given audio asset.
+
+    :param asset: the audio asset
+    :type  asset: :class:`yael.asset.Asset`
+
+    """
+
+    FORMAT_MP3 = "mp3"
+    """ MPEG audio (Layer I/II/III) stream. """
+
+    FORMAT_MP4 = "mp4"
+    """ MP4 (ISO base media file format) audio container. """
+
+    # MPEG audio bitrates (kbps), indexed by [v1][layer][index]
+    MP3_BITRATES = {
+        True: {
+            1: [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+            2: [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+            3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+        },
+        False: {
+            1: [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+            2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+            3: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+        },
+    }
+
+    # MPEG audio sampling rates (Hz), indexed by version bits
+    MP3_SAMPLE_RATES = {
+        0: [11025, 12000, 8000],
+        2: [22050, 24000, 16000],
+        3: [44100, 48000, 32000],
+    }
+
+    # maximum number of bytes skipped while looking for a frame sync
+    MP3_RESYNC_WINDOW = 4096
+
+    # MP4 container boxes to descend into
+    MP4_CONTAINERS = [b"moov", b"trak", b"mdia", b"minf", b"stbl"]
+
+    def __init__(self, asset):
+        self.asset = asset
+        self.format = None
+        self.offsets = None
+        self.times = None
+        self.sizes = None
+        self.timescale = 1
+
+    def json_object(self, recursive=True):
+        obj = {
+            "internal_path": self.asset.internal_path,
+            "format":        self.format,
+            "units":         (len(self.times) if self.times != None else -1),
+            "duration":      self.duration,
+        }
+        return obj
+
+    @property
+    def duration(self):
+        """
+        The duration of the audio asset, in seconds,
+        or -1 if it has not been computed yet.
+
+        :rtype: float
+        """
+        if (self.times == None) or (len(self.times) < 1):
+            return -1
+        return 1.0 * self.times[-1] / self.timescale
+
+    def build(self):
+        """
+        Detect the format of the audio asset,
+        and build its frame (MP3) or sample (MP4) table.
+
+        The table is built only once,
+        subsequent calls are no-ops.
+
+        :returns: True if the table is available
+        :rtype:   bool
+        """
+
+        if self.times != None:
+            return True
+
+        stream = self.asset.open_stream()
+        if stream == None:
+            return False
+        try:
+            magic = stream.read(12)
+            stream.seek(0)
+            if magic[4:8] == b"ftyp":
+                self.format = AudioMap.FORMAT_MP4
+                self._build_mp4(stream)
+            elif (
+                    (magic[0:3] == b"ID3") or
+                    ((len(magic) > 1) and
+                     (bytearray(magic)[0] == 0xFF) and
+                     ((bytearray(magic)[1] & 0xE0) == 0xE0))):
+                self.format = AudioMap.FORMAT_MP3
+                self._build_mp3(stream)
+        except:
+            self.offsets = None
+            self.times = None
+            self.sizes = None
+        finally:
+            stream.close()
+        return self.times != None
+
+    def byte_range(self, clip_begin, clip_end=-1):
+        """
+        Return the byte range `(start, end)`
+        (`start` inclusive, `end` exclusive)
+        of the raw contents of the audio asset
+        covering the clip from `clip_begin` to `clip_end` seconds.
+
+        If `clip_end` is negative, the clip extends
+        until the end of the audio asset.
+
+        For MP3 files, the range starts and ends at frame boundaries,
+        hence the corresponding bytes can be played as they are.
+        For MP4 files, the range spans the samples in the clip,
+        which might be interleaved with samples of other tracks.
+
+        Return None if the audio asset cannot be mapped,
+        if the clip begins at or after the end of the audio,
+        or if `clip_end` is before `clip_begin`.
+
+        :param clip_begin: the begin of the clip, in seconds
+        :type  clip_begin: float
+        :param clip_end:   the end of the clip, in seconds
+        :type  clip_end:   float
+        :rtype:            tuple of int
+        """
+
+        if (not self.build()) or (len(self.offsets) < 1):
+            return None
+
+        if (clip_end != None) and (clip_end >= 0) and (clip_end < clip_begin):
+            return None
+        times = self.times
+        begin = int(clip_begin * self.timescale)
+        first = max(bisect.bisect_right(times, begin) - 1, 0)
+        if first >= len(self.offsets):
+            # the clip begins at or after the end of the audio
+            return None
+        if (clip_end == None) or (clip_end < 0):
+            last = len(times) - 1
+        else:
+            end = int(clip_end * self.timescale)
+            last = max(bisect.bisect_left(times, end), first + 1) - 1
+        # the last entry of `times` is the end of the last unit
+        last = min(last, len(self.offsets) - 1)
+        return (
+            self.offsets[first],
+            self.offsets[last] + self.sizes[last])
+
+    def read(self, clip_begin, clip_end=-1):
+        """
+        Return the bytes of the audio asset
+        covering the clip from `clip_begin` to `clip_end` seconds.
+
+        See :func:`yael.audiomap.AudioMap.byte_range`.
+
+        :param clip_begin: the begin of the clip, in seconds
+        :type  clip_begin: float
+        :param clip_end:   the end of the clip, in seconds
+        :type  clip_end:   float
+        :rtype:            bytes
+        """
+
+        b_range = self.byte_range(clip_begin, clip_end)
+        if b_range == None:
+            return None
+        return self.asset.read_range(b_range[0], b_range[1] - b_range[0])
+
+    def _build_mp3(self, stream):
+        offsets = array.array("l")
+        sizes = array.array("l")
+        times = array.array("l")
+
+        # skip ID3v2 tag(s), if any
+        position = 0
+        header = stream.read(10)
+        while (len(header) == 10) and (header[0:3] == b"ID3"):
+            tag = bytearray(header)
+            tag_size = (
+                (tag[6] << 21) | (tag[7] << 14) | (tag[8] << 7) | tag[9])
+            position += 10 + tag_size + (10 if (tag[5] & 0x10) else 0)
+            stream.seek(position)
+            header = stream.read(10)
+
+        # walk the frame headers, measuring time in samples
+        sample_rate = None
+        elapsed = 0
+        while len(header) >= 4:
+            frame = AudioMap._parse_mp3_header(bytearray(header[0:4]))
+            if frame == None:
+                # lost sync: look for the next frame header
+                stream.seek(position + 1)
+                window = stream.read(AudioMap.MP3_RESYNC_WINDOW)
+                shift = AudioMap._find_mp3_sync(bytearray(window))
+                if shift < 0:
+                    break
+                position += 1 + shift
+                stream.seek(position)
+                header = stream.read(4)
+                continue
+            frame_length, frame_samples, frame_rate = frame
+            if sample_rate == None:
+                sample_rate = frame_rate
+            offsets.append(position)
+            sizes.append(frame_length)
+            times.append(elapsed)
+            elapsed += frame_samples
+            position += frame_length
+            stream.seek(position)
+            header = stream.read(4)
+        times.append(elapsed)
+
+        self.timescale = sample_rate or 1
+        self.offsets = offsets
+        self.sizes = sizes
+        self.times = times
+
+    @staticmethod
+    def _parse_mp3_header(header):
+        """
+        Parse the given 4-byte MPEG audio frame header.
+
+        Return `(frame_length, frame_samples, sample_rate)`,
+        or None if the header is not valid.
+        """
+
+        if (header[0] != 0xFF) or ((header[1] & 0xE0) != 0xE0):
+            return None
+        version = (header[1] >> 3) & 0x03
+        layer = 4 - ((header[1] >> 1) & 0x03)
+        bitrate_index = header[2] >> 4
+        rate_index = (header[2] >> 2) & 0x03
+        padding = (header[2] >> 1) & 0x01
+        if (
+                (version == 1) or
+                (layer == 4) or
+                (bitrate_index in [0, 15]) or
+                (rate_index == 3)):
+            return None
+        is_v1 = (version == 3)
+        bitrate = AudioMap.MP3_BITRATES[is_v1][layer][bitrate_index] * 1000
+        sample_rate = AudioMap.MP3_SAMPLE_RATES[version][rate_index]
+        if layer == 1:
+            frame_samples = 384
+            frame_length = (12 * bitrate // sample_rate + padding) * 4
+        else:
+            frame_samples = 1152
+            if (layer == 3) and (not is_v1):
+                frame_samples = 576
+            frame_length = (frame_samples // 8) * bitrate // sample_rate + padding
+        if frame_length < 4:
+            return None
+        return (frame_length, frame_samples, sample_rate)
+
+    @staticmethod
+    def _find_mp3_sync(window):
+        for i in range(len(window) - 3):
+            if (
+                    (window[i] == 0xFF) and
+                    (AudioMap._parse_mp3_header(window[i:i+4]) != None)):
+                return i
+        return -1
+
+    def _build_mp4(self, stream):
+        # locate the `moov` box among the top-level boxes,
+        # without reading the (possibly huge) `mdat` box
+        moov = None
+        position = 0
+        while True:
+            stream.seek(position)
+            box = AudioMap._read_mp4_box_header(stream)
+            if box == None:
+                break
+            box_type, header_size, box_size = box
+            if box_type == b"moov":
+                moov = stream.read(box_size - header_size)
+                break
+            if box_size < header_size:
+                # the box extends until the end of the file
+                break
+            position += box_size
+        if moov == None:
+            raise Exception("Cannot find 'moov' box")
+
+        # select the first audio track (or the first track)
+        tracks = AudioMap._mp4_children(moov, 0, len(moov), b"trak")
+        tables = None
+        for track in tracks:
+            candidate = self._parse_mp4_track(moov, track)
+            if candidate == None:
+                continue
+            if (tables == None) or (candidate["handler"] == b"soun"):
+                tables = candidate
+            if candidate["handler"] == b"soun":
+                break
+        if tables == None:
+            raise Exception("Cannot find a track with sample tables")
+
+        # expand sample times
+        times = array.array("q")
+        elapsed = 0
+        for count, delta in tables["stts"]:
+            for unused in range(count):
+                times.append(elapsed)
+                elapsed += delta
+        sample_count = len(times)
+        times.append(elapsed)
+
+        # expand sample sizes
+        uniform_size, size_table = tables["stsz"]
+        if uniform_size > 0:
+            sizes = array.array("q", [uniform_size] * sample_count)
+        else:
+            sizes = array.array("q", size_table[0:sample_count])
+
+        # expand sample offsets, walking the chunks
+        offsets = array.array("q")
+        chunk_offsets = tables["stco"]
+        stsc = tables["stsc"]
+        sample = 0
+        for i in range(len(stsc)):
+            first_chunk, samples_per_chunk = stsc[i]
+            if i + 1 < len(stsc):
+                next_first_chunk = stsc[i + 1][0]
+            else:
+                next_first_chunk = len(chunk_offsets) + 1
+            for chunk in range(first_chunk, next_first_chunk):
+                offset = chunk_offsets[chunk - 1]
+                for unused in range(samples_per_chunk):
+                    if sample >= sample_count:
+                        break
+                    offsets.append(offset)
+                    offset += sizes[sample]
+                    sample += 1
+
+        self.timescale = tables["timescale"]
+        self.offsets = offsets
+        self.sizes = sizes[0:len(offsets)]
+        self.times = times[0:len(offsets) + 1]
+
+    def _parse_mp4_track(self, data, track):
+        start, end = track
+        mdia = AudioMap._mp4_first(data, start, end, b"mdia")
+        if mdia == None:
+            return None
+        result = {"handler": None, "timescale": 1}
+        mdhd = AudioMap._mp4_first(data, mdia[0], mdia[1], b"mdhd")
+        if mdhd != None:
+            version = bytearray(data[mdhd[0]:mdhd[0]+1])[0]
+            if version == 1:
+                result["timescale"] = struct.unpack(
+                    ">I", data[mdhd[0]+20:mdhd[0]+24])[0]
+            else:
+                result["timescale"] = struct.unpack(
+                    ">I", data[mdhd[0]+12:mdhd[0]+16])[0]
+        hdlr = AudioMap._mp4_first(data, mdia[0], mdia[1], b"hdlr")
+        if hdlr != None:
+            result["handler"] = data[hdlr[0]+8:hdlr[0]+12]
+        minf = AudioMap._mp4_first(data, mdia[0], mdia[1], b"minf")
+        if minf == None:
+            return None
+        stbl = AudioMap._mp4_first(data, minf[0], minf[1], b"stbl")
+        if stbl == None:
+            return None
+
+        # time-to-sample table
+        stts = AudioMap._mp4_first(data, stbl[0], stbl[1], b"stts")
+        # sample size table
+        stsz = AudioMap._mp4_first(data, stbl[0], stbl[1], b"stsz")
+        # sample-to-chunk table
+        stsc = AudioMap._mp4_first(data, stbl[0], stbl[1], b"stsc")
+        # chunk offset table (32 or 64 bit)
+        stco = AudioMap._mp4_first(data, stbl[0], stbl[1], b"stco")
+        co64 = AudioMap._mp4_first(data, stbl[0], stbl[1], b"co64")
+        if (
+                (stts == None) or
+                (stsz == None) or
+                (stsc == None) or
+                ((stco == None) and (co64 == None))):
+            return None
+
+        result["stts"] = AudioMap._mp4_table(data, stts[0], 2)
+        result["stsc"] = list(
+            (e[0], e[1]) for e in AudioMap._mp4_table(data, stsc[0], 3))
+        if stco != None:
+            result["stco"] = list(
+                e[0] for e in AudioMap._mp4_table(data, stco[0], 1))
+        else:
+            count = struct.unpack(">I", data[co64[0]+4:co64[0]+8])[0]
+            result["stco"] = list(struct.unpack(
+                ">%dQ" % count,
+                data[co64[0]+8:co64[0]+8+8*count]))
+        uniform_size, count = struct.unpack(
+            ">II",
+            data[stsz[0]+4:stsz[0]+12])
+        size_table = []
+        if uniform_size == 0:
+            size_table = list(struct.unpack(
+                ">%dI" % count,
+                data[stsz[0]+12:stsz[0]+12+4*count]))
+        result["stsz"] = (uniform_size, size_table)
+        return result
+
+    @staticmethod
+    def _read_mp4_box_header(stream):
+        header = stream.read(8)
+        if len(header) < 8:
+            return None
+        box_size, box_type = struct.unpack(">I4s", header)
+        header_size = 8
+        if box_size == 1:
+            box_size = struct.unpack(">Q", stream.read(8))[0]
+            header_size = 16
+        return (box_type, header_size, box_size)
+
+    @staticmethod
+    def _mp4_children(data, start, end, wanted):
+        """
+        Return the list of `(payload_start, payload_end)`
+        of the boxes of type `wanted`
+        found between `start` and `end` in `data`.
+        """
+
+        accumulator = []
+        position = start
+        while position + 8 <= end:
+            box_size, box_type = struct.unpack(
+                ">I4s",
+                data[position:position+8])
+            header_size = 8
+            if box_size == 1:
+                box_size = struct.unpack(
+                    ">Q",
+                    data[position+8:position+16])[0]
+                header_size = 16
+            elif box_size == 0:
+                box_size = end - position
+            if box_size < header_size:
+                break
+            if box_type == wanted:
+                accumulator.append(
+                    (position + header_size, position + box_size))
+            position += box_size
+        return accumulator
+
+    @staticmethod
+    def _mp4_first(data, start, end, wanted):
+        children = AudioMap._mp4_children(data, start, end, wanted)
+        if len(children) > 0:
+            return children[0]
+        return None
+
+    @staticmethod
+    def _mp4_table(data, start, width):
+        """
+        Unpack the table of a full box starting at `start`,
+        whose entries are `width` 32-bit big endian unsigned integers.
+        """
+
+        count = struct.unpack(">I", data[start+4:start+8])[0]
+        values = struct.unpack(
+            ">%dI" % (count * width),
+            data[start+8:start+8+4*count*width])
+        return list(
+            values[i:i+width] for i in range(0, len(values), width))
+
+    @property
+    def asset(self):
+        """
+        The audio asset.
+
+        :rtype: :class:`yael.asset.Asset`
+        """
+        return self.__asset
+
+    @asset.setter
+    def asset(self, asset):
+        self.__asset = asset
+
+    @property
+    def format(self):
+        """
+        The format of the audio asset
+        (:const:`yael.audiomap.AudioMap.FORMAT_MP3` or
+        :const:`yael.audiomap.AudioMap.FORMAT_MP4`),
+        or None if not detected (yet).
+
+        :rtype: str
+        """
+        return self.__format
+
+    @format.setter
+    def format(self, format):
+        self.__format = format
+
+    @property
+    def timescale(self):
+        """
+        The number of time units per second
+        (the sampling rate for MP3 files,
+        the media timescale for MP4 files).
+
+        :rtype: int
+        """
+        return self.__timescale
+
+    @timescale.setter
+    def timescale(self, timescale):
+        self.__timescale = timescale
+
+    @property
+    def offsets(self):
+        """
+        The byte offsets of the frames (MP3) or samples (MP4).
+
+        :rtype: array of int
+        """
+        return self.__offsets
+
+    @offsets.setter
+    def offsets(self, offsets):
+        self.__offsets = offsets
+
+    @property
+    def sizes(self):
+        """
+        The sizes, in bytes, of the frames (MP3) or samples (MP4).
+
+        :rtype: array of int
+        """
+        return self.__sizes
+
+    @sizes.setter
+    def sizes(self, sizes):
+        self.__sizes = sizes
+
+    @property
+    def times(self):
+        """
+        The start times, in `timescale` units,
+        of the frames (MP3) or samples (MP4),
+        followed by the end time of the last one.
+
+        :rtype: array of int
+        """
+        return self.__times
+
+    @times.setter
+    def times(self, times):
+        self.__times = times
+
+
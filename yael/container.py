@@ -46,6 +46,7 @@ class Container(Element):
     A_NS_MEDIA = "{{{0}}}{1}".format(Namespace.RENDITION, A_MEDIA)
     E_CONTAINER = "container"
     E_LINK = "link"
+    E_LINKS = "links"
     E_ROOTFILE = "rootfile"
     E_ROOTFILES = "rootfiles"
     V_ACCESSMODE_AUDITORY = "auditory"
@@ -97,11 +98,12 @@ class Container(Element):
             for rootfile in rootfile_arr:
                 self._parse_rootfile(rootfile)
 
-            # locate `<link>` optional element
+            # locate `<link>` optional elements
+            # (directly inside `<container>`, or inside `<links>`)
             link_arr = yael.util.query_xpath(
                 obj=container,
-                query="{0}:{1}",
-                args=['c', Container.E_LINK],
+                query="{0}:{1} | {0}:{2}/{0}:{1}",
+                args=['c', Container.E_LINK, Container.E_LINKS],
                 nsp={'c': Namespace.CONTAINER},
                 required=None)
             for link in link_arr:
@@ -160,6 +162,91 @@ class Container(Element):
 
         return yael.util.safe_first(self.renditions)
 
+    def select_rendition(
+            self,
+            layout=None,
+            language=None,
+            media=None,
+            accessmode=None):
+        """
+        Return the Rendition best matching the given criteria,
+        using only the `rendition:*` attributes
+        of the `<rootfile>` elements
+        (that is, without parsing the Package Documents).
+
+        A Rendition matches a criterion if its attribute
+        has the requested value, and it is compatible
+        with a criterion if it does not have the attribute;
+        a Rendition with an attribute having a different value
+        is not selected.
+        The selected Rendition is the one matching
+        the most criteria (the first one, in case of ties).
+        If no Rendition is compatible with the criteria,
+        the Default Rendition is returned.
+
+        Languages match if one is a prefix (subtag-wise)
+        of the other, e.g., `en` and `en-US`.
+        Media queries are compared as normalized strings,
+        and they are not evaluated.
+
+        :param layout:     the `rendition:layout` value
+                           (e.g., :data:`yael.container.Container.V_LAYOUT_REFLOWABLE`)
+        :type  layout:     str
+        :param language:   the `rendition:language` value
+        :type  language:   str
+        :param media:      the `rendition:media` value
+        :type  media:      str
+        :param accessmode: the `rendition:accessMode` value
+                           (e.g., :data:`yael.container.Container.V_ACCESSMODE_VISUAL`)
+        :type  accessmode: str
+        :rtype:            :class:`yael.rendition.Rendition`
+        """
+
+        criteria = [
+            (layout, "v_rendition_layout", Container._match_exact),
+            (language, "v_rendition_language", Container._match_language),
+            (media, "v_rendition_media", Container._match_media),
+            (accessmode, "v_rendition_accessmode", Container._match_accessmode),
+        ]
+        criteria = [c for c in criteria if c[0] != None]
+        selected = None
+        selected_score = -1
+        for rendition in self.renditions:
+            score = 0
+            for value, attribute, match in criteria:
+                rendition_value = getattr(rendition, attribute)
+                if rendition_value == None:
+                    continue
+                if not match(value, rendition_value):
+                    score = None
+                    break
+                score += 1
+            if (score != None) and (score > selected_score):
+                selected = rendition
+                selected_score = score
+        if selected == None:
+            return self.default_rendition
+        return selected
+
+    @staticmethod
+    def _match_exact(value, rendition_value):
+        return value.strip() == rendition_value.strip()
+
+    @staticmethod
+    def _match_language(value, rendition_value):
+        value = value.strip().lower().split("-")
+        rendition_value = rendition_value.strip().lower().split("-")
+        length = min(len(value), len(rendition_value))
+        return value[:length] == rendition_value[:length]
+
+    @staticmethod
+    def _match_media(value, rendition_value):
+        return " ".join(value.lower().split()) == " ".join(rendition_value.lower().split())
+
+    @staticmethod
+    def _match_accessmode(value, rendition_value):
+        return value.strip() in rendition_value.split()
+
     def _parse_rootfile(self, obj):
         """
         Parse the given `<rootfile>` node object,
@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+Statistics of the Content Documents in the spine of a Rendition:
+word, character, and image counts,
+and estimated reading time.
+
+Each Content Document is parsed once, in streaming mode
+(see :class:`yael.textextractor.TextExtractor`),
+and the Content Documents are processed in parallel threads.
+
+The counts of each Content Document can be cached
+across computations, keyed by its internal path
+and by the CRC-32 of its contents
+(read from the ZIP central directory, for a compressed Publication),
+so that only the changed Content Documents are parsed again.
+
+The counts are also aggregated for each TOC entry,
+at the granularity of spine items:
+a TOC entry covers the spine items from its target
+up to the target of the next TOC entry
+which is not one of its descendants.
+"""
+
+import zipfile
+
+from yael.jsonable import JSONAble
+from yael.manifestation import Manifestation
+from yael.opfspine import OPFSpine
+from yael.textextractor import TextExtractor
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+class ContentStatistics(JSONAble):
+    """
+    Compute the statistics of the given `publication`.
+
+    The Content Documents are parsed in parallel threads,
+    unless `max_workers` is 1 or `concurrent.futures`
+    is not available.
+
+    :param publication:      the Publication
+    :type  publication:      :class:`yael.publication.Publication`
+    :param rendition:        the Rendition (if None, the default Rendition)
+    :type  rendition:        :class:`yael.rendition.Rendition`
+    :param extractor:        the text extractor
+                             (if None, count all the text)
+    :type  extractor:        :class:`yael.textextractor.TextExtractor`
+    :param words_per_minute: the reading speed, in words per minute
+    :type  words_per_minute: int
+    :param max_workers:      the maximum number of parsing threads
+                             (None for the `concurrent.futures` default)
+    :type  max_workers:      int
+    :param cache:            the cache of the counts,
+                             updated with the computed ones
+                             (it must be used with a single extractor
+                             configuration)
+    :type  cache:            dict
+
+    """
+
+    DEFAULT_WORDS_PER_MINUTE = 250
+    """ The default reading speed, in words per minute. """
+
+    IMAGE_ELEMENTS = ["img", "image"]
+    """ The local names of the image elements (HTML and SVG). """
+
+    COUNTS = ["words", "characters", "images"]
+    """ The keys of the counts. """
+
+    def __init__(
+            self,
+            publication=None,
+            rendition=None,
+            extractor=None,
+            words_per_minute=DEFAULT_WORDS_PER_MINUTE,
+            max_workers=None,
+            cache=None):
+        self._reset()
+        if publication != None:
+            self.build(
+                publication,
+                rendition,
+                extractor,
+                words_per_minute,
+                max_workers,
+                cache)
+
+    def json_object(self, recursive=True):
+        obj = {
+            "totals":    self.totals,
+            "documents": len(self.documents),
+            "toc":       len(self.toc),
+        }
+        if recursive:
+            obj["documents"] = self.documents
+            obj["toc"] = self.toc
+        return obj
+
+    def build(
+            self,
+            publication,
+            rendition=None,
+            extractor=None,
+            words_per_minute=DEFAULT_WORDS_PER_MINUTE,
+            max_workers=None,
+            cache=None):
+        """
+        Compute the statistics,
+        replacing the current contents of this object.
+
+        :param publication:      the Publication
+        :type  publication:      :class:`yael.publication.Publication`
+        :param rendition:        the Rendition (if None, the default Rendition)
+        :type  rendition:        :class:`yael.rendition.Rendition`
+        :param extractor:        the text extractor
+                                 (if None, count all the text)
+        :type  extractor:        :class:`yael.textextractor.TextExtractor`
+        :param words_per_minute: the reading speed, in words per minute
+        :type  words_per_minute: int
+        :param max_workers:      the maximum number of parsing threads
+                                 (None for the `concurrent.futures` default)
+        :type  max_workers:      int
+        :param cache:            the cache of the counts,
+                                 updated with the computed ones
+        :type  cache:            dict
+        """
+
+        self._reset()
+        if rendition == None:
+            rendition = publication.default_rendition
+        if extractor == None:
+            extractor = TextExtractor()
+        pac_document = rendition.pac_document
+
+        # read the ZIP central directory only once
+        zip_file = None
+        if publication.manifestation == Manifestation.COMPRESSED:
+            zip_file = zipfile.ZipFile(publication.path, mode="r")
+        try:
+            jobs = []
+            keys = []
+            for itemref in pac_document.spine.itemrefs:
+                asset = None
+                item = pac_document.manifest.item_by_id(itemref.v_idref)
+                if item != None:
+                    asset = publication.assets.get(item.internal_path)
+                key = None
+                if asset != None:
+                    key = (item.internal_path, asset.crc(zip_file=zip_file))
+                    if (key[1] < 0) or (cache == None) or (key not in cache):
+                        jobs.append((asset, zip_file, extractor))
+                        key = (key, True)
+                    else:
+                        key = (key, False)
+                keys.append(key)
+                self.documents.append({
+                    "spine_index":   len(self.documents),
+                    "internal_path": None if item == None else item.internal_path,
+                    "linear":        itemref.v_linear != OPFSpine.V_NO,
+                })
+            if (
+                    (ThreadPoolExecutor != None) and
+                    (max_workers != 1) and
+                    (len(jobs) > 1)):
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    results = list(executor.map(ContentStatistics._count, jobs))
+            else:
+                results = list(ContentStatistics._count(job) for job in jobs)
+        finally:
+            if zip_file != None:
+                zip_file.close()
+
+        results.reverse()
+        for document, key in zip(self.documents, keys):
+            counts = None
+            if key != None:
+                key, computed = key
+                if computed:
+                    counts = results.pop()
+                    if (counts != None) and (key[1] >= 0) and (cache != None):
+                        cache[key] = counts
+                else:
+                    counts = cache[key]
+            if counts == None:
+                counts = (0, 0, 0)
+            self._set_counts(document, counts, words_per_minute)
+        self._set_counts(
+            self.totals,
+            self._sum_counts(self.documents),
+            words_per_minute)
+        self._aggregate_toc(rendition, words_per_minute)
+
+    def _reset(self):
+        self.documents = []
+        self.totals = {}
+        self.toc = []
+
+    @staticmethod
+    def _count(job):
+        # count words, characters, and images of a Content Document
+        # (run in a worker thread)
+        asset, zip_file, extractor = job
+        stream = asset.open_stream(zip_file=zip_file)
+        if stream == None:
+            return None
+        words = 0
+        characters = 0
+        names = {}
+        try:
+            for element_id, text in extractor.chunks(stream, counts=names):
+                words += len(text.split())
+                characters += len(text)
+        except:
+            return None
+        finally:
+            stream.close()
+        images = sum(names.get(n, 0) for n in ContentStatistics.IMAGE_ELEMENTS)
+        return (words, characters, images)
+
+    @staticmethod
+    def _set_counts(obj, counts, words_per_minute):
+        for key, value in zip(ContentStatistics.COUNTS, counts):
+            obj[key] = value
+        obj["reading_time"] = obj["words"] * 60.0 / words_per_minute
+
+    @staticmethod
+    def _sum_counts(objs):
+        return tuple(
+            sum(o[key] for o in objs) for key in ContentStatistics.COUNTS)
+
+    def _aggregate_toc(self, rendition, words_per_minute):
+        # aggregate the counts of the spine items covered by each TOC entry,
+        # using prefix sums over the spine
+        toc_index = rendition.toc_index
+        if toc_index == None:
+            return
+        pac_document = rendition.pac_document
+        prefix = [(0, 0, 0)]
+        for document in self.documents:
+            prefix.append(tuple(
+                p + document[key] for p, key in zip(prefix[-1], ContentStatistics.COUNTS)))
+        length = len(toc_index)
+        spine_indices = []
+        for internal_path in toc_index.internal_paths:
+            spine_index = -1
+            if internal_path != None:
+                spine_index = pac_document.spine_index_by_internal_path(internal_path)
+            spine_indices.append(spine_index)
+
+        # the first valid spine index at or after each TOC index
+        next_valid = [len(self.documents)] * (length + 1)
+        for index in range(length - 1, -1, -1):
+            next_valid[index] = next_valid[index + 1]
+            if spine_indices[index] > -1:
+                next_valid[index] = spine_indices[index]
+
+        for index in range(length):
+            entry = {
+                "index":         index,
+                "label":         toc_index.labels[index],
+                "internal_path": toc_index.internal_paths[index],
+            }
+            start = spine_indices[index]
+            counts = (0, 0, 0)
+            if start > -1:
+                stop = max(next_valid[toc_index.ends[index]], start + 1)
+                counts = tuple(b - a for a, b in zip(prefix[start], prefix[stop]))
+            self._set_counts(entry, counts, words_per_minute)
+            self.toc.append(entry)
+
+    @property
+    def documents(self):
+        """
+        The statistics of each spine item, in spine order,
+        as dictionaries with keys
+        `spine_index`, `internal_path`, `linear`,
+        `words`, `characters`, `images`,
+        and `reading_time` (in seconds).
+
+        Characters are counted after collapsing whitespace.
+
+        :rtype: list of dict
+        """
+        return self.__documents
+
+    @documents.setter
+    def documents(self, documents):
+        self.__documents = documents
+
+    @property
+    def totals(self):
+        """
+        The statistics of the whole spine,
+        as a dictionary with keys
+        `words`, `characters`, `images`,
+        and `reading_time` (in seconds).
+
+        :rtype: dict
+        """
+        return self.__totals
+
+    @totals.setter
+    def totals(self, totals):
+        self.__totals = totals
+
+    @property
+    def toc(self):
+        """
+        The statistics aggregated for each TOC entry,
+        in TOC order (see :class:`yael.tocindex.TOCIndex`),
+        as dictionaries with keys
+        `index`, `label`, `internal_path`,
+        `words`, `characters`, `images`,
+        and `reading_time` (in seconds).
+
+        :rtype: list of dict
+        """
+        return self.__toc
+
+    @toc.setter
+    def toc(self, toc):
+        self.__toc = toc
+
+
@@ -0,0 +1,527 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+A structural diff between two versions (editions) of a Publication.
+
+The diff reports the manifest items
+added, removed, or modified (by size and CRC-32),
+the other files of the container added, removed, or modified,
+the changes of the spine (added, removed, and moved items),
+of the metadata, and of the TOC.
+
+The sizes and the CRC-32 values of the ZIP entries
+are read from the ZIP central directory,
+so the assets of a compressed Publication are never decompressed;
+the CRC-32 of a file of an uncompressed Publication
+is computed only if the file has the same size
+as the corresponding file of the other Publication.
+"""
+
+import collections
+import difflib
+import zipfile
+
+from yael.asset import Asset
+from yael.jsonable import JSONAble
+from yael.manifestation import Manifestation
+from yael.opfdc import OPFDC
+from yael.opfmeta2 import OPFMeta2
+from yael.opfmeta3 import OPFMeta3
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+class PublicationDiff(JSONAble):
+    """
+    Build the diff between the `old` and the `new` Publication,
+    comparing the given Renditions.
+
+    :param old:           the old Publication
+    :type  old:           :class:`yael.publication.Publication`
+    :param new:           the new Publication
+    :type  new:           :class:`yael.publication.Publication`
+    :param old_rendition: the Rendition of the old Publication
+                          (if None, the default Rendition)
+    :type  old_rendition: :class:`yael.rendition.Rendition`
+    :param new_rendition: the Rendition of the new Publication
+                          (if None, the default Rendition)
+    :type  new_rendition: :class:`yael.rendition.Rendition`
+
+    """
+
+    ITEM_ATTRIBUTES = [
+        "v_id",
+        "v_media_type",
+        "v_properties",
+        "v_fallback",
+        "v_media_overlay",
+    ]
+    """ The attributes of the manifest items compared by the diff. """
+
+    def __init__(self, old=None, new=None, old_rendition=None, new_rendition=None):
+        self._reset()
+        if (old != None) and (new != None):
+            self.build(old, new, old_rendition, new_rendition)
+
+    def json_object(self, recursive=True):
+        obj = {
+            "added_items":      len(self.added_items),
+            "removed_items":    len(self.removed_items),
+            "modified_items":   len(self.modified_items),
+            "item_changes":     len(self.item_changes),
+            "added_files":      len(self.added_files),
+            "removed_files":    len(self.removed_files),
+            "modified_files":   len(self.modified_files),
+            "spine_added":      len(self.spine_added),
+            "spine_removed":    len(self.spine_removed),
+            "spine_moved":      len(self.spine_moved),
+            "metadata_changes": len(self.metadata_changes),
+            "toc_added":        len(self.toc_added),
+            "toc_removed":      len(self.toc_removed),
+        }
+        if recursive:
+            obj["added_items"] = self.added_items
+            obj["removed_items"] = self.removed_items
+            obj["modified_items"] = self.modified_items
+            obj["item_changes"] = self.item_changes
+            obj["added_files"] = self.added_files
+            obj["removed_files"] = self.removed_files
+            obj["modified_files"] = self.modified_files
+            obj["spine_added"] = self.spine_added
+            obj["spine_removed"] = self.spine_removed
+            obj["spine_moved"] = self.spine_moved
+            obj["metadata_changes"] = self.metadata_changes
+            obj["toc_added"] = self.toc_added
+            obj["toc_removed"] = self.toc_removed
+        return obj
+
+    @property
+    def changed(self):
+        """
+        True if the two Publications differ.
+
+        :rtype: bool
+        """
+        return any(len(v) > 0 for v in self.json_object(recursive=True).values())
+
+    def build(self, old, new, old_rendition=None, new_rendition=None):
+        """
+        Compute the diff,
+        replacing the current contents of this diff.
+
+        :param old:           the old Publication
+        :type  old:           :class:`yael.publication.Publication`
+        :param new:           the new Publication
+        :type  new:           :class:`yael.publication.Publication`
+        :param old_rendition: the Rendition of the old Publication
+                              (if None, the default Rendition)
+        :type  old_rendition: :class:`yael.rendition.Rendition`
+        :param new_rendition: the Rendition of the new Publication
+                              (if None, the default Rendition)
+        :type  new_rendition: :class:`yael.rendition.Rendition`
+        """
+
+        self._reset()
+        if old_rendition == None:
+            old_rendition = old.default_rendition
+        if new_rendition == None:
+            new_rendition = new.default_rendition
+        old_items = PublicationDiff._items(old_rendition)
+        new_items = PublicationDiff._items(new_rendition)
+
+        # files, compared by size and CRC-32
+        old_files = PublicationDiff.file_table(old)
+        new_files = PublicationDiff.file_table(new)
+        modified = []
+        for internal_path in sorted(set(old_files) & set(new_files)):
+            old_size, old_crc = old_files[internal_path]
+            new_size, new_crc = new_files[internal_path]
+            if old_size == new_size:
+                if old_crc == None:
+                    old_crc = PublicationDiff._crc(old, internal_path)
+                if new_crc == None:
+                    new_crc = PublicationDiff._crc(new, internal_path)
+                if old_crc == new_crc:
+                    continue
+            modified.append(internal_path)
+        items = set(old_items) | set(new_items)
+        self.added_items = sorted(p for p in new_items if p not in old_items)
+        self.removed_items = sorted(p for p in old_items if p not in new_items)
+        self.modified_items = list(p for p in modified if p in items)
+        self.added_files = sorted(
+            p for p in new_files if (p not in old_files) and (p not in items))
+        self.removed_files = sorted(
+            p for p in old_files if (p not in new_files) and (p not in items))
+        self.modified_files = list(p for p in modified if p not in items)
+
+        # attributes of the manifest items
+        for internal_path in sorted(set(old_items) & set(new_items)):
+            changes = {}
+            for attribute in PublicationDiff.ITEM_ATTRIBUTES:
+                old_value = getattr(old_items[internal_path], attribute)
+                new_value = getattr(new_items[internal_path], attribute)
+                if old_value != new_value:
+                    changes[attribute[2:]] = [old_value, new_value]
+            if len(changes) > 0:
+                self.item_changes[internal_path] = changes
+
+        # spine
+        old_spine = old_rendition.pac_document.files_referenced_spine
+        new_spine = new_rendition.pac_document.files_referenced_spine
+        old_set = set(old_spine)
+        new_set = set(new_spine)
+        self.spine_added = list(p for p in new_spine if p not in old_set)
+        self.spine_removed = list(p for p in old_spine if p not in new_set)
+        old_common = list(p for p in old_spine if p in new_set)
+        new_common = list(p for p in new_spine if p in old_set)
+        matcher = difflib.SequenceMatcher(None, old_common, new_common, autojunk=False)
+        kept = set()
+        for block in matcher.get_matching_blocks():
+            kept.update(new_common[block.b:block.b + block.size])
+        self.spine_moved = list(p for p in new_common if p not in kept)
+
+        # metadata
+        old_metadata = PublicationDiff._metadata(old_rendition)
+        new_metadata = PublicationDiff._metadata(new_rendition)
+        for key in sorted(set(old_metadata) | set(new_metadata)):
+            old_values = old_metadata.get(key, collections.Counter())
+            new_values = new_metadata.get(key, collections.Counter())
+            removed = sorted((old_values - new_values).elements())
+            added = sorted((new_values - old_values).elements())
+            if (len(removed) > 0) or (len(added) > 0):
+                self.metadata_changes[key] = {
+                    "removed": removed,
+                    "added":   added,
+                }
+
+        # TOC
+        old_toc = old_rendition.toc_index
+        new_toc = new_rendition.toc_index
+        old_entries = []
+        new_entries = []
+        if old_toc != None:
+            old_entries = old_toc.entries
+        if new_toc != None:
+            new_entries = new_toc.entries
+        matcher = difflib.SequenceMatcher(
+            None,
+            list(PublicationDiff._toc_key(e) for e in old_entries),
+            list(PublicationDiff._toc_key(e) for e in new_entries),
+            autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag != "equal":
+                self.toc_removed.extend(old_entries[i1:i2])
+                self.toc_added.extend(new_entries[j1:j2])
+
+    def _reset(self):
+        self.added_items = []
+        self.removed_items = []
+        self.modified_items = []
+        self.item_changes = {}
+        self.added_files = []
+        self.removed_files = []
+        self.modified_files = []
+        self.spine_added = []
+        self.spine_removed = []
+        self.spine_moved = []
+        self.metadata_changes = {}
+        self.toc_added = []
+        self.toc_removed = []
+
+    @staticmethod
+    def file_table(publication):
+        """
+        Return a dictionary mapping the internal path
+        of each file in the container of the given Publication
+        to its `(size, crc)` tuple, where `crc` is the CRC-32
+        if it is known without reading the file
+        (i.e., from the ZIP central directory), or None.
+
+        :param publication: the Publication
+        :type  publication: :class:`yael.publication.Publication`
+        :rtype:             dict
+        """
+        table = {}
+        try:
+            if publication.manifestation == Manifestation.COMPRESSED:
+                zip_file = zipfile.ZipFile(publication.path, mode="r")
+                for info in zip_file.infolist():
+                    if not info.filename.endswith("/"):
+                        table[info.filename] = (info.file_size, info.CRC)
+                zip_file.close()
+            elif publication.manifestation == Manifestation.UNCOMPRESSED:
+                if publication.directory_index != None:
+                    for internal_path, entry in publication.directory_index.entries.items():
+                        table[internal_path] = (entry[0], None)
+                else:
+                    for internal_path, asset in publication.assets.items():
+                        size = asset.raw_size
+                        if size > -1:
+                            table[internal_path] = (size, None)
+            else:
+                for internal_path, asset in publication.assets.items():
+                    if asset.data != None:
+                        table[internal_path] = (len(asset.data), asset.crc())
+        except:
+            pass
+        return table
+
+    @staticmethod
+    def _crc(publication, internal_path):
+        # compute the CRC-32 of the file at the given internal path
+        asset = publication.assets.get(internal_path)
+        if asset == None:
+            asset = Asset(
+                absolute_path=publication.path,
+                relative_path=internal_path,
+                internal_path=internal_path)
+        return asset.crc()
+
+    @staticmethod
+    def _items(rendition):
+        # map the internal path of each manifest item to the item
+        items = {}
+        for item in rendition.pac_document.manifest.items:
+            if item.internal_path != None:
+                items[item.internal_path] = item
+        return items
+
+    @staticmethod
+    def _metadata(rendition):
+        # map the key of each metadatum to the counter of its values
+        metadata = {}
+        try:
+            metadatums = rendition.pac_document.metadata.metadata
+        except:
+            metadatums = []
+        for metadatum in metadatums:
+            key = None
+            value = metadatum.v_text
+            if isinstance(metadatum, OPFDC):
+                key = "dc:" + metadatum.v_tag.split("}")[-1]
+            elif isinstance(metadatum, OPFMeta3):
+                key = "meta:" + str(metadatum.v_property)
+                if metadatum.v_refines != None:
+                    key += " refines " + metadatum.v_refines
+            elif isinstance(metadatum, OPFMeta2):
+                key = "meta:" + str(metadatum.v_name)
+                if metadatum.v_content != None:
+                    value = metadatum.v_content
+            if key != None:
+                # an empty element has no text: compare (and sort) it as ""
+                if value == None:
+                    value = ""
+                if key not in metadata:
+                    metadata[key] = collections.Counter()
+                metadata[key][value] += 1
+        return metadata
+
+    @staticmethod
+    def _toc_key(entry):
+        return (
+            entry["depth"],
+            entry["label"],
+            entry["internal_path"],
+            entry["fragment"])
+
+    @property
+    def added_items(self):
+        """
+        The internal paths of the manifest items
+        in the new Publication only.
+
+        :rtype: list of str
+        """
+        return self.__added_items
+
+    @added_items.setter
+    def added_items(self, added_items):
+        self.__added_items = added_items
+
+    @property
+    def removed_items(self):
+        """
+        The internal paths of the manifest items
+        in the old Publication only.
+
+        :rtype: list of str
+        """
+        return self.__removed_items
+
+    @removed_items.setter
+    def removed_items(self, removed_items):
+        self.__removed_items = removed_items
+
+    @property
+    def modified_items(self):
+        """
+        The internal paths of the manifest items
+        whose contents differ (by size or CRC-32).
+
+        :rtype: list of str
+        """
+        return self.__modified_items
+
+    @modified_items.setter
+    def modified_items(self, modified_items):
+        self.__modified_items = modified_items
+
+    @property
+    def item_changes(self):
+        """
+        The changed attributes of the manifest items
+        in both Publications, as a dictionary mapping
+        each internal path to a dictionary mapping
+        each changed attribute (e.g., `media_type`)
+        to the list `[old value, new value]`.
+
+        :rtype: dict
+        """
+        return self.__item_changes
+
+    @item_changes.setter
+    def item_changes(self, item_changes):
+        self.__item_changes = item_changes
+
+    @property
+    def added_files(self):
+        """
+        The internal paths of the files,
+        not listed in the manifests,
+        in the container of the new Publication only.
+
+        :rtype: list of str
+        """
+        return self.__added_files
+
+    @added_files.setter
+    def added_files(self, added_files):
+        self.__added_files = added_files
+
+    @property
+    def removed_files(self):
+        """
+        The internal paths of the files,
+        not listed in the manifests,
+        in the container of the old Publication only.
+
+        :rtype: list of str
+        """
+        return self.__removed_files
+
+    @removed_files.setter
+    def removed_files(self, removed_files):
+        self.__removed_files = removed_files
+
+    @property
+    def modified_files(self):
+        """
+        The internal paths of the files,
+        not listed in the manifests
+        (e.g., the Package Document),
+        whose contents differ (by size or CRC-32).
+
+        :rtype: list of str
+        """
+        return self.__modified_files
+
+    @modified_files.setter
+    def modified_files(self, modified_files):
+        self.__modified_files = modified_files
+
+    @property
+    def spine_added(self):
+        """
+        The internal paths of the spine items
+        in the new Publication only, in spine order.
+
+        :rtype: list of str
+        """
+        return self.__spine_added
+
+    @spine_added.setter
+    def spine_added(self, spine_added):
+        self.__spine_added = spine_added
+
+    @property
+    def spine_removed(self):
+        """
+        The internal paths of the spine items
+        in the old Publication only, in spine order.
+
+        :rtype: list of str
+        """
+        return self.__spine_removed
+
+    @spine_removed.setter
+    def spine_removed(self, spine_removed):
+        self.__spine_removed = spine_removed
+
+    @property
+    def spine_moved(self):
+        """
+        The internal paths of the spine items
+        in both Publications, whose relative order changed,
+        in the new spine order
+        (the fewest items which, moved, reorder the old spine
+        into the new one).
+
+        :rtype: list of str
+        """
+        return self.__spine_moved
+
+    @spine_moved.setter
+    def spine_moved(self, spine_moved):
+        self.__spine_moved = spine_moved
+
+    @property
+    def metadata_changes(self):
+        """
+        The changes of the metadata, as a dictionary
+        mapping each key (e.g., `dc:title`, `meta:dcterms:modified`,
+        or `meta:role refines #creator`)
+        to a dictionary with keys `removed` and `added`,
+        listing the values removed and added.
+
+        :rtype: dict
+        """
+        return self.__metadata_changes
+
+    @metadata_changes.setter
+    def metadata_changes(self, metadata_changes):
+        self.__metadata_changes = metadata_changes
+
+    @property
+    def toc_added(self):
+        """
+        The TOC entries in the new Publication only
+        (see :func:`yael.tocindex.TOCIndex.entry`).
+
+        :rtype: list of dict
+        """
+        return self.__toc_added
+
+    @toc_added.setter
+    def toc_added(self, toc_added):
+        self.__toc_added = toc_added
+
+    @property
+    def toc_removed(self):
+        """
+        The TOC entries in the old Publication only
+        (see :func:`yael.tocindex.TOCIndex.entry`).
+
+        :rtype: list of dict
+        """
+        return self.__toc_removed
+
+    @toc_removed.setter
+    def toc_removed(self, toc_removed):
+        self.__toc_removed = toc_removed
+
+
@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+A snapshot of the files in the directory
+of an uncompressed Publication.
+
+The directory tree is scanned once (with `os.scandir`),
+recording the size and the modification time of each file,
+so that the assets can be read, and the size of the Publication
+computed, without calling `stat` on every access
+(which is expensive on network file systems).
+
+The snapshot is not updated automatically
+when the directory changes:
+call :func:`yael.directoryindex.DirectoryIndex.refresh`.
+"""
+
+import os
+import posixpath
+
+from yael.jsonable import JSONAble
+import yael.util
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+class DirectoryIndex(JSONAble):
+    """
+    Build a snapshot of the files in the given directory.
+
+    :param path: the path of the directory
+    :type  path: str
+
+    """
+
+    def __init__(self, path=None):
+        self._reset()
+        if path != None:
+            self.build(path)
+
+    def json_object(self, recursive=True):
+        obj = {
+            "path":  self.path,
+            "size":  self.size,
+            "files": len(self.entries),
+        }
+        if recursive:
+            obj["files"] = dict(
+                (k, {"size": v[0], "mtime": v[1]}) for k, v in self.entries.items())
+        return obj
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, relative_path):
+        return DirectoryIndex.normalize(relative_path) in self.entries
+
+    def build(self, path):
+        """
+        Scan the given directory,
+        replacing the current contents of this index.
+
+        :param path: the path of the directory
+        :type  path: str
+        """
+
+        self._reset()
+        self.path = path
+        entries = self.entries
+        if hasattr(os, "scandir"):
+            # each item is (directory path, relative path prefix)
+            stack = [(path, "")]
+            while len(stack) > 0:
+                directory, prefix = stack.pop()
+                for entry in os.scandir(directory):
+                    if entry.is_dir():
+                        # like os.walk, do not follow symbolic links
+                        if not entry.is_symlink():
+                            stack.append((entry.path, prefix + entry.name + "/"))
+                        continue
+                    try:
+                        stat = entry.stat()
+                        entries[prefix + entry.name] = (stat.st_size, stat.st_mtime)
+                    except OSError:
+                        pass
+        else:
+            for file_path in yael.util.list_all_files(path):
+                relative_path = os.path.relpath(file_path, path).replace(os.sep, "/")
+                try:
+                    stat = os.stat(file_path)
+                    entries[relative_path] = (stat.st_size, stat.st_mtime)
+                except OSError:
+                    pass
+        self.size = sum(e[0] for e in entries.values())
+
+    def refresh(self):
+        """
+        Scan the directory again,
+        for example after its files have changed.
+        """
+        self.build(self.path)
+
+    def _reset(self):
+        self.path = None
+        self.entries = {}
+        self.size = 0
+
+    @staticmethod
+    def normalize(relative_path):
+        """
+        Return the key of the given relative path in the index,
+        that is, the normalized path with `/` separators.
+
+        :param relative_path: the relative path
+        :type  relative_path: str
+        :rtype:               str
+        """
+        return posixpath.normpath(relative_path.replace(os.sep, "/"))
+
+    def entry(self, relative_path):
+        """
+        Return the `(size, mtime)` tuple of the file
+        at the given relative path,
+        or None if it is not in the index.
+
+        :param relative_path: the relative path of the file
+        :type  relative_path: str
+        :rtype:               tuple
+        """
+        return self.entries.get(DirectoryIndex.normalize(relative_path))
+
+    def absolute_path(self, relative_path):
+        """
+        Return the path on disk of the file
+        at the given relative path.
+
+        :param relative_path: the relative path of the file
+        :type  relative_path: str
+        :rtype:               str
+        """
+        return yael.util.norm_join(self.path, relative_path)
+
+    def open(self, relative_path):
+        """
+        Open the file at the given relative path,
+        in binary mode, without checking its existence first.
+
+        Return None if the file is not in the index,
+        or if it cannot be opened.
+
+        :param relative_path: the relative path of the file
+        :type  relative_path: str
+        :rtype:               file-like object
+        """
+        if self.entry(relative_path) == None:
+            return None
+        try:
+            return open(self.absolute_path(relative_path), mode="rb")
+        except:
+            pass
+        return None
+
+    def read(self, relative_path):
+        """
+        Read the contents of the file at the given relative path.
+
+        Return None if the file is not in the index,
+        or if it cannot be read.
+
+        :param relative_path: the relative path of the file
+        :type  relative_path: str
+        :rtype:               bytes
+        """
+        fil = self.open(relative_path)
+        if fil == None:
+            return None
+        try:
+            return fil.read()
+        except:
+            pass
+        finally:
+            fil.close()
+        return None
+
+    def copy(self, relative_path, destination_path):
+        """
+        Copy the file at the given relative path
+        to the given destination path,
+        in kernel space if possible
+        (see :func:`yael.util.copy_file`).
+
+        :param relative_path:    the relative path of the file
+        :type  relative_path:    str
+        :param destination_path: the path of the copy
+        :type  destination_path: str
+        """
+        if self.entry(relative_path) == None:
+            raise IOError("File '%s' is not in the index" % relative_path)
+        yael.util.copy_file(
+            self.absolute_path(relative_path),
+            destination_path)
+
+    def copy_all(self, destination_directory):
+        """
+        Copy all the files in the index
+        to the given destination directory,
+        creating the subdirectories as needed.
+
+        :param destination_directory: the path of the destination directory
+        :type  destination_directory: str
+        """
+        created = set()
+        for relative_path in sorted(self.entries):
+            destination_path = yael.util.norm_join(destination_directory, relative_path)
+            parent = os.path.dirname(destination_path)
+            if parent not in created:
+                if not os.path.isdir(parent):
+                    os.makedirs(parent)
+                created.add(parent)
+            self.copy(relative_path, destination_path)
+
+    @property
+    def path(self):
+        """
+        The path of the directory.
+
+        :rtype: str
+        """
+        return self.__path
+
+    @path.setter
+    def path(self, path):
+        self.__path = path
+
+    @property
+    def entries(self):
+        """
+        The files in the directory,
+        as a dictionary mapping each relative path
+        (with `/` separators) to the `(size, mtime)` tuple of the file.
+
+        :rtype: dict
+        """
+        return self.__entries
+
+    @entries.setter
+    def entries(self, entries):
+        self.__entries = entries
+
+    @property
+    def size(self):
+        """
+        The total size, in bytes, of the files in the directory.
+
+        :rtype: int
+        """
+        return self.__size
+
+    @size.setter
+    def size(self, size):
+        self.__size = size
+
+
@@ -19,6 +19,7 @@ according to the suitable element semantics.
 import lxml.etree
 
 from yael.jsonable import JSONAble
+import yael.profiling
 
 __author__ = "Alberto Pettarin"
 __copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
@@ -43,6 +44,23 @@ class Element(JSONAble):
 
     """
 
+    __slots__ = {
+        "internal_path": (
+            "A string representing the path of the element "
+            "inside the (possibly, virtual) EPUB Container. "
+            "It should be None for elements not representing files "
+            "inside the EPUB Container."),
+        "asset": "The asset associated with this element.",
+    }
+
+    STREAM_RELEASE = None
+    """
+    The (namespace-qualified) tags of the elements
+    released as soon as they have been parsed in streaming mode,
+    or None if this element cannot be parsed in streaming mode
+    (see :func:`yael.element.Element.parse_stream`).
+    """
+
     def __init__(self, internal_path=None, obj=None, string=None):
         self.asset = None
         self.internal_path = internal_path
@@ -61,51 +79,101 @@ class Element(JSONAble):
         """
 
         try:
-            root = lxml.etree.fromstring(string)
-            self.parse_object(root)
+            with yael.profiling.span(
+                    "xml",
+                    yael.profiling.Profiler.CATEGORY_XML,
+                    self.internal_path) as span:
+                root = lxml.etree.fromstring(string)
+                if span.active:
+                    span.add_bytes(len(string))
+                    if span.profiler.elements:
+                        span.add_elements(sum(1 for e in root.iter()))
+            with yael.profiling.span(
+                    "build",
+                    yael.profiling.Profiler.CATEGORY_BUILD,
+                    self.internal_path):
+                self.parse_object(root)
         except:
             raise Exception("Error while parsing the given string")
 
-    def parse_object(self, obj):
+    def parse_stream(self, source):
         """
-        Build element by parsing the given XML node.
+        Build element by parsing the given source incrementally,
+        with `lxml.etree.iterparse`.
 
-        :param obj: the XML (`lxml`) node object to be parsed
-        :type  obj: object
+        Each element whose tag is in
+        :data:`yael.element.Element.STREAM_RELEASE`
+        is cleared (together with its previous siblings)
+        as soon as it has been parsed,
+        so that the memory needed to parse the source
+        depends on the nesting depth of the document,
+        not on its size.
+
+        If this element cannot be parsed in streaming mode,
+        the whole source is read and parsed
+        with :func:`yael.element.Element.parse_string`.
+
+        :param source: the binary file-like object to be parsed
+        :type  source: file-like object
 
         """
 
-        return
+        if self.STREAM_RELEASE == None:
+            self.parse_string(source.read())
+            return
+        try:
+            with yael.profiling.span(
+                    "stream",
+                    yael.profiling.Profiler.CATEGORY_XML,
+                    self.internal_path) as span:
+                self.parse_stream_events(self._released_events(source, span))
+        except:
+            raise Exception("Error while parsing the given stream")
 
-    @property
-    def internal_path(self):
+    def parse_stream_events(self, events):
         """
-        A string representing the path of the element
-        inside the (possibly, virtual) EPUB Container.
-        It should be None for elements not representing files
-        inside the EPUB Container.
+        Build element by consuming the given iterator
+        of `(event, element)` pairs, as produced by
+        `lxml.etree.iterparse` with `events=("start", "end")`.
+
+        To be implemented in the subclasses
+        which can be parsed in streaming mode.
+
+        :param events: the iterator of `(event, element)` pairs
+        :type  events: iterator
 
-        :rtype: str
         """
 
-        return self.__internal_path
+        return
 
-    @internal_path.setter
-    def internal_path(self, internal_path):
-        self.__internal_path = internal_path
+    def _released_events(self, source, span):
+        # yield the iterparse events of source,
+        # clearing each released element (and its previous siblings)
+        # once its `end` event has been consumed
+        release = self.STREAM_RELEASE
+        count = span.active and span.profiler.elements
+        for event, elem in lxml.etree.iterparse(source, events=("start", "end")):
+            yield (event, elem)
+            if event == "end":
+                if count:
+                    span.add_elements(1)
+                if elem.tag in release:
+                    elem.clear()
+                    parent = elem.getparent()
+                    if parent != None:
+                        while elem.getprevious() != None:
+                            del parent[0]
 
-    @property
-    def asset(self):
+    def parse_object(self, obj):
         """
-        The asset associated with this element.
+        Build element by parsing the given XML node.
+
+        :param obj: the XML (`lxml`) node object to be parsed
+        :type  obj: object
 
-        :rtype: :class:`yael.asset.Asset`
         """
-        return self.__asset
 
-    @asset.setter
-    def asset(self, asset):
-        self.__asset = asset
+        return
 
     @property
     def contents(self):
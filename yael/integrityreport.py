@@ -0,0 +1,410 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+A report of the integrity of the container of a Publication.
+
+For a compressed Publication, every ZIP entry
+is decompressed and checked against the CRC-32
+stored in the ZIP central directory,
+in parallel threads (`zlib` releases the GIL),
+and the `mimetype` entry is checked to be
+the first entry, stored (not compressed), without extra field,
+and containing `application/epub+zip`.
+For an uncompressed Publication, every file is read
+and the `mimetype` file is checked.
+
+The manifest of each parsed Rendition
+is cross-checked against the list of files in the container.
+
+Unlike reading the assets (see :func:`yael.asset.Asset.contents`),
+which returns None on error,
+the report lists the errors.
+"""
+
+import os
+import struct
+import zipfile
+import zlib
+
+from yael.epub import EPUB
+from yael.jsonable import JSONAble
+from yael.manifestation import Manifestation
+from yael.mediatype import MediaType
+import yael.util
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+class IntegrityReport(JSONAble):
+    """
+    Build the integrity report of the given `publication`.
+
+    The files are checked in parallel threads,
+    unless `max_workers` is 1 or `concurrent.futures`
+    is not available.
+    The ZIP entries of a compressed Publication
+    are split among at most `max_workers` threads
+    (by default, one per CPU).
+
+    :param publication: the Publication
+    :type  publication: :class:`yael.publication.Publication`
+    :param max_workers: the maximum number of checking threads
+                        (None for the `concurrent.futures` default)
+    :type  max_workers: int
+
+    """
+
+    BLOCK_SIZE = 1048576
+    """ The size, in bytes, of the blocks decompressed or read. """
+
+    MIMETYPE_CONTENTS = MediaType.EPUB.encode("ascii")
+    """ The required contents of the `mimetype` file. """
+
+    def __init__(self, publication=None, max_workers=None):
+        self._reset()
+        if publication != None:
+            self.build(publication, max_workers)
+
+    def json_object(self, recursive=True):
+        obj = {
+            "valid":             self.valid,
+            "files":             self.files,
+            "bytes":             self.bytes,
+            "errors":            len(self.errors),
+            "mimetype_errors":   len(self.mimetype_errors),
+            "duplicate_entries": len(self.duplicate_entries),
+            "missing_items":     len(self.missing_items),
+            "unlisted_files":    len(self.unlisted_files),
+        }
+        if recursive:
+            obj["errors"] = self.errors
+            obj["mimetype_errors"] = self.mimetype_errors
+            obj["duplicate_entries"] = self.duplicate_entries
+            obj["missing_items"] = self.missing_items
+            obj["unlisted_files"] = self.unlisted_files
+        return obj
+
+    def build(self, publication, max_workers=None):
+        """
+        Check the given Publication,
+        replacing the current contents of this report.
+
+        :param publication: the Publication
+        :type  publication: :class:`yael.publication.Publication`
+        :param max_workers: the maximum number of checking threads
+                            (None for the `concurrent.futures` default)
+        :type  max_workers: int
+        """
+
+        self._reset()
+        names = []
+        if publication.manifestation == Manifestation.COMPRESSED:
+            try:
+                zip_file = zipfile.ZipFile(publication.path, mode="r")
+            except Exception as exc:
+                self.errors[publication.path] = str(exc)
+                return
+            try:
+                infos = list(i for i in zip_file.infolist() if not i.filename.endswith("/"))
+                names = list(i.filename for i in infos)
+                self._check_mimetype_entry(zip_file, infos)
+            finally:
+                zip_file.close()
+            # each job checks a contiguous slice of the entries
+            # with its own ZIP file object,
+            # as the file of a ZIP file object is shared under a lock;
+            # decompressing is CPU-bound, hence by default
+            # there is one job per CPU
+            workers = 1
+            if ThreadPoolExecutor != None:
+                workers = max_workers or os.cpu_count() or 1
+            size = max(1, (len(infos) + workers - 1) // workers)
+            jobs = list(
+                (publication.path, infos[i:(i + size)])
+                for i in range(0, len(infos), size))
+            results = []
+            for chunk in self._map(IntegrityReport._check_entries, jobs, workers):
+                results.extend(chunk)
+        elif publication.manifestation == Manifestation.UNCOMPRESSED:
+            if publication.directory_index != None:
+                names = sorted(publication.directory_index.entries.keys())
+            else:
+                names = sorted(
+                    os.path.relpath(p, publication.path).replace(os.sep, "/")
+                    for p in yael.util.list_all_files(publication.path))
+            self._check_mimetype_file(publication)
+            jobs = list((publication, name) for name in names)
+            results = self._map(IntegrityReport._check_file, jobs, max_workers)
+        else:
+            names = sorted(publication.assets.keys())
+            results = list((len(publication.assets[n].data or b""), None) for n in names)
+
+        seen = set()
+        for name, (size, error) in zip(names, results):
+            if name in seen:
+                if name not in self.duplicate_entries:
+                    self.duplicate_entries.append(name)
+            seen.add(name)
+            self.files += 1
+            self.bytes += size
+            if error != None:
+                self.errors[name] = error
+        self._check_manifests(publication, seen)
+
+    def _reset(self):
+        self.files = 0
+        self.bytes = 0
+        self.errors = {}
+        self.mimetype_errors = []
+        self.duplicate_entries = []
+        self.missing_items = []
+        self.unlisted_files = []
+
+    @staticmethod
+    def _map(function, jobs, max_workers):
+        # run the given function on each job, in parallel if possible
+        if (
+                (ThreadPoolExecutor != None) and
+                (max_workers != 1) and
+                (len(jobs) > 1)):
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(function, jobs))
+        return list(function(job) for job in jobs)
+
+    @staticmethod
+    def _check_entries(job):
+        # check the given ZIP entries of the given ZIP file,
+        # returning the list of (size, error message or None)
+        path, infos = job
+        try:
+            zip_file = zipfile.ZipFile(path, mode="r")
+        except Exception as exc:
+            return list((0, "%s: %s" % (type(exc).__name__, exc)) for info in infos)
+        try:
+            return list(IntegrityReport._check_entry(zip_file, info) for info in infos)
+        finally:
+            zip_file.close()
+
+    @staticmethod
+    def _check_entry(zip_file, info):
+        # decompress the given ZIP entry, and check its CRC-32,
+        # returning (size, error message or None)
+        size = 0
+        crc = 0
+        try:
+            # the CRC-32 is also checked by the ZIP file object,
+            # but only when the end of the entry is read
+            with zip_file.open(info) as entry:
+                block = entry.read(IntegrityReport.BLOCK_SIZE)
+                while len(block) > 0:
+                    size += len(block)
+                    crc = zlib.crc32(block, crc)
+                    block = entry.read(IntegrityReport.BLOCK_SIZE)
+        except Exception as exc:
+            return (size, "%s: %s" % (type(exc).__name__, exc))
+        if size != info.file_size:
+            return (size, "Bad size: %d instead of %d" % (size, info.file_size))
+        if (crc & 0xffffffff) != info.CRC:
+            return (size, "Bad CRC-32: %08x instead of %08x" % (crc & 0xffffffff, info.CRC))
+        return (size, None)
+
+    @staticmethod
+    def _check_file(job):
+        # read the given file of an uncompressed Publication,
+        # returning (size, error message or None)
+        publication, name = job
+        size = 0
+        try:
+            with open(yael.util.norm_join(publication.path, name), mode="rb") as fil:
+                block = fil.read(IntegrityReport.BLOCK_SIZE)
+                while len(block) > 0:
+                    size += len(block)
+                    block = fil.read(IntegrityReport.BLOCK_SIZE)
+        except Exception as exc:
+            return (size, "%s: %s" % (type(exc).__name__, exc))
+        return (size, None)
+
+    def _check_mimetype_entry(self, zip_file, infos):
+        # check the `mimetype` entry of the given ZIP file
+        i_p_mimetype = EPUB.INTERNAL_PATH_MIMETYPE
+        info = None
+        for candidate in infos:
+            if candidate.filename == i_p_mimetype:
+                info = candidate
+                break
+        if info == None:
+            self.mimetype_errors.append("The mimetype entry is missing")
+            return
+        if infos[0] is not info:
+            self.mimetype_errors.append("The mimetype entry is not the first entry")
+        if info.compress_type != zipfile.ZIP_STORED:
+            self.mimetype_errors.append("The mimetype entry is compressed")
+        try:
+            # the extra field length is at offset 28 of the local file header
+            zip_file.fp.seek(info.header_offset + 28)
+            extra_length = struct.unpack("<H", zip_file.fp.read(2))[0]
+            if (extra_length > 0) or (len(info.extra) > 0):
+                self.mimetype_errors.append("The mimetype entry has an extra field")
+        except:
+            pass
+        try:
+            if zip_file.read(info) != IntegrityReport.MIMETYPE_CONTENTS:
+                self.mimetype_errors.append("The mimetype entry has wrong contents")
+        except Exception as exc:
+            self.mimetype_errors.append("The mimetype entry cannot be read: %s" % exc)
+
+    def _check_mimetype_file(self, publication):
+        # check the `mimetype` file of the given uncompressed Publication
+        try:
+            path = yael.util.norm_join(publication.path, EPUB.INTERNAL_PATH_MIMETYPE)
+            with open(path, mode="rb") as fil:
+                if fil.read() != IntegrityReport.MIMETYPE_CONTENTS:
+                    self.mimetype_errors.append("The mimetype file has wrong contents")
+        except:
+            self.mimetype_errors.append("The mimetype file is missing")
+
+    def _check_manifests(self, publication, files):
+        # cross-check the manifests of the parsed Renditions
+        # against the given set of files in the container
+        items = set()
+        excluded = set([EPUB.INTERNAL_PATH_MIMETYPE])
+        if publication.container != None:
+            if publication.container.rm_document != None:
+                excluded.add(publication.container.rm_document.internal_path)
+            for rendition in publication.container.renditions:
+                excluded.add(rendition.v_full_path)
+                if rendition.pac_document == None:
+                    continue
+                for item in rendition.pac_document.manifest.items:
+                    if item.internal_path != None:
+                        items.add(item.internal_path)
+        self.missing_items = sorted(p for p in items if p not in files)
+        self.unlisted_files = sorted(
+            f for f in files if (
+                (f not in items) and
+                (f not in excluded) and
+                (not f.startswith(EPUB.INTERNAL_PATH_META_INF + "/"))))
+
+    @property
+    def valid(self):
+        """
+        True if no error was found.
+
+        :rtype: bool
+        """
+        return (
+            (len(self.errors) == 0) and
+            (len(self.mimetype_errors) == 0) and
+            (len(self.duplicate_entries) == 0) and
+            (len(self.missing_items) == 0))
+
+    @property
+    def files(self):
+        """
+        The number of files checked.
+
+        :rtype: int
+        """
+        return self.__files
+
+    @files.setter
+    def files(self, files):
+        self.__files = files
+
+    @property
+    def bytes(self):
+        """
+        The total number of (uncompressed) bytes checked.
+
+        :rtype: int
+        """
+        return self.__bytes
+
+    @bytes.setter
+    def bytes(self, value):
+        self.__bytes = value
+
+    @property
+    def errors(self):
+        """
+        The files which cannot be read,
+        or whose contents do not match
+        their CRC-32 or size in the ZIP central directory,
+        as a dictionary mapping each internal path
+        to the error message.
+
+        :rtype: dict
+        """
+        return self.__errors
+
+    @errors.setter
+    def errors(self, errors):
+        self.__errors = errors
+
+    @property
+    def mimetype_errors(self):
+        """
+        The violations of the rules for the `mimetype` file,
+        as a list of messages.
+
+        :rtype: list of str
+        """
+        return self.__mimetype_errors
+
+    @mimetype_errors.setter
+    def mimetype_errors(self, mimetype_errors):
+        self.__mimetype_errors = mimetype_errors
+
+    @property
+    def duplicate_entries(self):
+        """
+        The names of the ZIP entries appearing more than once.
+
+        :rtype: list of str
+        """
+        return self.__duplicate_entries
+
+    @duplicate_entries.setter
+    def duplicate_entries(self, duplicate_entries):
+        self.__duplicate_entries = duplicate_entries
+
+    @property
+    def missing_items(self):
+        """
+        The internal paths of the manifest items
+        not in the container.
+
+        :rtype: list of str
+        """
+        return self.__missing_items
+
+    @missing_items.setter
+    def missing_items(self, missing_items):
+        self.__missing_items = missing_items
+
+    @property
+    def unlisted_files(self):
+        """
+        The internal paths of the files in the container,
+        outside `META-INF`, not listed in any manifest
+        (a warning, they do not make the report invalid).
+
+        :rtype: list of str
+        """
+        return self.__unlisted_files
+
+    @unlisted_files.setter
+    def unlisted_files(self, unlisted_files):
+        self.__unlisted_files = unlisted_files
+
+
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+Interning of the attribute values repeated across a Publication
+(e.g., media types, `properties` tokens, `epub:type` values,
+audio file paths), so that equal values share one object.
+
+An :class:`yael.interning.InternTable`, used as a context manager,
+becomes the active intern table of the current context
+(see the `contextvars` module),
+and the element parsers intern their repeated values
+through :func:`yael.interning.intern`:
+
+    table = InternTable()
+    with table:
+        item = OPFItem(string=item_string)
+
+Each :class:`yael.publication.Publication` owns an intern table,
+active while it is parsed.
+Unlike the built-in `sys.intern`,
+the table is released together with its Publication.
+"""
+
+import threading
+
+try:
+    from contextvars import ContextVar
+except ImportError:
+    ContextVar = None
+
+from yael.profiling import _ThreadLocalVar
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+if ContextVar != None:
+    _ACTIVE = ContextVar("yael_intern_table", default=None)
+else:
+    _ACTIVE = _ThreadLocalVar()
+
+#: the tokens of an absent `properties` attribute
+EMPTY_PROPERTIES = frozenset()
+
+class InternTable(object):
+    """
+    Build an intern table, mapping each value to its canonical object.
+
+    The values must be hashable (e.g., `str` or `frozenset`).
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.__local = threading.local()
+
+    def __enter__(self):
+        # the table might be entered by several threads, and re-entered
+        tokens = getattr(self.__local, "tokens", None)
+        if tokens == None:
+            tokens = self.__local.tokens = []
+        tokens.append(_ACTIVE.set(self))
+        return self
+
+    def __exit__(self, *args):
+        _ACTIVE.reset(self.__local.tokens.pop())
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getstate__(self):
+        # the thread-local tokens cannot be pickled
+        return self.values
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.values = state
+
+    def intern(self, value):
+        """
+        Return the canonical object equal to the given value,
+        storing the value if it is new.
+
+        :param value: the value (None is returned unchanged)
+        :type  value: str or frozenset
+        :rtype:       str or frozenset
+        """
+        if value == None:
+            return None
+        return self.values.setdefault(value, value)
+
+    def clear(self):
+        """
+        Remove all the values from this table.
+        """
+        self.values.clear()
+
+    @property
+    def values(self):
+        """
+        The values, as a dictionary mapping each value to itself.
+
+        :rtype: dict
+        """
+        return self.__values
+
+    @values.setter
+    def values(self, values):
+        self.__values = values
+
+
+def active_table():
+    """
+    Return the active intern table of the current context,
+    or None if no intern table is active.
+
+    :rtype: :class:`yael.interning.InternTable`
+    """
+    return _ACTIVE.get()
+
+def intern(value):
+    """
+    Return the canonical object equal to the given value
+    from the active intern table,
+    or the value itself if no intern table is active.
+
+    :param value: the value
+    :type  value: str or frozenset
+    :rtype:       str or frozenset
+    """
+    table = _ACTIVE.get()
+    if (table == None) or (value == None):
+        return value
+    return table.values.setdefault(value, value)
+
+def properties(value):
+    """
+    Split the given space-separated `properties` value
+    into a (possibly interned) frozenset of tokens.
+
+    :param value: the value of a `properties` attribute
+    :type  value: str
+    :rtype:       frozenset of str
+    """
+    if value == None:
+        return EMPTY_PROPERTIES
+    return intern(frozenset(value.split()))
+
+
@@ -27,6 +27,8 @@ class JSONAble(object):
     A generic object which has a JSON object/string representation.
     """
 
+    __slots__ = ()
+
     def json_object(self, recursive=True):
         """
         To be implemented in concrete subclasses.
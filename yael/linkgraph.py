@@ -0,0 +1,454 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+The link graph of a Rendition.
+
+The nodes are the internal paths of the assets,
+and each (weighted) arc represents the references
+of a given kind from a source asset to a target asset,
+for example hyperlinks between Content Documents,
+or images, audio, video, stylesheets, and scripts
+referenced by a Content Document.
+
+The references are extracted from
+the Content Documents (XHTML and SVG)
+and from the CSS stylesheets listed in the manifest,
+and their targets are resolved through the manifest.
+References to targets not listed in the manifest
+are collected separately (see `missing`).
+
+References consisting of a fragment only (`#id`)
+and references to external resources (with a URL scheme)
+are ignored.
+"""
+
+import re
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+try:
+    from urllib.parse import unquote
+except ImportError:
+    from urllib import unquote
+
+import lxml.etree
+import lxml.html
+
+from yael.asset import Asset
+from yael.jsonable import JSONAble
+from yael.mediatype import MediaType
+from yael.namespace import Namespace
+import yael.util
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+class LinkGraph(JSONAble):
+    """
+    Build the link graph of the given `rendition`.
+
+    The assets are parsed in parallel (using threads),
+    unless `max_workers` is 1 or `concurrent.futures`
+    is not available.
+
+    :param rendition:   the Rendition
+    :type  rendition:   :class:`yael.rendition.Rendition`
+    :param max_workers: the maximum number of parsing threads
+                        (None for the `concurrent.futures` default)
+    :type  max_workers: int
+
+    """
+
+    KIND_AUDIO = "audio"
+    """ Audio (`<audio>` or its `<source>`). """
+
+    KIND_HYPERLINK = "hyperlink"
+    """ Hyperlink (`<a>` or `<area>`). """
+
+    KIND_IMAGE = "image"
+    """ Image (`<img>`, SVG `<image>`, `poster`, ...). """
+
+    KIND_LINK = "link"
+    """ Linked resource (`<link>`, e.g. a stylesheet). """
+
+    KIND_OTHER = "other"
+    """ Other reference (`<object>`, `<iframe>`, SVG `<use>`, ...). """
+
+    KIND_SCRIPT = "script"
+    """ Script (`<script>`). """
+
+    KIND_STYLE = "style"
+    """ CSS reference (`url(...)` or `@import`). """
+
+    KIND_VIDEO = "video"
+    """ Video (`<video>` or its `<source>`). """
+
+    A_NS_XLINK_HREF = "{{{0}}}{1}".format(Namespace.XLINK, "href")
+
+    TAG_KINDS = {
+        "a":      KIND_HYPERLINK,
+        "area":   KIND_HYPERLINK,
+        "audio":  KIND_AUDIO,
+        "image":  KIND_IMAGE,
+        "img":    KIND_IMAGE,
+        "link":   KIND_LINK,
+        "script": KIND_SCRIPT,
+        "video":  KIND_VIDEO,
+    }
+
+    CSS_URL_RE = re.compile(r"url\(\s*(\"[^\"]*\"|'[^']*'|[^\"'\)]*)\s*\)", re.I)
+    CSS_IMPORT_RE = re.compile(r"@import\s+(\"[^\"]*\"|'[^']*')", re.I)
+    SCHEME_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.\-]*:")
+
+    def __init__(self, rendition=None, max_workers=None):
+        self._reset()
+        if rendition != None:
+            self.build(rendition, max_workers)
+
+    def json_object(self, recursive=True):
+        obj = {
+            "nodes":   len(self.nodes),
+            "arcs":    len(self.arcs),
+            "missing": len(self.missing),
+        }
+        if recursive:
+            obj["nodes"] = sorted(self.nodes)
+            obj["arcs"] = LinkGraph._arc_list(self.arcs)
+            obj["missing"] = LinkGraph._arc_list(self.missing)
+        return obj
+
+    def build(self, rendition, max_workers=None):
+        """
+        Build the link graph of the given `rendition`,
+        replacing the current contents of this graph.
+
+        :param rendition:   the Rendition
+        :type  rendition:   :class:`yael.rendition.Rendition`
+        :param max_workers: the maximum number of parsing threads
+                            (None for the `concurrent.futures` default)
+        :type  max_workers: int
+        """
+
+        self._reset()
+        pac_document = rendition.pac_document
+        manifest = pac_document.manifest
+        self.spine = pac_document.files_referenced_spine
+        sources = []
+        for item in manifest.items:
+            if item.internal_path != None:
+                self.ids[item.internal_path] = item.v_id
+                self.nodes.add(item.internal_path)
+                if (item.asset != None) and (
+                        (item.v_media_type == MediaType.CSS) or
+                        (MediaType.is_content_document(item.v_media_type))):
+                    sources.append(item)
+
+        # read all the sources first, opening the container only once
+        contents = Asset.batch_contents(list(i.asset for i in sources))
+        jobs = list(
+            (i.internal_path, c, i.v_media_type) for i, c in zip(sources, contents))
+        if (
+                (ThreadPoolExecutor != None) and
+                (max_workers != 1) and
+                (len(jobs) > 1)):
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(LinkGraph._extract, jobs))
+        else:
+            results = list(LinkGraph._extract(job) for job in jobs)
+
+        for (source, contents, media_type), references in zip(jobs, results):
+            for link, kind in references:
+                target = LinkGraph.resolve(source, link)
+                if target == None:
+                    continue
+                if manifest.item_by_internal_path(target) != None:
+                    arcs = self.arcs
+                else:
+                    arcs = self.missing
+                key = (source, target, kind)
+                arcs[key] = arcs.get(key, 0) + 1
+
+        # adjacency, summing the weights of the arcs of different kinds
+        for (source, target, kind), weight in self.arcs.items():
+            successors = self.__successors.setdefault(source, {})
+            successors[target] = successors.get(target, 0) + weight
+            predecessors = self.__predecessors.setdefault(target, {})
+            predecessors[source] = predecessors.get(source, 0) + weight
+
+    def _reset(self):
+        self.nodes = set()
+        self.arcs = {}
+        self.missing = {}
+        self.ids = {}
+        self.spine = []
+        self.__successors = {}
+        self.__predecessors = {}
+
+    @staticmethod
+    def _extract(job):
+        # return the list of (link, kind) references in the given asset
+        internal_path, contents, media_type = job
+        references = []
+        try:
+            if media_type == MediaType.CSS:
+                LinkGraph._extract_css(contents.decode("utf-8", "replace"), references)
+                return references
+            # one parser per document, as parsers cannot be shared by threads
+            parser = lxml.html.XHTMLParser(recover=True, remove_comments=True)
+            root = lxml.etree.fromstring(contents, parser=parser)
+            for elem, attribute, link, pos in root.iterlinks():
+                if attribute in [None, "style"]:
+                    kind = LinkGraph.KIND_STYLE
+                else:
+                    kind = LinkGraph._kind(elem)
+                references.append((link, kind))
+            for elem in root.xpath(
+                    "//*[@xl:href or @poster]",
+                    namespaces={"xl": Namespace.XLINK}):
+                link = elem.get(LinkGraph.A_NS_XLINK_HREF)
+                if link != None:
+                    references.append((link, LinkGraph._kind(elem)))
+                link = elem.get("poster")
+                if link != None:
+                    references.append((link, LinkGraph.KIND_IMAGE))
+        except:
+            pass
+        return references
+
+    @staticmethod
+    def _extract_css(string, references):
+        for match in LinkGraph.CSS_URL_RE.finditer(string):
+            references.append((match.group(1).strip("\"'"), LinkGraph.KIND_STYLE))
+        for match in LinkGraph.CSS_IMPORT_RE.finditer(string):
+            references.append((match.group(1).strip("\"'"), LinkGraph.KIND_STYLE))
+
+    @staticmethod
+    def _kind(elem):
+        tag = LinkGraph._local_name(elem)
+        if tag in ["source", "track"]:
+            tag = LinkGraph._local_name(elem.getparent())
+            if tag == "picture":
+                return LinkGraph.KIND_IMAGE
+        return LinkGraph.TAG_KINDS.get(tag, LinkGraph.KIND_OTHER)
+
+    @staticmethod
+    def _local_name(elem):
+        if (elem == None) or (not isinstance(elem.tag, str)):
+            return None
+        return lxml.etree.QName(elem).localname
+
+    @staticmethod
+    def resolve(source, link):
+        """
+        Return the internal path of the target
+        of the given link, found in the given source asset,
+        removing the fragment and the query (if any),
+        or None if the link is an external or a fragment-only reference.
+
+        :param source: the internal path of the source asset
+        :type  source: str
+        :param link:   the link (e.g., the value of a `href` attribute)
+        :type  link:   str
+        :rtype:        str
+        """
+        if link == None:
+            return None
+        link = link.strip()
+        if (
+                (len(link) == 0) or
+                (link.startswith("#")) or
+                (link.startswith("//")) or
+                (LinkGraph.SCHEME_RE.match(link) != None)):
+            return None
+        base = link.split("#")[0].split("?")[0]
+        return yael.util.norm_join_parent(source, unquote(base))
+
+    @staticmethod
+    def _arc_list(arcs):
+        return list(
+            {"source": s, "target": t, "kind": k, "weight": arcs[(s, t, k)]}
+            for s, t, k in sorted(arcs))
+
+    def successors(self, internal_path):
+        """
+        Return the targets referenced by the given asset,
+        with the total weight of the corresponding arcs.
+
+        :param internal_path: the internal path of the source asset
+        :type  internal_path: str
+        :returns:             the dictionary (possibly empty)
+                              mapping each target to the weight
+        :rtype:               dict
+        """
+        return self.__successors.get(internal_path, {})
+
+    def predecessors(self, internal_path):
+        """
+        Return the sources referencing the given asset,
+        with the total weight of the corresponding arcs.
+
+        :param internal_path: the internal path of the target asset
+        :type  internal_path: str
+        :returns:             the dictionary (possibly empty)
+                              mapping each source to the weight
+        :rtype:               dict
+        """
+        return self.__predecessors.get(internal_path, {})
+
+    @property
+    def targets_referenced(self):
+        """
+        The set of (existing) assets referenced by at least one asset,
+        excluding references from an asset to itself.
+
+        :rtype: set of str
+        """
+        return set(t for s, t, k in self.arcs if s != t)
+
+    def to_dot(self, name="book", kinds=None, use_ids=False, spine=False):
+        """
+        Return the graph in Graphviz (dot) format.
+
+        :param name:    the name of the digraph
+        :type  name:    str
+        :param kinds:   output only arcs of these kinds (None for all)
+        :type  kinds:   list of str
+        :param use_ids: if True, identify the nodes by their manifest id,
+                        otherwise by their internal path
+        :type  use_ids: bool
+        :param spine:   if True, add (red) arcs
+                        showing the spine progression
+        :type  spine:   bool
+        :rtype:         str
+        """
+        def node(internal_path):
+            if use_ids:
+                return self.ids.get(internal_path, internal_path)
+            return internal_path
+        lines = ["digraph %s {" % name]
+        for source, target, kind in sorted(self.arcs):
+            if (kinds == None) or (kind in kinds):
+                lines.append('"%s" -> "%s" [label="%s", weight=%d];' % (
+                    node(source),
+                    node(target),
+                    kind,
+                    self.arcs[(source, target, kind)]))
+        if spine:
+            for i in range(len(self.spine) - 1):
+                lines.append('"%s" -> "%s" [color=red];' % (
+                    node(self.spine[i]),
+                    node(self.spine[i + 1])))
+        lines.append("}")
+        return "\n".join(lines)
+
+    def to_edge_list(self, separator="\t", kinds=None):
+        """
+        Return the graph as an edge list,
+        with one `source target kind weight` line per arc.
+
+        :param separator: the field separator
+        :type  separator: str
+        :param kinds:     output only arcs of these kinds (None for all)
+        :type  kinds:     list of str
+        :rtype:           str
+        """
+        lines = []
+        for source, target, kind in sorted(self.arcs):
+            if (kinds == None) or (kind in kinds):
+                lines.append(separator.join([
+                    source,
+                    target,
+                    kind,
+                    str(self.arcs[(source, target, kind)])]))
+        return "\n".join(lines)
+
+    def to_json(self, pretty=False):
+        """
+        Return the graph as a JSON string,
+        with the list of nodes, the list of arcs,
+        and the list of arcs to missing targets.
+
+        :param pretty: if True, pretty print the string
+        :type  pretty: bool
+        :rtype:        str
+        """
+        return self.json_string(recursive=True, pretty=pretty)
+
+    @property
+    def nodes(self):
+        """
+        The internal paths of the assets listed in the manifest.
+
+        :rtype: set of str
+        """
+        return self.__nodes
+
+    @nodes.setter
+    def nodes(self, nodes):
+        self.__nodes = nodes
+
+    @property
+    def arcs(self):
+        """
+        The arcs between assets listed in the manifest,
+        as a dictionary mapping `(source, target, kind)`
+        to the number of references (weight).
+
+        :rtype: dict
+        """
+        return self.__arcs
+
+    @arcs.setter
+    def arcs(self, arcs):
+        self.__arcs = arcs
+
+    @property
+    def missing(self):
+        """
+        The arcs to targets not listed in the manifest,
+        as a dictionary mapping `(source, target, kind)`
+        to the number of references (weight).
+
+        :rtype: dict
+        """
+        return self.__missing
+
+    @missing.setter
+    def missing(self, missing):
+        self.__missing = missing
+
+    @property
+    def ids(self):
+        """
+        The manifest id of each node.
+
+        :rtype: dict
+        """
+        return self.__ids
+
+    @ids.setter
+    def ids(self, ids):
+        self.__ids = ids
+
+    @property
+    def spine(self):
+        """
+        The internal paths of the spine items, in spine order.
+
+        :rtype: list of str
+        """
+        return self.__spine
+
+    @spine.setter
+    def spine(self, spine):
+        self.__spine = spine
+
+
@@ -6,6 +6,7 @@ A Media Overlay `<audio>` element.
 """
 
 from yael.element import Element
+import yael.interning
 import yael.util
 
 __author__ = "Alberto Pettarin"
@@ -26,6 +27,13 @@ class MOAudio(Element):
     A_ID = "id"
     A_SRC = "src"
 
+    __slots__ = {
+        "v_clip_begin": "The value of the `clipBegin` attribute.",
+        "v_clip_end": "The value of the `clipEnd` attribute.",
+        "v_id": "The value of the `id` attribute.",
+        "v_src": "The value of the `src` attribute.",
+    }
+
     def __init__(self, internal_path=None, obj=None, string=None):
         self.v_clip_begin = None
         self.v_clip_end = None
@@ -52,7 +60,7 @@ class MOAudio(Element):
         self.v_clip_begin = obj.get(MOAudio.A_CLIPBEGIN)
         self.v_clip_end = obj.get(MOAudio.A_CLIPEND)
         self.v_id = obj.get(MOAudio.A_ID)
-        self.v_src = obj.get(MOAudio.A_SRC)
+        self.v_src = yael.interning.intern(obj.get(MOAudio.A_SRC))
 
     @property
     def clip_begin_seconds(self):
@@ -78,56 +86,4 @@ class MOAudio(Element):
             return -1
         return yael.util.clip_time_seconds(self.v_clip_end)
 
-    @property
-    def v_clip_begin(self):
-        """
-        The value of the `clipBegin` attribute.
-
-        :rtype: str
-        """
-        return self.__v_clip_begin
-
-    @v_clip_begin.setter
-    def v_clip_begin(self, v_clip_begin):
-        self.__v_clip_begin = v_clip_begin
-
-    @property
-    def v_clip_end(self):
-        """
-        The value of the `clipEnd` attribute.
-
-        :rtype: str
-        """
-        return self.__v_clip_end
-
-    @v_clip_end.setter
-    def v_clip_end(self, v_clip_end):
-        self.__v_clip_end = v_clip_end
-
-    @property
-    def v_id(self):
-        """
-        The value of the `id` attribute.
-
-        :rtype: str
-        """
-        return self.__v_id
-
-    @v_id.setter
-    def v_id(self, v_id):
-        self.__v_id = v_id
-
-    @property
-    def v_src(self):
-        """
-        The value of the `src` attribute.
-
-        :rtype: str
-        """
-        return self.__v_src
-
-    @v_src.setter
-    def v_src(self, v_src):
-        self.__v_src = v_src
-
 
@@ -34,6 +34,9 @@ class MODocument(Element):
     E_BODY = "body"
     E_HEAD = "head"
     E_SMIL = "smil"
+    E_NS_BODY = "{{{0}}}{1}".format(Namespace.SMIL, E_BODY)
+    E_NS_SMIL = "{{{0}}}{1}".format(Namespace.SMIL, E_SMIL)
+    STREAM_RELEASE = frozenset([MOSeq.E_NS_PAR, MOSeq.E_NS_SEQ])
 
     def __init__(self, internal_path=None, obj=None, string=None):
         self.v_epub_prefix = None
@@ -66,10 +69,7 @@ class MODocument(Element):
             nsp={"s": Namespace.SMIL, "e": Namespace.EPUB},
             required=MODocument.E_SMIL)
         smil = smil_arr[0]
-
-        self.v_id = smil.get(MODocument.A_ID)
-        self.v_epub_prefix = smil.get(MODocument.A_NS_PREFIX)
-        self.v_version = smil.get(MODocument.A_VERSION)
+        self._parse_attributes(smil)
 
         # locate `<head>` element
         #head_arr = yael.util.query_xpath(
@@ -90,6 +90,32 @@ class MODocument(Element):
             required=MODocument.E_BODY)
         self.body = MOSeq(obj=body_arr[0])
 
+    def parse_stream_events(self, events):
+        smil = None
+        for event, elem in events:
+            if event != "start":
+                continue
+            if smil == None:
+                # the root element
+                if elem.tag != MODocument.E_NS_SMIL:
+                    raise Exception("Missing required element '%s'" % MODocument.E_SMIL)
+                smil = elem
+                self._parse_attributes(smil)
+            elif (
+                    (elem.tag == MODocument.E_NS_BODY) and
+                    (self.body == None) and
+                    (elem.getparent() is smil)):
+                self.body = MOSeq()
+                self.body.parse_events(elem, events)
+        if self.body == None:
+            raise Exception("Missing required element '%s'" % MODocument.E_BODY)
+
+    def _parse_attributes(self, smil):
+        # set the attributes of the `<smil>` element
+        self.v_id = smil.get(MODocument.A_ID)
+        self.v_epub_prefix = smil.get(MODocument.A_NS_PREFIX)
+        self.v_version = smil.get(MODocument.A_VERSION)
+
     @property
     def v_epub_prefix(self):
         """
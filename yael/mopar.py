@@ -16,6 +16,7 @@ from yael.jsonable import JSONAble
 from yael.moaudio import MOAudio
 from yael.motext import MOText
 from yael.namespace import Namespace
+import yael.interning
 
 __author__ = "Alberto Pettarin"
 __copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
@@ -38,6 +39,17 @@ class MOPar(Element):
     E_NS_AUDIO = "{{{0}}}{1}".format(Namespace.SMIL, E_AUDIO)
     E_NS_TEXT = "{{{0}}}{1}".format(Namespace.SMIL, E_TEXT)
 
+    __slots__ = {
+        "v_epub_type": "The value of the `epub:type` attribute.",
+        "v_id": "The value of the `id` attribute.",
+        "children": (
+            "The children elements of this `<par>`. Note: this is implemented "
+            "as a list (instead of two instance variables, one for `<audio>` "
+            "and one for `<text>`) to accommodate a bright future when the "
+            "spec will allow multiple children elements, e.g. several "
+            "`<text>` for each `<audio>`."),
+    }
+
     def __init__(self, internal_path=None, obj=None, string=None):
         self.v_epub_type = None
         self.v_id = None
@@ -59,7 +71,7 @@ class MOPar(Element):
         return obj
 
     def parse_object(self, obj):
-        self.v_epub_type = obj.get(MOPar.A_NS_TYPE)
+        self.v_epub_type = yael.interning.intern(obj.get(MOPar.A_NS_TYPE))
         self.v_id = obj.get(MOPar.A_ID)
 
         # process children
@@ -80,53 +92,6 @@ class MOPar(Element):
         """
         self.children.append(child)
 
-    @property
-    def v_epub_type(self):
-        """
-        The value of the `epub:type` attribute.
-
-        :rtype: str
-        """
-        return self.__v_epub_type
-
-    @v_epub_type.setter
-    def v_epub_type(self, v_epub_type):
-        self.__v_epub_type = v_epub_type
-
-    @property
-    def v_id(self):
-        """
-        The value of the `id` attribute.
-
-        :rtype: str
-        """
-        return self.__v_id
-
-    @v_id.setter
-    def v_id(self, v_id):
-        self.__v_id = v_id
-
-    @property
-    def children(self):
-        """
-        The children elements of this `<par>`.
-
-        Note: this is implemented as a list
-        (instead of two instance variables,
-        one for `<audio>` and one for `<text>`)
-        to accommodate a bright future when the spec will allow
-        multiple children elements,
-        e.g. several `<text>` for each `<audio>`.
-
-        :rtype: list of :class:`yael.moaudio.MOAudio` and
-                :class:`yael.motext.MOText`
-        """
-        return self.__children
-
-    @children.setter
-    def children(self, children):
-        self.__children = children
-
     @property
     def has_audio_child(self):
         """
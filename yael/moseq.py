@@ -61,9 +61,7 @@ class MOSeq(Element):
         return obj
 
     def parse_object(self, obj):
-        self.v_epub_textref = obj.get(MOSeq.A_NS_TEXTREF)
-        self.v_epub_type = obj.get(MOSeq.A_NS_TYPE)
-        self.v_id = obj.get(MOSeq.A_ID)
+        self._parse_attributes(obj)
         # process children
         for child in obj:
             if child.tag == MOSeq.E_NS_SEQ:
@@ -71,6 +69,49 @@ class MOSeq(Element):
             if child.tag == MOSeq.E_NS_PAR:
                 self.add_child(MOPar(obj=child))
 
+    def parse_events(self, obj, events):
+        """
+        Build this `<seq>` (or `<body>`) and its descendants
+        by consuming the given iterator of `(event, element)` pairs,
+        as produced by `lxml.etree.iterparse`
+        with `events=("start", "end")`.
+
+        The iterator must be positioned just after
+        the `start` event of `obj`,
+        and it is consumed up to the `end` event of `obj`.
+        Each `<par>` child is parsed at its `end` event,
+        hence it can be released right after.
+
+        :param obj:    the `<seq>` (`lxml`) node object of this node
+        :type  obj:    object
+        :param events: the iterator of `(event, element)` pairs
+        :type  events: iterator
+
+        """
+        self._parse_attributes(obj)
+        # each frame is [seq, element]
+        stack = [[self, obj]]
+        for event, elem in events:
+            frame = stack[-1]
+            if event == "start":
+                if (elem.tag == MOSeq.E_NS_SEQ) and (elem.getparent() is frame[1]):
+                    child = MOSeq()
+                    child._parse_attributes(elem)
+                    frame[0].add_child(child)
+                    stack.append([child, elem])
+            elif elem is frame[1]:
+                stack.pop()
+                if len(stack) == 0:
+                    return
+            elif (elem.tag == MOSeq.E_NS_PAR) and (elem.getparent() is frame[1]):
+                frame[0].add_child(MOPar(obj=elem))
+
+    def _parse_attributes(self, obj):
+        # set the attributes of the `<seq>` element
+        self.v_epub_textref = obj.get(MOSeq.A_NS_TEXTREF)
+        self.v_epub_type = obj.get(MOSeq.A_NS_TYPE)
+        self.v_id = obj.get(MOSeq.A_ID)
+
     def add_child(self, child):
         """
         Add the given child to this `<seq>`.
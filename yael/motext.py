@@ -23,6 +23,11 @@ class MOText(Element):
     A_ID = "id"
     A_SRC = "src"
 
+    __slots__ = {
+        "v_id": "The value of the `id` attribute.",
+        "v_src": "The value of the `src` attribute.",
+    }
+
     def __init__(self, internal_path=None, obj=None, string=None):
         self.v_id = None
         self.v_src = None
@@ -43,30 +48,4 @@ class MOText(Element):
         self.v_id = obj.get(MOText.A_ID)
         self.v_src = obj.get(MOText.A_SRC)
 
-    @property
-    def v_id(self):
-        """
-        The value of the `id` attribute.
-
-        :rtype: str
-        """
-        return self.__v_id
-
-    @v_id.setter
-    def v_id(self, v_id):
-        self.__v_id = v_id
-
-    @property
-    def v_src(self):
-        """
-        The value of the `src` attribute.
-
-        :rtype: str
-        """
-        return self.__v_src
-
-    @v_src.setter
-    def v_src(self, v_src):
-        self.__v_src = v_src
-
 
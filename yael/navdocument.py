@@ -27,6 +27,8 @@ class NavDocument(Element):
     """
 
     E_NAV = "nav"
+    E_NS_NAV = "{{{0}}}{1}".format(Namespace.XHTML, E_NAV)
+    STREAM_RELEASE = frozenset([NavElement.E_NS_LI, E_NS_NAV])
     V_NAV_LANDMARKS = "landmarks"
     V_NAV_LOA = "loa"
     V_NAV_LOI = "loi"
@@ -70,6 +72,13 @@ class NavDocument(Element):
             if nav_parsed != None:
                 self.add_nav(nav_parsed)
 
+    def parse_stream_events(self, events):
+        for event, elem in events:
+            if (event == "start") and (elem.tag == NavDocument.E_NS_NAV):
+                nav = NavElement(internal_path=self.internal_path)
+                nav.parse_events(elem, events)
+                self.add_nav(nav)
+
     def add_nav(self, nav):
         """
         Add the given `<nav>` to this Navigation Document.
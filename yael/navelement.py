@@ -30,6 +30,9 @@ class NavElement(Element):
     E_HX = ["h1", "h2", "h3", "h4", "h5", "h6"]
     E_LI = "li"
     E_OL = "ol"
+    E_NS_HX = ["{{{0}}}{1}".format(Namespace.XHTML, e) for e in E_HX]
+    E_NS_LI = "{{{0}}}{1}".format(Namespace.XHTML, E_LI)
+    E_NS_OL = "{{{0}}}{1}".format(Namespace.XHTML, E_OL)
 
     def __init__(self, internal_path=None, obj=None, string=None):
         self.v_epub_type = None
@@ -87,6 +90,46 @@ class NavElement(Element):
             if li_parsed != None:
                 self.add_child(li_parsed)
 
+    def parse_events(self, obj, events):
+        """
+        Build this `<nav>` element by consuming
+        the given iterator of `(event, element)` pairs,
+        as produced by `lxml.etree.iterparse`
+        with `events=("start", "end")`.
+
+        The iterator must be positioned just after
+        the `start` event of `obj`,
+        and it is consumed up to the `end` event of `obj`.
+
+        :param obj:    the `<nav>` (`lxml`) node object
+        :type  obj:    object
+        :param events: the iterator of `(event, element)` pairs
+        :type  events: iterator
+
+        """
+        self.v_epub_type = obj.get(NavElement.A_NS_EPUB_TYPE)
+        self.v_id = obj.get(NavElement.A_ID)
+        # the level of the current title, as in parse_object
+        # (a `<h1>` takes precedence over a `<h2>`, and so on)
+        title_level = len(NavElement.E_NS_HX)
+        for event, elem in events:
+            if event == "start":
+                if elem.tag == NavElement.E_NS_LI:
+                    parent = elem.getparent()
+                    if (
+                            (parent.tag == NavElement.E_NS_OL) and
+                            (parent.getparent() is obj)):
+                        child = NavNode()
+                        child.parse_events(elem, events)
+                        self.add_child(child)
+            elif elem is obj:
+                return
+            elif (elem.tag in NavElement.E_NS_HX) and (elem.getparent() is obj):
+                level = NavElement.E_NS_HX.index(elem.tag)
+                if level < title_level:
+                    self.title = elem.xpath("string()")
+                    title_level = level
+
     def add_child(self, child):
         """
         Add the given child to this `<nav>`.
@@ -5,10 +5,12 @@
 A `<li>` node inside a `<nav>` tree.
 """
 
+import lxml.etree
+
 from yael.element import Element
 from yael.jsonable import JSONAble
 from yael.namespace import Namespace
-import yael.util
+import yael.interning
 
 __author__ = "Alberto Pettarin"
 __copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
@@ -31,6 +33,18 @@ class NavNode(Element):
     E_LI = "li"
     E_OL = "ol"
     E_SPAN = "span"
+    E_NS_A = "{{{0}}}{1}".format(Namespace.XHTML, E_A)
+    E_NS_LI = "{{{0}}}{1}".format(Namespace.XHTML, E_LI)
+    E_NS_OL = "{{{0}}}{1}".format(Namespace.XHTML, E_OL)
+    E_NS_SPAN = "{{{0}}}{1}".format(Namespace.XHTML, E_SPAN)
+
+    __slots__ = {
+        "v_epub_type": "The value of the `epub:type` attribute.",
+        "v_href": "The value of the `href` attribute.",
+        "v_id": "The value of the `id` attribute.",
+        "v_label": "The label of this node.",
+        "children": "The children elements.",
+    }
 
     def __init__(self, internal_path=None, obj=None, string=None):
         self.v_epub_type = None
@@ -57,121 +71,82 @@ class NavNode(Element):
         return obj
 
     def parse_object(self, obj):
-        # locate `<span>` element (if any)
-        span_arr = yael.util.query_xpath(
-            obj=obj,
-            query="{0}:{1}",
-            args=["x", NavNode.E_SPAN],
-            nsp={"x": Namespace.XHTML},
-            required=None)
-        if len(span_arr) > 0:
-            span_elem = span_arr[0]
-            self.v_label = span_elem.xpath("string()")
-            self.v_id = span_elem.get(NavNode.A_ID)
-
-        # locate `<a>` element (if any)
-        a_arr = yael.util.query_xpath(
-            obj=obj,
-            query="{0}:{1}",
-            args=["x", NavNode.E_A],
-            nsp={"x": Namespace.XHTML},
-            required=None)
-        if len(a_arr) > 0:
-            a_elem = a_arr[0]
-            self.v_label = a_elem.xpath("string()")
-            self.v_id = a_elem.get(NavNode.A_ID)
-            self.v_href = a_elem.get(NavNode.A_HREF)
-            self.v_epub_type = a_elem.get(NavNode.A_NS_EPUB_TYPE)
-
-        # locate children `<ol><li>` elements (if any)
-        li_arr = yael.util.query_xpath(
-            obj=obj,
-            query="{0}:{1}/{0}:{2}",
-            args=["x", NavNode.E_OL, NavNode.E_LI],
-            nsp={"x": Namespace.XHTML},
-            required=None)
-        for li_elem in li_arr:
-            li_parsed = None
-            try:
-                li_parsed = NavNode(obj=li_elem)
-            except:
-                pass
-            if li_parsed != None:
-                self.add_child(li_parsed)
-
-    def add_child(self, child):
-        """
-        Add the given child to this node.
-
-        :param child: the node child to be added
-        :type  child: :class:`yael.navnode.NavNode`
+        events = lxml.etree.iterwalk(obj, events=("start", "end"))
+        # skip the `start` event of obj itself
+        next(events)
+        self.parse_events(obj, events)
 
+    def parse_events(self, obj, events):
         """
-        self.children.append(child)
+        Build this node and its descendants by consuming
+        the given iterator of `(event, element)` pairs,
+        as produced by `lxml.etree.iterwalk` or `lxml.etree.iterparse`
+        with `events=("start", "end")`.
 
-    @property
-    def v_epub_type(self):
-        """
-        The value of the `epub:type` attribute.
+        The iterator must be positioned just after
+        the `start` event of `obj`,
+        and it is consumed up to the `end` event of `obj`.
 
-        :rtype: str
-        """
-        return self.__v_epub_type
+        The subtree is parsed in a single pass,
+        using an explicit stack instead of recursion,
+        hence arbitrarily deep TOCs can be parsed.
 
-    @v_epub_type.setter
-    def v_epub_type(self, v_epub_type):
-        self.__v_epub_type = v_epub_type
+        If the `<li>` element has both
+        an `<a>` and a `<span>` child,
+        the former takes precedence.
 
-    @property
-    def v_href(self):
-        """
-        The value of the `href` attribute.
+        :param obj:    the `<li>` (`lxml`) node object of this node
+        :type  obj:    object
+        :param events: the iterator of `(event, element)` pairs
+        :type  events: iterator
 
-        :rtype: str
         """
-        return self.__v_href
-
-    @v_href.setter
-    def v_href(self, v_href):
-        self.__v_href = v_href
+        # each frame is [node, element, span found, a found]
+        stack = [[self, obj, False, False]]
+        for event, elem in events:
+            frame = stack[-1]
+            if event == "start":
+                if elem.tag == NavNode.E_NS_LI:
+                    # locate children `<ol><li>` elements (if any)
+                    parent = elem.getparent()
+                    if (
+                            (parent.tag == NavNode.E_NS_OL) and
+                            (parent.getparent() is frame[1])):
+                        child = NavNode()
+                        frame[0].add_child(child)
+                        stack.append([child, elem, False, False])
+            elif elem is frame[1]:
+                stack.pop()
+                if len(stack) == 0:
+                    return
+            elif elem.tag == NavNode.E_NS_A:
+                # locate `<a>` element (if any)
+                if (not frame[3]) and (elem.getparent() is frame[1]):
+                    node = frame[0]
+                    node.v_label = "".join(elem.itertext())
+                    node.v_id = elem.get(NavNode.A_ID)
+                    node.v_href = elem.get(NavNode.A_HREF)
+                    node.v_epub_type = yael.interning.intern(elem.get(NavNode.A_NS_EPUB_TYPE))
+                    frame[3] = True
+            elif elem.tag == NavNode.E_NS_SPAN:
+                # locate `<span>` element (if any)
+                if (
+                        (not frame[2]) and
+                        (not frame[3]) and
+                        (elem.getparent() is frame[1])):
+                    node = frame[0]
+                    node.v_label = "".join(elem.itertext())
+                    node.v_id = elem.get(NavNode.A_ID)
+                    frame[2] = True
 
-    @property
-    def v_id(self):
-        """
-        The value of the `id` attribute.
-
-        :rtype: str
-        """
-        return self.__v_id
-
-    @v_id.setter
-    def v_id(self, v_id):
-        self.__v_id = v_id
-
-    @property
-    def v_label(self):
-        """
-        The label of this node.
-
-        :rtype: str
+    def add_child(self, child):
         """
-        return self.__v_label
-
-    @v_label.setter
-    def v_label(self, v_label):
-        self.__v_label = v_label
+        Add the given child to this node.
 
-    @property
-    def children(self):
-        """
-        The children elements.
+        :param child: the node child to be added
+        :type  child: :class:`yael.navnode.NavNode`
 
-        :rtype: list of :class:`yael.navnode.NavNode`
         """
-        return self.__children
-
-    @children.setter
-    def children(self, children):
-        self.__children = children
+        self.children.append(child)
 
 
@@ -41,6 +41,15 @@ class NCXToc(Element):
     E_NAVPOINT = "navPoint"
     E_NCX = "ncx"
     E_TEXT = "text"
+    E_NS_DOCAUTHOR = "{{{0}}}{1}".format(Namespace.NCX, E_DOCAUTHOR)
+    E_NS_DOCTITLE = "{{{0}}}{1}".format(Namespace.NCX, E_DOCTITLE)
+    E_NS_HEAD = "{{{0}}}{1}".format(Namespace.NCX, E_HEAD)
+    E_NS_META = "{{{0}}}{1}".format(Namespace.NCX, E_META)
+    E_NS_NAVMAP = "{{{0}}}{1}".format(Namespace.NCX, E_NAVMAP)
+    E_NS_NAVPOINT = "{{{0}}}{1}".format(Namespace.NCX, E_NAVPOINT)
+    E_NS_NCX = "{{{0}}}{1}".format(Namespace.NCX, E_NCX)
+    E_NS_TEXT = "{{{0}}}{1}".format(Namespace.NCX, E_TEXT)
+    STREAM_RELEASE = frozenset([E_NS_NAVPOINT])
 
     # TODO split `<head>` into a separate class?
 
@@ -90,10 +99,7 @@ class NCXToc(Element):
             nsp={'n': Namespace.NCX, 'x': Namespace.XML},
             required=NCXToc.E_NCX)
         ncx = ncx_arr[0]
-
-        self.v_id = ncx.get(NCXToc.A_ID)
-        self.v_version = ncx.get(NCXToc.A_VERSION)
-        self.v_xml_lang = ncx.get(NCXToc.A_NS_LANG)
+        self._parse_attributes(ncx)
 
         # locate `<meta>` element (if any)
         meta_arr = yael.util.query_xpath(
@@ -103,18 +109,7 @@ class NCXToc(Element):
             nsp={'n': Namespace.NCX},
             required=None)
         for meta in meta_arr:
-            name = meta.get("name")
-            content = meta.get("content")
-            if name == NCXToc.A_DTB_UID:
-                self.v_dtb_uid = content
-            elif name == NCXToc.A_DTB_DEPTH:
-                self.v_dtb_depth = content
-            elif name == NCXToc.A_DTB_TOTALPAGECOUNT:
-                self.v_dtb_totalpagecount = content
-            elif name == NCXToc.A_DTB_MAXPAGENUMBER:
-                self.v_dtb_maxpagenumber = content
-            elif name == NCXToc.A_DTB_GENERATOR:
-                self.v_dtb_generator = content
+            self._parse_meta(meta)
 
         # locate `<docTitle>` element (if any)
         doctitle_arr = yael.util.query_xpath(
@@ -162,6 +157,61 @@ class NCXToc(Element):
                 if navpoint_parsed != None:
                     self.add_child(navpoint_parsed)
 
+    def parse_stream_events(self, events):
+        ncx = None
+        navmap = None
+        # the parents of the `<text>` elements already found
+        found = set()
+        for event, elem in events:
+            if event == "start":
+                if ncx == None:
+                    # the root element
+                    if elem.tag != NCXToc.E_NS_NCX:
+                        raise Exception("Missing required element '%s'" % NCXToc.E_NCX)
+                    ncx = elem
+                    self._parse_attributes(ncx)
+                elif (elem.tag == NCXToc.E_NS_NAVPOINT) and (navmap != None):
+                    if elem.getparent() is navmap:
+                        child = NCXTocNode()
+                        child.parse_events(elem, events)
+                        self.add_child(child)
+                elif (elem.tag == NCXToc.E_NS_NAVMAP) and (navmap == None):
+                    if elem.getparent() is ncx:
+                        navmap = elem
+            elif elem.tag == NCXToc.E_NS_META:
+                parent = elem.getparent()
+                if (parent.tag == NCXToc.E_NS_HEAD) and (parent.getparent() is ncx):
+                    self._parse_meta(elem)
+            elif elem.tag == NCXToc.E_NS_TEXT:
+                parent = elem.getparent()
+                if (parent.tag not in found) and (parent.getparent() is ncx):
+                    if parent.tag == NCXToc.E_NS_DOCTITLE:
+                        self.v_doctitle = elem.text
+                    elif parent.tag == NCXToc.E_NS_DOCAUTHOR:
+                        self.v_docauthor = elem.text
+                    found.add(parent.tag)
+
+    def _parse_attributes(self, ncx):
+        # set the attributes of the `<ncx>` element
+        self.v_id = ncx.get(NCXToc.A_ID)
+        self.v_version = ncx.get(NCXToc.A_VERSION)
+        self.v_xml_lang = ncx.get(NCXToc.A_NS_LANG)
+
+    def _parse_meta(self, meta):
+        # set the value of a `<head><meta>` element
+        name = meta.get("name")
+        content = meta.get("content")
+        if name == NCXToc.A_DTB_UID:
+            self.v_dtb_uid = content
+        elif name == NCXToc.A_DTB_DEPTH:
+            self.v_dtb_depth = content
+        elif name == NCXToc.A_DTB_TOTALPAGECOUNT:
+            self.v_dtb_totalpagecount = content
+        elif name == NCXToc.A_DTB_MAXPAGENUMBER:
+            self.v_dtb_maxpagenumber = content
+        elif name == NCXToc.A_DTB_GENERATOR:
+            self.v_dtb_generator = content
+
     def add_child(self, child):
         """
         Add the given child to this NCX TOC.
@@ -5,6 +5,8 @@
 A node in a NCX TOC tree.
 """
 
+import lxml.etree
+
 from yael.element import Element
 from yael.jsonable import JSONAble
 from yael.namespace import Namespace
@@ -30,6 +32,18 @@ class NCXTocNode(Element):
     E_NAVLABEL = "navLabel"
     E_NAVPOINT = "navPoint"
     E_TEXT = "text"
+    E_NS_CONTENT = "{{{0}}}{1}".format(Namespace.NCX, E_CONTENT)
+    E_NS_NAVLABEL = "{{{0}}}{1}".format(Namespace.NCX, E_NAVLABEL)
+    E_NS_NAVPOINT = "{{{0}}}{1}".format(Namespace.NCX, E_NAVPOINT)
+    E_NS_TEXT = "{{{0}}}{1}".format(Namespace.NCX, E_TEXT)
+
+    __slots__ = {
+        "v_id": "The value of the `id` attribute.",
+        "v_src": "The value of the `src` attribute.",
+        "v_text": "The value of the `text` attribute.",
+        "v_play_order": "The value of the `playOrder` attribute.",
+        "children": "The children elements of this node.",
+    }
 
     def __init__(self, internal_path=None, obj=None, string=None):
         self.v_id = None
@@ -57,46 +71,67 @@ class NCXTocNode(Element):
 
 
     def parse_object(self, obj):
+        events = lxml.etree.iterwalk(obj, events=("start", "end"))
+        # skip the `start` event of obj itself
+        next(events)
+        self.parse_events(obj, events)
+
+    def parse_events(self, obj, events):
+        """
+        Build this node and its descendants by consuming
+        the given iterator of `(event, element)` pairs,
+        as produced by `lxml.etree.iterwalk` or `lxml.etree.iterparse`
+        with `events=("start", "end")`.
+
+        The iterator must be positioned just after
+        the `start` event of `obj`,
+        and it is consumed up to the `end` event of `obj`.
+
+        The subtree is parsed in a single pass,
+        using an explicit stack instead of recursion,
+        hence arbitrarily deep TOCs can be parsed.
+
+        :param obj:    the `<navPoint>` (`lxml`) node object of this node
+        :type  obj:    object
+        :param events: the iterator of `(event, element)` pairs
+        :type  events: iterator
+
+        """
+        self._parse_attributes(obj)
+        # each frame is [node, element, text found, src found]
+        stack = [[self, obj, False, False]]
+        for event, elem in events:
+            frame = stack[-1]
+            if event == "start":
+                if elem.tag == NCXTocNode.E_NS_NAVPOINT:
+                    if elem.getparent() is frame[1]:
+                        child = NCXTocNode()
+                        child._parse_attributes(elem)
+                        frame[0].add_child(child)
+                        stack.append([child, elem, False, False])
+                elif elem.tag == NCXTocNode.E_NS_CONTENT:
+                    if (not frame[3]) and (elem.getparent() is frame[1]):
+                        # set src (if any)
+                        frame[0].v_src = elem.get(NCXTocNode.A_SRC)
+                        frame[3] = True
+            elif elem is frame[1]:
+                stack.pop()
+                if len(stack) == 0:
+                    return
+            elif (elem.tag == NCXTocNode.E_NS_TEXT) and (not frame[2]):
+                # set text (if any)
+                parent = elem.getparent()
+                if (
+                        (parent.tag == NCXTocNode.E_NS_NAVLABEL) and
+                        (parent.getparent() is frame[1])):
+                    frame[0].v_text = yael.util.safe_strip(elem.text)
+                    frame[2] = True
+
+    def _parse_attributes(self, obj):
         # set id and play_order attributes
         self.v_id = obj.get(NCXTocNode.A_ID)
         self.v_play_order = obj.get(NCXTocNode.A_PLAYORDER)
 
-        # set text (if any)
-        text_arr = yael.util.query_xpath(
-            obj=obj,
-            query="{0}:{1}/{0}:{2}",
-            args=['n', NCXTocNode.E_NAVLABEL, NCXTocNode.E_TEXT],
-            nsp={'n': Namespace.NCX},
-            required=None)
-        if len(text_arr) > 0:
-            self.v_text = yael.util.safe_strip(text_arr[0].text)
-
-        # set src (if any)
-        content_arr = yael.util.query_xpath(
-            obj=obj,
-            query="{0}:{1}",
-            args=['n', NCXTocNode.E_CONTENT],
-            nsp={'n': Namespace.NCX},
-            required=None)
-        if len(content_arr) > 0:
-            self.v_src = content_arr[0].get(NCXTocNode.A_SRC)
-
-        # locate children `<navPoint>` elements (if any)
-        nav_points_arr = yael.util.query_xpath(
-            obj=obj,
-            query="{0}:{1}",
-            args=['n', NCXTocNode.E_NAVPOINT],
-            nsp={'n': Namespace.NCX},
-            required=None)
-        for nav_point in nav_points_arr:
-            nav_point_parsed = None
-            try:
-                nav_point_parsed = NCXTocNode(obj=nav_point)
-            except:
-                pass
-            if nav_point_parsed != None:
-                self.children.append(nav_point_parsed)
-
     def add_child(self, child):
         """
         Add the given child to this node.
@@ -107,69 +142,4 @@ class NCXTocNode(Element):
         """
         self.children.append(child)
 
-    @property
-    def v_id(self):
-        """
-        The value of the `id` attribute.
-
-        :rtype: str
-        """
-        return self.__v_id
-
-    @v_id.setter
-    def v_id(self, v_id):
-        self.__v_id = v_id
-
-    @property
-    def v_src(self):
-        """
-        The value of the `src` attribute.
-
-        :rtype: str
-        """
-        return self.__v_src
-
-    @v_src.setter
-    def v_src(self, v_src):
-        self.__v_src = v_src
-
-    @property
-    def v_text(self):
-        """
-        The value of the `text` attribute.
-
-        :rtype: str
-        """
-        return self.__v_text
-
-    @v_text.setter
-    def v_text(self, v_text):
-        self.__v_text = v_text
-
-    @property
-    def v_play_order(self):
-        """
-        The value of the `playOrder` attribute.
-
-        :rtype: str
-        """
-        return self.__v_play_order
-
-    @v_play_order.setter
-    def v_play_order(self, v_play_order):
-        self.__v_play_order = v_play_order
-
-    @property
-    def children(self):
-        """
-        The children elements of this node.
-
-        :rtype: list of :class:`yael.ncxtocnode.NCXTocNode` objects
-        """
-        return self.__children
-
-    @children.setter
-    def children(self, children):
-        self.__children = children
-
 
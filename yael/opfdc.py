@@ -11,6 +11,7 @@ DC metadata.
 from yael.jsonable import JSONAble
 from yael.namespace import Namespace
 from yael.opfmetadatum import OPFMetadatum
+import yael.interning
 import yael.util
 
 __author__ = "Alberto Pettarin"
@@ -39,6 +40,20 @@ class OPFDC(OPFMetadatum):
     A_NS_ROLE = "{{{0}}}{1}".format(Namespace.OPF, A_ROLE)
     A_NS_SCHEME = "{{{0}}}{1}".format(Namespace.OPF, A_SCHEME)
 
+    __slots__ = {
+        "v_dir": "The value of the `dir` attribute. EPUB 3 only.",
+        "v_id": "The value of the `id` attribute.",
+        "v_opf_event": "The value of the `opf:event` attribute. EPUB 2 only.",
+        "v_opf_file_as": (
+            "The value of the `opf:file-as` attribute. EPUB 2 only."),
+        "v_opf_role": "The value of the `opf:role` attribute. EPUB 2 only.",
+        "v_opf_scheme": (
+            "The value of the `opf:scheme` attribute. EPUB 2 only."),
+        "v_tag": "The tag of this metadatum.",
+        "v_text": "The text of this metadatum.",
+        "v_xml_lang": "The value of the `xml:lang` attribute. EPUB 3 only.",
+    }
+
     def __init__(self, internal_path=None, obj=None, string=None):
         self.v_dir = None
         self.v_id = None
@@ -77,133 +92,10 @@ class OPFDC(OPFMetadatum):
         self.v_id = obj.get(OPFDC.A_ID)
         self.v_opf_event = obj.get(OPFDC.A_NS_EVENT)
         self.v_opf_file_as = obj.get(OPFDC.A_NS_FILE_AS)
-        self.v_opf_role = obj.get(OPFDC.A_NS_ROLE)
-        self.v_opf_scheme = obj.get(OPFDC.A_NS_SCHEME)
-        self.v_tag = obj.tag
+        self.v_opf_role = yael.interning.intern(obj.get(OPFDC.A_NS_ROLE))
+        self.v_opf_scheme = yael.interning.intern(obj.get(OPFDC.A_NS_SCHEME))
+        self.v_tag = yael.interning.intern(obj.tag)
         self.v_text = yael.util.safe_strip(obj.text)
-        self.v_xml_lang = obj.get(OPFDC.A_NS_LANG)
-
-    @property
-    def v_dir(self):
-        """
-        The value of the `dir` attribute.
-        EPUB 3 only.
-
-        :rtype: str
-        """
-        return self.__v_dir
-
-    @v_dir.setter
-    def v_dir(self, v_dir):
-        self.__v_dir = v_dir
-
-    @property
-    def v_id(self):
-        """
-        The value of the `id` attribute.
-
-        :rtype: str
-        """
-        return self.__v_id
-
-    @v_id.setter
-    def v_id(self, v_id):
-        self.__v_id = v_id
-
-    @property
-    def v_opf_event(self):
-        """
-        The value of the `opf:event` attribute.
-        EPUB 2 only.
-
-        :rtype: str
-        """
-        return self.__v_opf_event
-
-    @v_opf_event.setter
-    def v_opf_event(self, v_opf_event):
-        self.__v_opf_event = v_opf_event
-
-    @property
-    def v_opf_file_as(self):
-        """
-        The value of the `opf:file-as` attribute.
-        EPUB 2 only.
-
-        :rtype: str
-        """
-        return self.__v_opf_file_as
-
-    @v_opf_file_as.setter
-    def v_opf_file_as(self, v_opf_file_as):
-        self.__v_opf_file_as = v_opf_file_as
-
-    @property
-    def v_opf_role(self):
-        """
-        The value of the `opf:role` attribute.
-        EPUB 2 only.
-
-        :rtype: str
-        """
-        return self.__v_opf_role
-
-    @v_opf_role.setter
-    def v_opf_role(self, v_opf_role):
-        self.__v_opf_role = v_opf_role
-
-    @property
-    def v_opf_scheme(self):
-        """
-        The value of the `opf:scheme` attribute.
-        EPUB 2 only.
-
-        :rtype: str
-        """
-        return self.__v_opf_scheme
-
-    @v_opf_scheme.setter
-    def v_opf_scheme(self, v_opf_scheme):
-        self.__v_opf_scheme = v_opf_scheme
-
-    @property
-    def v_tag(self):
-        """
-        The tag of this metadatum.
-
-        :rtype: str
-        """
-        return self.__v_tag
-
-    @v_tag.setter
-    def v_tag(self, v_tag):
-        self.__v_tag = v_tag
-
-    @property
-    def v_text(self):
-        """
-        The text of this metadatum.
-
-        :rtype: str
-        """
-        return self.__v_text
-
-    @v_text.setter
-    def v_text(self, v_text):
-        self.__v_text = v_text
-
-    @property
-    def v_xml_lang(self):
-        """
-        The value of the `xml:lang` attribute.
-        EPUB 3 only.
-
-        :rtype: str
-        """
-        return self.__v_xml_lang
-
-    @v_xml_lang.setter
-    def v_xml_lang(self, v_xml_lang):
-        self.__v_xml_lang = v_xml_lang
+        self.v_xml_lang = yael.interning.intern(obj.get(OPFDC.A_NS_LANG))
 
 
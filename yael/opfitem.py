@@ -7,6 +7,7 @@ An OPF `<item>` element, that is, a child of the `<manifest>`.
 
 from yael.element import Element
 from yael.jsonable import JSONAble
+import yael.interning
 
 __author__ = "Alberto Pettarin"
 __copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
@@ -35,6 +36,17 @@ class OPFItem(Element):
     V_SVG = "svg"
     V_SWITCH = "switch"
 
+    __slots__ = {
+        "v_fallback": "The value of the `fallback` attribute.",
+        "v_href": "The value of the `href` attribute.",
+        "v_id": "The value of the `id` attribute.",
+        "v_media_overlay": "The value of the `media-overlay` attribute.",
+        "v_media_type": "The value of the `media-type` attribute.",
+        "__v_properties": None,
+        "__properties": None,
+        "refinements": "The refinement metadata of this item.",
+    }
+
     def __init__(self, internal_path=None, obj=None, string=None):
         self.v_fallback = None
         self.v_href = None
@@ -68,8 +80,8 @@ class OPFItem(Element):
         self.v_href = obj.get(OPFItem.A_HREF)
         self.v_id = obj.get(OPFItem.A_ID)
         self.v_media_overlay = obj.get(OPFItem.A_MEDIA_OVERLAY)
-        self.v_media_type = obj.get(OPFItem.A_MEDIA_TYPE)
-        self.v_properties = obj.get(OPFItem.A_PROPERTIES)
+        self.v_media_type = yael.interning.intern(obj.get(OPFItem.A_MEDIA_TYPE))
+        self.v_properties = yael.interning.intern(obj.get(OPFItem.A_PROPERTIES))
 
     def add_refinement(self, refinement):
         """
@@ -93,80 +105,15 @@ class OPFItem(Element):
 
         """
 
-        if self.v_properties != None:
-            return v_property in self.v_properties.split(" ")
-        return False
-
-    @property
-    def v_fallback(self):
-        """
-        The value of the `fallback` attribute.
-
-        :rtype: str
-        """
-        return self.__v_fallback
-
-    @v_fallback.setter
-    def v_fallback(self, v_fallback):
-        self.__v_fallback = v_fallback
-
-    @property
-    def v_href(self):
-        """
-        The value of the `href` attribute.
-
-        :rtype: str
-        """
-        return self.__v_href
-
-    @v_href.setter
-    def v_href(self, v_href):
-        self.__v_href = v_href
-
-    @property
-    def v_id(self):
-        """
-        The value of the `id` attribute.
-
-        :rtype: str
-        """
-        return self.__v_id
-
-    @v_id.setter
-    def v_id(self, v_id):
-        self.__v_id = v_id
-
-    @property
-    def v_media_overlay(self):
-        """
-        The value of the `media-overlay` attribute.
-
-        :rtype: str
-        """
-        return self.__v_media_overlay
-
-    @v_media_overlay.setter
-    def v_media_overlay(self, v_media_overlay):
-        self.__v_media_overlay = v_media_overlay
-
-    @property
-    def v_media_type(self):
-        """
-        The value of the `media-type` attribute.
-
-        :rtype: str
-        """
-        return self.__v_media_type
-
-    @v_media_type.setter
-    def v_media_type(self, v_media_type):
-        self.__v_media_type = v_media_type
+        return v_property in self.properties
 
     @property
     def v_properties(self):
         """
         The value of the `properties` attribute.
 
+        Setting it also updates `properties`.
+
         :rtype: str
         """
         return self.__v_properties
@@ -174,5 +121,15 @@ class OPFItem(Element):
     @v_properties.setter
     def v_properties(self, v_properties):
         self.__v_properties = v_properties
+        self.__properties = yael.interning.properties(v_properties)
+
+    @property
+    def properties(self):
+        """
+        The (space-separated) tokens of the `properties` attribute.
+
+        :rtype: frozenset of str
+        """
+        return self.__properties
 
 
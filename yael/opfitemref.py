@@ -6,6 +6,7 @@ An OPF `<itemref>` element, that is, a child of the `<spine>`.
 """
 
 from yael.element import Element
+import yael.interning
 
 __author__ = "Alberto Pettarin"
 __copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
@@ -43,6 +44,14 @@ class OPFItemref(Element):
     V_RENDITION_SPREAD_NONE = "rendition:spread-none"
     V_RENDITION_SPREAD_PORTRAIT = "rendition:spread-portrait"
 
+    __slots__ = {
+        "v_id": "The value of the `id` attribute.",
+        "v_idref": "The value of the `idref` attribute.",
+        "v_linear": "The value of the `linear` attribute.",
+        "__v_properties": None,
+        "__properties": None,
+    }
+
     def __init__(self, internal_path=None, obj=None, string=None):
         self.v_id = None
         self.v_idref = None
@@ -67,8 +76,8 @@ class OPFItemref(Element):
         # set attributes
         self.v_id = obj.get(OPFItemref.A_ID)
         self.v_idref = obj.get(OPFItemref.A_IDREF)
-        self.v_linear = obj.get(OPFItemref.A_LINEAR)
-        self.v_properties = obj.get(OPFItemref.A_PROPERTIES)
+        self.v_linear = yael.interning.intern(obj.get(OPFItemref.A_LINEAR))
+        self.v_properties = yael.interning.intern(obj.get(OPFItemref.A_PROPERTIES))
 
     def has_property(self, v_property):
         """
@@ -80,54 +89,15 @@ class OPFItemref(Element):
         :rtype:            bool
 
         """
-        if self.v_properties != None:
-            return v_property in self.v_properties.split(" ")
-        return False
-
-    @property
-    def v_id(self):
-        """
-        The value of the `id` attribute.
-
-        :rtype: str
-        """
-        return self.__v_id
-
-    @v_id.setter
-    def v_id(self, v_id):
-        self.__v_id = v_id
-
-    @property
-    def v_idref(self):
-        """
-        The value of the `idref` attribute.
-
-        :rtype: str
-        """
-        return self.__v_idref
-
-    @v_idref.setter
-    def v_idref(self, v_idref):
-        self.__v_idref = v_idref
-
-    @property
-    def v_linear(self):
-        """
-        The value of the `linear` attribute.
-
-        :rtype: str
-        """
-        return self.__v_linear
-
-    @v_linear.setter
-    def v_linear(self, v_linear):
-        self.__v_linear = v_linear
+        return v_property in self.properties
 
     @property
     def v_properties(self):
         """
         The value of the `properties` attribute.
 
+        Setting it also updates `properties`.
+
         :rtype: str
         """
         return self.__v_properties
@@ -135,5 +105,15 @@ class OPFItemref(Element):
     @v_properties.setter
     def v_properties(self, v_properties):
         self.__v_properties = v_properties
+        self.__properties = yael.interning.properties(v_properties)
+
+    @property
+    def properties(self):
+        """
+        The (space-separated) tokens of the `properties` attribute.
+
+        :rtype: frozenset of str
+        """
+        return self.__properties
 
 
@@ -6,6 +6,7 @@ An OPF `<link>` element, that is, a child of the `<metadata>`.
 """
 
 from yael.element import Element
+from yael.jsonable import JSONAble
 
 __author__ = "Alberto Pettarin"
 __copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
@@ -32,6 +33,7 @@ class OPFLink(Element):
         self.v_media_type = None
         self.v_refines = None
         self.v_rel = None
+        self.refinements = []
         Element.__init__(
             self,
             internal_path=internal_path,
@@ -40,12 +42,15 @@ class OPFLink(Element):
 
     def json_object(self, recursive=True):
         obj = {
-            "href":       self.v_href,
-            "id":         self.v_id,
-            "media-type": self.v_media_type,
-            "refines":    self.v_refines,
-            "rel":        self.v_rel,
+            "href":        self.v_href,
+            "id":          self.v_id,
+            "media-type":  self.v_media_type,
+            "refines":     self.v_refines,
+            "rel":         self.v_rel,
+            "refinements": len(self.refinements),
         }
+        if recursive:
+            obj["refinements"] = JSONAble.safe(self.refinements)
         return obj
 
     def parse_object(self, obj):
@@ -55,6 +60,17 @@ class OPFLink(Element):
         self.v_refines = obj.get(OPFLink.A_REFINES)
         self.v_rel = obj.get(OPFLink.A_REL)
 
+    def add_refinement(self, refinement):
+        """
+        Add a refinement, that is,
+        store a reference to the refinement metadatum.
+
+        :param refinement: the refinement metadatum
+        :type  refinement: :class:`yael.opfmetadatum.OPFMetadatum`
+
+        """
+        self.refinements.append(refinement)
+
     @property
     def v_href(self):
         """
@@ -120,4 +136,17 @@ class OPFLink(Element):
     def v_rel(self, v_rel):
         self.__v_rel = v_rel
 
+    @property
+    def refinements(self):
+        """
+        The refinement metadata of this `<link>`.
+
+        :rtype: list of :class:`yael.opfmetadatum.OPFMetadatum`
+        """
+        return self.__refinements
+
+    @refinements.setter
+    def refinements(self, refinements):
+        self.__refinements = refinements
+
 
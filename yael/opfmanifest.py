@@ -23,12 +23,18 @@ class OPFManifest(Element):
     """
     Build the OPF `<manifest>` element or
     parse it from `obj` or `string`.
+
+    The lookups by id and by internal path
+    use an index built on first use,
+    which is discarded when an item is added
+    or the list of items is replaced.
     """
 
     A_ID = "id"
     E_ITEM = "item"
 
     def __init__(self, internal_path=None, obj=None, string=None):
+        self.__index = None
         self.v_id = None
         self.items = []
         Element.__init__(
@@ -80,6 +86,7 @@ class OPFManifest(Element):
         :type  item: :class:`yael.opfitem.OPFItem`
         """
         self.items.append(item)
+        self.__index = None
 
     def item_by_id(self, v_id):
         """
@@ -90,8 +97,7 @@ class OPFManifest(Element):
         :returns:    the child with given id, or None if not found
         :rtype:      :class:`yael.opfitem.OPFItem`
         """
-        lis = list(e for e in self.items if e.v_id == v_id)
-        return yael.util.safe_first(lis)
+        return self._index()["id"].get(v_id)
 
     def items_by_media_type(self, v_media_type):
         """
@@ -105,6 +111,20 @@ class OPFManifest(Element):
         """
         return list(e for e in self.items if e.v_media_type == v_media_type)
 
+    def _index(self):
+        # map id and internal path to the first `<item>` having it,
+        # computed once and then reset when the items change
+        if self.__index == None:
+            by_id = {}
+            by_internal_path = {}
+            for item in self.items:
+                if item.v_id not in by_id:
+                    by_id[item.v_id] = item
+                if item.internal_path not in by_internal_path:
+                    by_internal_path[item.internal_path] = item
+            self.__index = {"id": by_id, "internal_path": by_internal_path}
+        return self.__index
+
     def item_by_internal_path(self, internal_path):
         """
         Return the `<item>` child with href corresponding
@@ -115,8 +135,7 @@ class OPFManifest(Element):
         :returns:             the child with given path, or None if not found
         :rtype:               :class:`yael.opfitem.OPFItem`
         """
-        lis = list(e for e in self.items if e.internal_path == internal_path)
-        return yael.util.safe_first(lis)
+        return self._index()["internal_path"].get(internal_path)
 
     @property
     def v_id(self):
@@ -143,6 +162,7 @@ class OPFManifest(Element):
     @items.setter
     def items(self, items):
         self.__items = items
+        self.__index = None
 
     @property
     def cover_image_item(self):
@@ -153,9 +173,7 @@ class OPFManifest(Element):
         """
 
         for item in self.items:
-            if (
-                    (item.v_properties != None) and
-                    (OPFItem.V_COVER_IMAGE in item.v_properties.split(" "))):
+            if OPFItem.V_COVER_IMAGE in item.properties:
                 return item
         return None
 
@@ -168,9 +186,7 @@ class OPFManifest(Element):
         """
 
         for item in self.items:
-            if (
-                    (item.v_properties != None) and
-                    (OPFItem.V_NAV in item.v_properties.split(" "))):
+            if OPFItem.V_NAV in item.properties:
                 return item
         return None
 
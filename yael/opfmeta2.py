@@ -7,6 +7,7 @@ An OPF `<meta>` EPUB 2 metadatum, child of the `<metadata>`.
 
 from yael.jsonable import JSONAble
 from yael.opfmetadatum import OPFMetadatum
+import yael.interning
 import yael.util
 
 __author__ = "Alberto Pettarin"
@@ -27,6 +28,14 @@ class OPFMeta2(OPFMetadatum):
     A_NAME = "name"
     V_COVER = "cover"
 
+    __slots__ = {
+        "v_content": "The value of the `content` attribute.",
+        "v_id": "The value of the `id` attribute.",
+        "v_name": "The value of the `name` attribute.",
+        "v_tag": "The tag of this metadatum.",
+        "v_text": "The text of this metadatum.",
+    }
+
     def __init__(self, internal_path=None, obj=None, string=None):
         self.v_content = None
         self.v_id = None
@@ -55,73 +64,8 @@ class OPFMeta2(OPFMetadatum):
     def parse_object(self, obj):
         self.v_content = obj.get(OPFMeta2.A_CONTENT)
         self.v_id = obj.get(OPFMeta2.A_ID)
-        self.v_name = obj.get(OPFMeta2.A_NAME)
-        self.v_tag = obj.tag
+        self.v_name = yael.interning.intern(obj.get(OPFMeta2.A_NAME))
+        self.v_tag = yael.interning.intern(obj.tag)
         self.v_text = yael.util.safe_strip(obj.text)
 
-    @property
-    def v_content(self):
-        """
-        The value of the `content` attribute.
-
-        :rtype: str
-        """
-        return self.__v_content
-
-    @v_content.setter
-    def v_content(self, v_content):
-        self.__v_content = v_content
-
-    @property
-    def v_id(self):
-        """
-        The value of the `id` attribute.
-
-        :rtype: str
-        """
-        return self.__v_id
-
-    @v_id.setter
-    def v_id(self, v_id):
-        self.__v_id = v_id
-
-    @property
-    def v_name(self):
-        """
-        The value of the `name` attribute.
-
-        :rtype: str
-        """
-        return self.__v_name
-
-    @v_name.setter
-    def v_name(self, v_name):
-        self.__v_name = v_name
-
-    @property
-    def v_tag(self):
-        """
-        The tag of this metadatum.
-
-        :rtype: str
-        """
-        return self.__v_tag
-
-    @v_tag.setter
-    def v_tag(self, v_tag):
-        self.__v_tag = v_tag
-
-    @property
-    def v_text(self):
-        """
-        The text of this metadatum.
-
-        :rtype: str
-        """
-        return self.__v_text
-
-    @v_text.setter
-    def v_text(self, v_text):
-        self.__v_text = v_text
-
 
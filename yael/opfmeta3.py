@@ -8,6 +8,7 @@ An OPF `<meta>` EPUB 3 metadatum, child of `<metadata>`.
 from yael.jsonable import JSONAble
 from yael.namespace import Namespace
 from yael.opfmetadatum import OPFMetadatum
+import yael.interning
 import yael.util
 
 __author__ = "Alberto Pettarin"
@@ -69,6 +70,17 @@ class OPFMeta3(OPFMetadatum):
     V_SOURCE_OF_PAGINATION = "pagination"
     V_TITLE_TYPE = "title-type"
 
+    __slots__ = {
+        "v_dir": "The value of the `dir` attribute.",
+        "v_id": "The value of the `id` attribute.",
+        "v_property": "The value of the `property` attribute.",
+        "v_refines": "The value of the `refines` attribute.",
+        "v_scheme": "The value of the `scheme` attribute.",
+        "v_tag": "The tag of this metadatum.",
+        "v_text": "The text of this metadatum.",
+        "v_xml_lang": "The value of the `xml:lang` attribute.",
+    }
+
     def __init__(self, internal_path=None, obj=None, string=None):
         self.v_dir = None
         self.v_id = None
@@ -103,115 +115,11 @@ class OPFMeta3(OPFMetadatum):
     def parse_object(self, obj):
         self.v_dir = obj.get(OPFMeta3.A_DIR)
         self.v_id = obj.get(OPFMeta3.A_ID)
-        self.v_property = obj.get(OPFMeta3.A_PROPERTY)
+        self.v_property = yael.interning.intern(obj.get(OPFMeta3.A_PROPERTY))
         self.v_refines = obj.get(OPFMeta3.A_REFINES)
-        self.v_scheme = obj.get(OPFMeta3.A_SCHEME)
-        self.v_tag = obj.tag
+        self.v_scheme = yael.interning.intern(obj.get(OPFMeta3.A_SCHEME))
+        self.v_tag = yael.interning.intern(obj.tag)
         self.v_text = yael.util.safe_strip(obj.text)
-        self.v_xml_lang = obj.get(OPFMeta3.A_NS_LANG)
-
-    @property
-    def v_dir(self):
-        """
-        The value of the `dir` attribute.
-
-        :rtype: str
-        """
-        return self.__v_dir
-
-    @v_dir.setter
-    def v_dir(self, v_dir):
-        self.__v_dir = v_dir
-
-    @property
-    def v_id(self):
-        """
-        The value of the `id` attribute.
-
-        :rtype: str
-        """
-        return self.__v_id
-
-    @v_id.setter
-    def v_id(self, v_id):
-        self.__v_id = v_id
-
-    @property
-    def v_property(self):
-        """
-        The value of the `property` attribute.
-
-        :rtype: str
-        """
-        return self.__v_property
-
-    @v_property.setter
-    def v_property(self, v_property):
-        self.__v_property = v_property
-
-    @property
-    def v_refines(self):
-        """
-        The value of the `refines` attribute.
-
-        :rtype: str
-        """
-        return self.__v_refines
-
-    @v_refines.setter
-    def v_refines(self, v_refines):
-        self.__v_refines = v_refines
-
-    @property
-    def v_scheme(self):
-        """
-        The value of the `scheme` attribute.
-
-        :rtype: str
-        """
-        return self.__v_scheme
-
-    @v_scheme.setter
-    def v_scheme(self, v_scheme):
-        self.__v_scheme = v_scheme
-
-    @property
-    def v_tag(self):
-        """
-        The tag of this metadatum.
-
-        :rtype: str
-        """
-        return self.__v_tag
-
-    @v_tag.setter
-    def v_tag(self, v_tag):
-        self.__v_tag = v_tag
-
-    @property
-    def v_text(self):
-        """
-        The text of this metadatum.
-
-        :rtype: str
-        """
-        return self.__v_text
-
-    @v_text.setter
-    def v_text(self, v_text):
-        self.__v_text = v_text
-
-    @property
-    def v_xml_lang(self):
-        """
-        The value of the `xml:lang` attribute.
-
-        :rtype: str
-        """
-        return self.__v_xml_lang
-
-    @v_xml_lang.setter
-    def v_xml_lang(self, v_xml_lang):
-        self.__v_xml_lang = v_xml_lang
+        self.v_xml_lang = yael.interning.intern(obj.get(OPFMeta3.A_NS_LANG))
 
 
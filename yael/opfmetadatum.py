@@ -34,6 +34,10 @@ class OPFMetadatum(Element):
 
     """
 
+    __slots__ = {
+        "refinements": "The refinement metadata of this metadatum.",
+    }
+
     def __init__(self, internal_path=None, obj=None, string=None):
         self.refinements = []
         Element.__init__(
@@ -50,6 +50,7 @@ class OPFPacDocument(PacDocument):
         self.v_dir = None
         self.v_id = None
         self.v_prefix = None
+        self.v_unique_identifier_id = None
         self.v_version = None
         self.v_xml_lang = None
         self.metadata = None
@@ -150,6 +151,7 @@ class OPFPacDocument(PacDocument):
 
         # set unique identifier
         u_i_id = package.get(OPFPacDocument.A_UNIQUE_IDENTIFIER)
+        self.v_unique_identifier_id = u_i_id
         try:
             self.v_unique_identifier = self.metadata.metadatum_by_id(
                 u_i_id).v_text
@@ -157,27 +159,53 @@ class OPFPacDocument(PacDocument):
             pass
 
         # resolve refinements
-        for metadatum in self.metadata.metadata:
-            if isinstance(metadatum, OPFMeta3):
-                self._resolve_refinement(metadatum)
-        for link in self.metadata.links:
-            self._resolve_refinement(link)
-
-    def _resolve_refinement(self, metadatum):
-        try:
-            if metadatum.v_refines[0] == "#":
-                refines_id = metadatum.v_refines[1:]
-                # refining another metadatum?
-                refined = self.metadata.metadatum_by_id(refines_id)
-                if refined != None:
-                    refined.add_refinement(metadatum)
-                    return
-                # refining a manifest item?
-                refined = self.manifest.item_by_id(refines_id)
-                if refined != None:
-                    refined.add_refinement(metadatum)
-        except:
-            pass
+        self._resolve_refinements()
+
+    def _id_index(self):
+        # map each `id` to the first metadatum, `<link>`, or manifest item
+        # having it, in this order of precedence
+        index = {}
+        for element in self.metadata.metadata:
+            if element.v_id != None:
+                index.setdefault(element.v_id, element)
+        for element in self.metadata.links:
+            if element.v_id != None:
+                index.setdefault(element.v_id, element)
+        for element in self.manifest.items:
+            if element.v_id != None:
+                index.setdefault(element.v_id, element)
+        return index
+
+    def _resolve_refinements(self):
+        # add each `<meta>` and `<link>` with a `refines` attribute
+        # to the refinements of the element it refines,
+        # in one pass, using the `id` index;
+        # a refinement might refine another refinement (chain),
+        # but refinements forming a cycle are ignored
+        index = self._id_index()
+        refining = list(m for m in self.metadata.metadata if isinstance(m, OPFMeta3))
+        refining.extend(self.metadata.links)
+        refined_by = {}
+        for metadatum in refining:
+            try:
+                if metadatum.v_refines[0] == "#":
+                    refined = index.get(metadatum.v_refines[1:])
+                    if refined != None:
+                        refined_by[id(metadatum)] = refined
+            except:
+                pass
+        for metadatum in refining:
+            refined = refined_by.get(id(metadatum))
+            if refined == None:
+                continue
+            # follow the chain up, to detect a cycle
+            ancestor = refined
+            steps = 0
+            while (ancestor != None) and (ancestor is not metadatum) and (steps <= len(refined_by)):
+                ancestor = refined_by.get(id(ancestor))
+                steps += 1
+            if ancestor is not metadatum:
+                refined.add_refinement(metadatum)
 
     @property
     def relative_path_cover_image(self):
@@ -475,6 +503,21 @@ class OPFPacDocument(PacDocument):
     def v_prefix(self, v_prefix):
         self.__v_prefix = v_prefix
 
+    @property
+    def v_unique_identifier_id(self):
+        """
+        The value of the `unique-identifier` attribute,
+        that is, the `id` of the `<dc:identifier>`
+        holding the unique identifier.
+
+        :rtype: str
+        """
+        return self.__v_unique_identifier_id
+
+    @v_unique_identifier_id.setter
+    def v_unique_identifier_id(self, v_unique_identifier_id):
+        self.__v_unique_identifier_id = v_unique_identifier_id
+
     @property
     def v_version(self):
         """
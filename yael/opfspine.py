@@ -22,6 +22,11 @@ class OPFSpine(Element):
     """
     Build the OPF `<spine>` element or
     parse it from `obj` or `string`.
+
+    The lookups of (linear) indices by idref
+    use an index built on first use,
+    which is discarded when an itemref is added
+    or the list of itemrefs is replaced.
     """
 
     A_ID = "id"
@@ -31,6 +36,7 @@ class OPFSpine(Element):
     V_NO = "no"
 
     def __init__(self, internal_path=None, obj=None, string=None):
+        self.__index = None
         self.v_id = None
         self.v_ppd = None
         self.v_toc = None
@@ -85,6 +91,7 @@ class OPFSpine(Element):
         :type  item: :class:`yael.opfitemref.OPFItemref`
         """
         self.itemrefs.append(itemref)
+        self.__index = None
 
     def itemref_by_id(self, v_id):
         """
@@ -120,12 +127,7 @@ class OPFSpine(Element):
         :returns:       the index, or -1 if not found
         :rtype:         int
         """
-        index = 0
-        for itemref in self.itemrefs:
-            if itemref.v_idref == v_idref:
-                return index
-            index += 1
-        return -1
+        return self._index()["idref"].get(v_idref, -1)
 
     def linear_index_by_idref(self, v_idref):
         """
@@ -137,12 +139,22 @@ class OPFSpine(Element):
         :returns:       the index, or -1 if not found
         :rtype:         int
         """
-        index = 0
-        for itemref in self.linear_itemrefs:
-            if itemref.v_idref == v_idref:
-                return index
-            index += 1
-        return -1
+        return self._index()["linear_idref"].get(v_idref, -1)
+
+    def _index(self):
+        # map idref to the (linear) index of the first `<itemref>` having it,
+        # computed once and then reset when the itemrefs change
+        if self.__index == None:
+            by_idref = {}
+            by_linear_idref = {}
+            for index, itemref in enumerate(self.itemrefs):
+                if itemref.v_idref not in by_idref:
+                    by_idref[itemref.v_idref] = index
+            for index, itemref in enumerate(self.linear_itemrefs):
+                if itemref.v_idref not in by_linear_idref:
+                    by_linear_idref[itemref.v_idref] = index
+            self.__index = {"idref": by_idref, "linear_idref": by_linear_idref}
+        return self.__index
 
     @property
     def v_id(self):
@@ -195,6 +207,7 @@ class OPFSpine(Element):
     @itemrefs.setter
     def itemrefs(self, itemrefs):
         self.__itemrefs = itemrefs
+        self.__index = None
 
     @property
     def linear_itemrefs(self):
@@ -0,0 +1,327 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+A report of the unreferenced (orphaned) and missing assets
+of a Rendition of a Publication.
+
+The report is computed from
+the list of files in the container
+(i.e., the ZIP central directory or the directory tree),
+the manifest of the Rendition,
+and its link graph (:class:`yael.linkgraph.LinkGraph`),
+augmented with the references implied by the Package Document
+(spine, Navigation Document, NCX TOC, cover image,
+fallbacks, Media Overlays, guide, metadata links),
+by the NCX TOC, and by the Media Overlay Documents
+(read from the manifest, if they were not parsed
+with the Publication).
+"""
+
+import os
+import zipfile
+
+from yael.epub import EPUB
+from yael.jsonable import JSONAble
+from yael.linkgraph import LinkGraph
+from yael.manifestation import Manifestation
+from yael.modocument import MODocument
+from yael.tocindex import TOCIndex
+import yael.util
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+class OrphanReport(JSONAble):
+    """
+    Build the orphan report of the given `rendition`
+    of the given `publication`.
+
+    :param publication: the Publication
+    :type  publication: :class:`yael.publication.Publication`
+    :param rendition:   the Rendition (if None, the default Rendition)
+    :type  rendition:   :class:`yael.rendition.Rendition`
+    :param link_graph:  the link graph of the Rendition
+                        (if None, it will be built)
+    :type  link_graph:  :class:`yael.linkgraph.LinkGraph`
+    :param max_workers: the maximum number of parsing threads
+                        used to build the link graph
+    :type  max_workers: int
+
+    """
+
+    def __init__(
+            self,
+            publication=None,
+            rendition=None,
+            link_graph=None,
+            max_workers=None):
+        self._reset()
+        if publication != None:
+            self.build(publication, rendition, link_graph, max_workers)
+
+    def json_object(self, recursive=True):
+        obj = {
+            "unreferenced_items":  len(self.unreferenced_items),
+            "missing_items":       len(self.missing_items),
+            "unlisted_references": len(self.unlisted_references),
+            "broken_references":   len(self.broken_references),
+            "unlisted_files":      len(self.unlisted_files),
+        }
+        if recursive:
+            obj["unreferenced_items"] = self.unreferenced_items
+            obj["missing_items"] = self.missing_items
+            obj["unlisted_references"] = self.unlisted_references
+            obj["broken_references"] = self.broken_references
+            obj["unlisted_files"] = self.unlisted_files
+        return obj
+
+    def build(self, publication, rendition=None, link_graph=None, max_workers=None):
+        """
+        Compute the report,
+        replacing the current contents of this report.
+
+        :param publication: the Publication
+        :type  publication: :class:`yael.publication.Publication`
+        :param rendition:   the Rendition (if None, the default Rendition)
+        :type  rendition:   :class:`yael.rendition.Rendition`
+        :param link_graph:  the link graph of the Rendition
+                            (if None, it will be built)
+        :type  link_graph:  :class:`yael.linkgraph.LinkGraph`
+        :param max_workers: the maximum number of parsing threads
+                            used to build the link graph
+        :type  max_workers: int
+        """
+
+        self._reset()
+        if rendition == None:
+            rendition = publication.default_rendition
+        if link_graph == None:
+            link_graph = LinkGraph(rendition=rendition, max_workers=max_workers)
+        pac_document = rendition.pac_document
+        manifest = pac_document.manifest
+        files = OrphanReport.container_files(publication)
+        items = set(i.internal_path for i in manifest.items if i.internal_path != None)
+
+        # map each referenced internal path to the set of referencing paths
+        references = {}
+        def add(source, target):
+            if (target != None) and (target != source):
+                if target not in references:
+                    references[target] = set()
+                references[target].add(source)
+
+        for arcs in [link_graph.arcs, link_graph.missing]:
+            for source, target, kind in arcs:
+                add(source, target)
+
+        # references implied by the Package Document
+        i_p_opf = pac_document.internal_path
+        for target in pac_document.files_referenced_spine:
+            add(i_p_opf, target)
+        add(i_p_opf, pac_document.internal_path_nav_document)
+        add(i_p_opf, pac_document.internal_path_ncx_toc)
+        add(i_p_opf, pac_document.internal_path_cover_image)
+        for item in manifest.items:
+            for v_idref in [item.v_fallback, item.v_media_overlay]:
+                if v_idref != None:
+                    target = manifest.item_by_id(v_idref)
+                    if target != None:
+                        add(item.internal_path, target.internal_path)
+        hrefs = []
+        try:
+            hrefs.extend(r.v_href for r in pac_document.guide.references)
+        except:
+            pass
+        try:
+            hrefs.extend(l.v_href for l in pac_document.metadata.links)
+        except:
+            pass
+        for href in hrefs:
+            add(i_p_opf, LinkGraph.resolve(i_p_opf, href))
+
+        # references in the NCX TOC
+        if rendition.ncx_toc != None:
+            ncx_index = TOCIndex(toc=rendition.ncx_toc)
+            for target in ncx_index.internal_paths_referenced:
+                add(rendition.ncx_toc.internal_path, target)
+
+        # references in the Media Overlay Documents
+        for mo_document in OrphanReport._mo_documents(publication, rendition):
+            for target in mo_document.referenced_audio_files:
+                add(mo_document.internal_path, target)
+            for target in mo_document.referenced_fragment_identifiers:
+                add(
+                    mo_document.internal_path,
+                    yael.util.split_reference(target).get("base"))
+
+        # container files which are not assets of the Publication
+        excluded = set([
+            EPUB.INTERNAL_PATH_MIMETYPE,
+            i_p_opf,
+        ])
+        for other in publication.container.renditions:
+            excluded.add(other.v_full_path)
+
+        self.unreferenced_items = sorted(p for p in items if p not in references)
+        self.missing_items = sorted(p for p in items if p not in files)
+        for target in sorted(references):
+            if target not in items:
+                if target in files:
+                    self.unlisted_references[target] = sorted(references[target])
+                else:
+                    self.broken_references[target] = sorted(references[target])
+        self.unlisted_files = sorted(
+            f for f in files if (
+                (f not in items) and
+                (f not in references) and
+                (f not in excluded) and
+                (not f.startswith(EPUB.INTERNAL_PATH_META_INF + "/"))))
+
+    @staticmethod
+    def _mo_documents(publication, rendition):
+        # the Media Overlay Documents of the given rendition,
+        # parsing (in streaming mode) the ones listed in the manifest
+        # but not parsed (e.g., with Parsing.NO_MEDIA_OVERLAY)
+        mo_documents = list(rendition.mo_documents)
+        parsed = set(m.internal_path for m in mo_documents)
+        for item in rendition.pac_document.manifest.mo_document_items:
+            if item.internal_path in parsed:
+                continue
+            asset = item.asset
+            if asset == None:
+                asset = publication.assets.get(item.internal_path)
+            if asset == None:
+                continue
+            stream = asset.open_stream()
+            if stream == None:
+                continue
+            try:
+                mo_document = MODocument(internal_path=item.internal_path)
+                mo_document.parse_stream(stream)
+                mo_documents.append(mo_document)
+            except:
+                pass
+            finally:
+                stream.close()
+        return mo_documents
+
+    def _reset(self):
+        self.unreferenced_items = []
+        self.missing_items = []
+        self.unlisted_references = {}
+        self.broken_references = {}
+        self.unlisted_files = []
+
+    @staticmethod
+    def container_files(publication):
+        """
+        Return the set of the internal paths of the files
+        in the container of the given Publication,
+        reading only the ZIP central directory
+        (compressed Publication),
+        using its directory index, or walking the directory tree
+        (uncompressed Publication),
+        or listing the assets (in-memory Publication).
+
+        :param publication: the Publication
+        :type  publication: :class:`yael.publication.Publication`
+        :rtype:             set of str
+        """
+        files = set()
+        try:
+            if publication.manifestation == Manifestation.COMPRESSED:
+                zip_file = zipfile.ZipFile(publication.path, mode="r")
+                files = set(n for n in zip_file.namelist() if not n.endswith("/"))
+                zip_file.close()
+            elif publication.manifestation == Manifestation.UNCOMPRESSED:
+                if publication.directory_index != None:
+                    return set(publication.directory_index.entries.keys())
+                for path in yael.util.list_all_files(publication.path):
+                    files.add(os.path.relpath(path, publication.path).replace(
+                        os.sep, "/"))
+            else:
+                files = set(publication.assets.keys())
+        except:
+            pass
+        return files
+
+    @property
+    def unreferenced_items(self):
+        """
+        The internal paths of the manifest items
+        not referenced by any other asset or by the Package Document.
+
+        :rtype: list of str
+        """
+        return self.__unreferenced_items
+
+    @unreferenced_items.setter
+    def unreferenced_items(self, unreferenced_items):
+        self.__unreferenced_items = unreferenced_items
+
+    @property
+    def missing_items(self):
+        """
+        The internal paths of the manifest items
+        whose file is missing from the container.
+
+        :rtype: list of str
+        """
+        return self.__missing_items
+
+    @missing_items.setter
+    def missing_items(self, missing_items):
+        self.__missing_items = missing_items
+
+    @property
+    def unlisted_references(self):
+        """
+        The referenced files which are present in the container
+        but not listed in the manifest,
+        each mapped to the sorted list of the referencing assets.
+
+        :rtype: dict
+        """
+        return self.__unlisted_references
+
+    @unlisted_references.setter
+    def unlisted_references(self, unlisted_references):
+        self.__unlisted_references = unlisted_references
+
+    @property
+    def broken_references(self):
+        """
+        The referenced files which are missing from both
+        the manifest and the container,
+        each mapped to the sorted list of the referencing assets.
+
+        :rtype: dict
+        """
+        return self.__broken_references
+
+    @broken_references.setter
+    def broken_references(self, broken_references):
+        self.__broken_references = broken_references
+
+    @property
+    def unlisted_files(self):
+        """
+        The files in the container which are neither
+        listed in the manifest nor referenced by any asset,
+        excluding `mimetype`, the `META-INF` directory,
+        and the Package Documents.
+
+        :rtype: list of str
+        """
+        return self.__unlisted_files
+
+    @unlisted_files.setter
+    def unlisted_files(self, unlisted_files):
+        self.__unlisted_files = unlisted_files
+
+
@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+An index of a page-list `<nav>`
+(:class:`yael.navelement.NavElement`),
+mapping page labels to locations and back.
+
+Each page is located by its spine index
+and by the document order of its target fragment
+(see :func:`yael.rendition.Rendition.id_order`),
+so that the page containing a given location
+can be found by binary search.
+"""
+
+import array
+import bisect
+
+from yael.jsonable import JSONAble
+import yael.util
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+class PageListIndex(JSONAble):
+    """
+    Build a page-list index from the given `page_list`.
+
+    :param page_list: the page-list `<nav>` to be indexed
+    :type  page_list: :class:`yael.navelement.NavElement`
+    :param rendition: the Rendition providing spine indices
+                      and document order of the targets
+    :type  rendition: :class:`yael.rendition.Rendition`
+
+    """
+
+    ORDER_START = -1
+    """ The document order of the beginning of a content document. """
+
+    def __init__(self, page_list=None, rendition=None):
+        self._reset()
+        if page_list != None:
+            self.build(page_list, rendition)
+
+    def json_object(self, recursive=True):
+        obj = {
+            "entries": len(self),
+        }
+        if recursive:
+            obj["entries"] = self.entries
+        return obj
+
+    def __len__(self):
+        return len(self.labels)
+
+    def build(self, page_list, rendition=None):
+        """
+        Index the given page-list,
+        replacing the current contents of this index.
+
+        The document order of the targets is computed
+        by scanning each referenced content document once.
+
+        :param page_list: the page-list `<nav>` to be indexed
+        :type  page_list: :class:`yael.navelement.NavElement`
+        :param rendition: the Rendition providing spine indices
+                          and document order of the targets
+        :type  rendition: :class:`yael.rendition.Rendition`
+        """
+
+        self._reset()
+        i_p_nav = page_list.internal_path
+        paths = {}
+        stack = list(reversed(page_list.children))
+        while len(stack) > 0:
+            node = stack.pop()
+            stack.extend(reversed(node.children))
+            index = len(self)
+            internal_path = None
+            fragment = None
+            if node.v_href != None:
+                dic = yael.util.split_reference(node.v_href)
+                fragment = dic.get("fragment")
+                base = dic.get("base", "")
+                if base not in paths:
+                    paths[base] = i_p_nav
+                    if len(base) > 0:
+                        paths[base] = yael.util.norm_join_parent(i_p_nav, base)
+                internal_path = paths[base]
+            spine_index = -1
+            order = PageListIndex.ORDER_START
+            if (rendition != None) and (internal_path != None):
+                try:
+                    spine_index = rendition.pac_document.spine_index_by_internal_path(
+                        internal_path)
+                except:
+                    pass
+                if fragment != None:
+                    order = rendition.id_order(internal_path).get(fragment)
+            self.labels.append(node.v_label)
+            self.internal_paths.append(internal_path)
+            self.fragments.append(fragment)
+            self.spine_indices.append(spine_index)
+            if node.v_label not in self.__by_label:
+                self.__by_label[node.v_label] = []
+            self.__by_label[node.v_label].append(index)
+            if (spine_index > -1) and (order != None):
+                self.__positions.append((spine_index, order, index))
+        self.__positions.sort()
+
+    def _reset(self):
+        self.labels = []
+        self.internal_paths = []
+        self.fragments = []
+        self.spine_indices = array.array("i")
+        self.__by_label = {}
+        self.__positions = []
+
+    def entry(self, index):
+        """
+        Return the entry at the given index (in page-list order),
+        as a dictionary with keys
+        `index`, `label`, `internal_path`, `fragment`, and `spine_index`.
+
+        :param index: the index of the entry
+        :type  index: int
+        :rtype:       dict
+        """
+        return {
+            "index":         index,
+            "label":         self.labels[index],
+            "internal_path": self.internal_paths[index],
+            "fragment":      self.fragments[index],
+            "spine_index":   self.spine_indices[index],
+        }
+
+    @property
+    def entries(self):
+        """
+        The list of entries, in page-list order.
+
+        See :func:`yael.pagelistindex.PageListIndex.entry`.
+
+        :rtype: list of dict
+        """
+        return list(self.entry(i) for i in range(len(self)))
+
+    def indices_by_label(self, label):
+        """
+        Return the indices of the entries with the given label.
+
+        :param label: the page label
+        :type  label: str
+        :returns:     the list of indices (possibly empty)
+        :rtype:       list of int
+        """
+        return self.__by_label.get(label, [])
+
+    def entry_by_label(self, label):
+        """
+        Return the (first) entry with the given label.
+
+        :param label: the page label
+        :type  label: str
+        :returns:     the entry, or None if not found
+        :rtype:       dict
+        """
+        indices = self.indices_by_label(label)
+        if len(indices) > 0:
+            return self.entry(indices[0])
+        return None
+
+    def index_at(self, spine_index, order=ORDER_START):
+        """
+        Return the index of the entry of the page
+        containing the given location,
+        that is, the last page starting at or before it.
+
+        :param spine_index: the spine index of the location
+        :type  spine_index: int
+        :param order:       the document order of the location
+                            inside its content document
+        :type  order:       int
+        :returns:           the index, or -1 if the location
+                            precedes all the pages
+        :rtype:             int
+        """
+        # entry indices are never greater than len(self)
+        i = bisect.bisect_right(self.__positions, (spine_index, order, len(self)))
+        if i > 0:
+            return self.__positions[i - 1][2]
+        return -1
+
+    def entry_at(self, spine_index, order=ORDER_START):
+        """
+        Return the entry of the page containing the given location.
+
+        See :func:`yael.pagelistindex.PageListIndex.index_at`.
+
+        :param spine_index: the spine index of the location
+        :type  spine_index: int
+        :param order:       the document order of the location
+                            inside its content document
+        :type  order:       int
+        :returns:           the entry, or None if the location
+                            precedes all the pages
+        :rtype:             dict
+        """
+        index = self.index_at(spine_index, order)
+        if index > -1:
+            return self.entry(index)
+        return None
+
+    @property
+    def labels(self):
+        """
+        The label of each entry.
+
+        :rtype: list of str
+        """
+        return self.__labels
+
+    @labels.setter
+    def labels(self, labels):
+        self.__labels = labels
+
+    @property
+    def internal_paths(self):
+        """
+        The resolved internal path of the target of each entry,
+        or None if the entry has no target.
+
+        :rtype: list of str
+        """
+        return self.__internal_paths
+
+    @internal_paths.setter
+    def internal_paths(self, internal_paths):
+        self.__internal_paths = internal_paths
+
+    @property
+    def fragments(self):
+        """
+        The fragment of the target of each entry,
+        or None if the target has no fragment.
+
+        :rtype: list of str
+        """
+        return self.__fragments
+
+    @fragments.setter
+    def fragments(self, fragments):
+        self.__fragments = fragments
+
+    @property
+    def spine_indices(self):
+        """
+        The spine index of the target of each entry,
+        or -1 if the target is not in the spine.
+
+        :rtype: array of int
+        """
+        return self.__spine_indices
+
+    @spine_indices.setter
+    def spine_indices(self, spine_indices):
+        self.__spine_indices = spine_indices
+
+
@@ -45,6 +45,13 @@ class Parsing:
     NO_MULTIPLE_RENDITIONS = "no_multiple_renditions"
     """ Do not parse META-INF/metadata.xml and Multiple Renditions. """
 
+    LAZY_RENDITIONS = "lazy_renditions"
+    """ Parse only the selected Rendition
+    (see :func:`yael.container.Container.select_rendition`),
+    and the other Renditions on demand
+    (see :func:`yael.publication.Publication.rendition`).
+    Not default. """
+
     NCX = "ncx"
     """ Parse the NCX TOC, if present. Default. """
 
@@ -57,4 +64,10 @@ class Parsing:
     NO_NAV = "no_nav"
     """ Do not parse the Navigation Document. """
 
+    STREAMING = "streaming"
+    """ Parse the Navigation Document, the NCX TOC,
+    and the Media Overlay Documents in streaming mode
+    (see :func:`yael.element.Element.parse_stream`).
+    Not default. """
+
 
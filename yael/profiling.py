@@ -0,0 +1,434 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+Opt-in instrumentation of the parsing phases.
+
+A :class:`yael.profiling.Profiler`, used as a context manager,
+becomes the active profiler of the current context
+(see the `contextvars` module),
+and it records a span for each parsing phase
+and for each asset read or parsed inside the `with` block,
+with its wall and CPU time,
+the number of bytes read and the number of XML elements,
+plus some counters (e.g., the number of XPath queries):
+
+    with Profiler() as profiler:
+        ebook = Publication(path="book.epub")
+    print(profiler.json_string(pretty=True))
+    profiler.save_chrome_trace("book.trace.json")
+
+When no profiler is active, the instrumentation
+costs one context variable lookup per instrumented call.
+"""
+
+import json
+import os
+import threading
+import time
+
+from yael.jsonable import JSONAble
+
+try:
+    from contextvars import ContextVar
+except ImportError:
+    ContextVar = None
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+try:
+    wall_clock = time.perf_counter
+except AttributeError:
+    wall_clock = time.time
+
+try:
+    cpu_clock = time.thread_time
+except AttributeError:
+    cpu_clock = time.process_time if hasattr(time, "process_time") else time.clock
+
+class _ThreadLocalVar(object):
+    # minimal replacement for ContextVar
+    # (the scope is the current thread)
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def get(self):
+        return getattr(self.local, "value", None)
+
+    def set(self, value):
+        token = (threading.current_thread(), self.get())
+        self.local.value = value
+        return token
+
+    def reset(self, token):
+        if token[0] is not threading.current_thread():
+            raise ValueError("The token was created in a different thread")
+        self.local.value = token[1]
+
+if ContextVar != None:
+    _ACTIVE = ContextVar("yael_profiler", default=None)
+else:
+    _ACTIVE = _ThreadLocalVar()
+
+class Profiler(JSONAble):
+    """
+    Build a profiler, which records the spans
+    started inside its `with` block.
+
+    :param callback: a function called with each completed span
+                     (a dictionary, see :func:`yael.profiling.Profiler.spans`)
+    :type  callback: function
+    :param elements: if True, count the elements of each parsed XML document
+    :type  elements: bool
+
+    """
+
+    CATEGORY_PHASE = "phase"
+    """ A parsing phase. """
+
+    CATEGORY_IO = "io"
+    """ Reading an asset (ZIP entry or file). """
+
+    CATEGORY_XML = "xml"
+    """ Parsing an XML document with lxml. """
+
+    CATEGORY_BUILD = "build"
+    """ Building the yael objects from an XML tree (including XPath queries). """
+
+    COUNTER_XPATH_QUERIES = "xpath_queries"
+    """ The number of XPath queries. """
+
+    COUNTER_XPATH_TIME = "xpath_time"
+    """ The wall time spent evaluating XPath queries, in seconds. """
+
+    def __init__(self, callback=None, elements=True):
+        self.callback = callback
+        self.elements = elements
+        self.spans = []
+        self.counters = {}
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        self.__origin = wall_clock()
+        self.__tokens = []
+
+    def __enter__(self):
+        # the same profiler can be entered again,
+        # also from other threads or tasks,
+        # hence one token for each `with` block
+        token = _ACTIVE.set(self)
+        with self.__lock:
+            self.__tokens.append(token)
+        return self
+
+    def __exit__(self, *args):
+        # reset the most recent token created in the current context
+        with self.__lock:
+            for i in range(len(self.__tokens) - 1, -1, -1):
+                try:
+                    _ACTIVE.reset(self.__tokens[i])
+                except ValueError:
+                    # created in another context
+                    continue
+                del self.__tokens[i]
+                return
+        raise RuntimeError("The profiler was not entered in the current context")
+
+    def json_object(self, recursive=True):
+        obj = {
+            "spans":    len(self.spans),
+            "counters": self.counters,
+            "phases":   self.summary(),
+        }
+        if recursive:
+            obj["spans"] = self.spans
+        return obj
+
+    def span(self, name, category=CATEGORY_PHASE, internal_path=None):
+        """
+        Return a new span (a context manager),
+        recorded when its `with` block ends.
+
+        :param name:          the name of the span
+        :type  name:          str
+        :param category:      the category of the span
+        :type  category:      str
+        :param internal_path: the internal path of the asset, if any
+        :type  internal_path: str
+        :rtype:               context manager
+        """
+        return _Span(self, name, category, internal_path)
+
+    def add_counter(self, name, value=1):
+        """
+        Add the given value to the counter with the given name.
+
+        :param name:  the name of the counter
+        :type  name:  str
+        :param value: the value to be added
+        :type  value: int or float
+        """
+        with self.__lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def _push(self):
+        # return the depth of the new span in the current thread
+        depth = getattr(self.__local, "depth", 0)
+        self.__local.depth = depth + 1
+        return depth
+
+    def _pop(self, record):
+        self.__local.depth = record["depth"]
+        record["start"] -= self.__origin
+        with self.__lock:
+            self.spans.append(record)
+        if self.callback != None:
+            self.callback(record)
+
+    def summary(self):
+        """
+        Return the totals of the spans, by name,
+        as a dictionary mapping each name to a dictionary
+        with keys `category`, `calls`, `wall`, `cpu`, `bytes`, and `elements`.
+
+        Nested spans are counted in their parents, too.
+
+        :rtype: dict
+        """
+        totals = {}
+        for record in self.spans:
+            name = record["name"]
+            if name not in totals:
+                totals[name] = {
+                    "category": record["category"],
+                    "calls":    0,
+                    "wall":     0.0,
+                    "cpu":      0.0,
+                    "bytes":    0,
+                    "elements": 0,
+                }
+            total = totals[name]
+            total["calls"] += 1
+            for key in ["wall", "cpu", "bytes", "elements"]:
+                total[key] += record[key]
+        return totals
+
+    def chrome_trace(self):
+        """
+        Return the spans and counters
+        in the Chrome trace-event format
+        (viewable in `chrome://tracing` or Perfetto),
+        as a dictionary.
+
+        :rtype: dict
+        """
+        pid = os.getpid()
+        events = []
+        end = 0
+        for record in sorted(self.spans, key=lambda r: (r["start"], -r["wall"])):
+            events.append({
+                "name": record["name"],
+                "cat":  record["category"],
+                "ph":   "X",
+                "ts":   record["start"] * 1000000.0,
+                "dur":  record["wall"] * 1000000.0,
+                "pid":  pid,
+                "tid":  record["thread"],
+                "args": {
+                    "internal_path": record["internal_path"],
+                    "cpu_us":        record["cpu"] * 1000000.0,
+                    "bytes":         record["bytes"],
+                    "elements":      record["elements"],
+                },
+            })
+            end = max(end, record["start"] + record["wall"])
+        if len(self.counters) > 0:
+            events.append({
+                "name": "counters",
+                "ph":   "C",
+                "ts":   end * 1000000.0,
+                "pid":  pid,
+                "tid":  0,
+                "args": dict(self.counters),
+            })
+        return {
+            "traceEvents":     events,
+            "displayTimeUnit": "ms",
+        }
+
+    def save_chrome_trace(self, path):
+        """
+        Save the Chrome trace-event JSON to the given path.
+
+        :param path: the path of the output file
+        :type  path: str
+        """
+        with open(path, "w") as output_file:
+            json.dump(self.chrome_trace(), output_file)
+
+    @property
+    def callback(self):
+        """
+        The function called with each completed span.
+
+        :rtype: function
+        """
+        return self.__callback
+
+    @callback.setter
+    def callback(self, callback):
+        self.__callback = callback
+
+    @property
+    def elements(self):
+        """
+        If True, count the elements of each parsed XML document.
+
+        :rtype: bool
+        """
+        return self.__elements
+
+    @elements.setter
+    def elements(self, elements):
+        self.__elements = elements
+
+    @property
+    def spans(self):
+        """
+        The completed spans, in completion order,
+        as dictionaries with keys
+        `name`, `category`, `internal_path`, `thread`, `depth`,
+        `start` (seconds since the creation of the profiler),
+        `wall` and `cpu` (seconds), `bytes`, and `elements`.
+
+        :rtype: list of dict
+        """
+        return self.__spans
+
+    @spans.setter
+    def spans(self, spans):
+        self.__spans = spans
+
+    @property
+    def counters(self):
+        """
+        The counters, as a dictionary mapping names to values.
+
+        :rtype: dict
+        """
+        return self.__counters
+
+    @counters.setter
+    def counters(self, counters):
+        self.__counters = counters
+
+
+class _Span(object):
+    """
+    A span of a profiler, recording the wall and CPU time
+    of its `with` block, and the bytes and elements
+    added to it.
+    """
+
+    active = True
+    """ True if this span is recorded. """
+
+    def __init__(self, profiler, name, category, internal_path):
+        self.profiler = profiler
+        self.record = {
+            "name":          name,
+            "category":      category,
+            "internal_path": internal_path,
+            "thread":        threading.current_thread().ident,
+            "depth":         0,
+            "start":         0.0,
+            "wall":          0.0,
+            "cpu":           0.0,
+            "bytes":         0,
+            "elements":      0,
+        }
+
+    def __enter__(self):
+        record = self.record
+        record["depth"] = self.profiler._push()
+        record["cpu"] = cpu_clock()
+        record["start"] = wall_clock()
+        return self
+
+    def __exit__(self, *args):
+        record = self.record
+        record["wall"] = wall_clock() - record["start"]
+        record["cpu"] = cpu_clock() - record["cpu"]
+        self.profiler._pop(record)
+
+    def add_bytes(self, value):
+        """
+        Add the given number of bytes to this span.
+
+        :param value: the number of bytes
+        :type  value: int
+        """
+        self.record["bytes"] += value
+
+    def add_elements(self, value):
+        """
+        Add the given number of elements to this span.
+
+        :param value: the number of elements
+        :type  value: int
+        """
+        self.record["elements"] += value
+
+
+class _NullSpan(object):
+    # the span returned when no profiler is active
+
+    active = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def add_bytes(self, value):
+        pass
+
+    def add_elements(self, value):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+def active_profiler():
+    """
+    Return the active profiler of the current context,
+    or None if no profiler is active.
+
+    :rtype: :class:`yael.profiling.Profiler`
+    """
+    return _ACTIVE.get()
+
+def span(name, category=Profiler.CATEGORY_PHASE, internal_path=None):
+    """
+    Return a new span of the active profiler,
+    or a no-op span if no profiler is active.
+
+    :param name:          the name of the span
+    :type  name:          str
+    :param category:      the category of the span
+    :type  category:      str
+    :param internal_path: the internal path of the asset, if any
+    :type  internal_path: str
+    :rtype:               context manager
+    """
+    profiler = _ACTIVE.get()
+    if profiler == None:
+        return _NULL_SPAN
+    return _Span(profiler, name, category, internal_path)
+
+
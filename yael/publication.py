@@ -14,12 +14,29 @@ to disk as a compressed (ZIP/EPUB) file
 or as an uncompressed directory.
 """
 
+import functools
 import os
+import zipfile
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+try:
+    from contextvars import copy_context
+except ImportError:
+    copy_context = None
 
 from yael.asset import Asset
+from yael.audiomap import AudioMap
 from yael.container import Container
+from yael.contentstats import ContentStatistics
+from yael.directoryindex import DirectoryIndex
 from yael.encryption import Encryption
 from yael.epub import EPUB
+from yael.integrityreport import IntegrityReport
+from yael.interning import InternTable
 from yael.jsonable import JSONAble
 from yael.manifestation import Manifestation
 from yael.modocument import MODocument
@@ -29,8 +46,12 @@ from yael.navdocument import NavDocument
 from yael.ncxtoc import NCXToc
 from yael.obfuscation import Obfuscation
 from yael.opfpacdocument import OPFPacDocument
+from yael.opfspine import OPFSpine
 from yael.parsing import Parsing
 from yael.rmdocument import RMDocument
+from yael.textextractor import TextExtractor
+from yael.validate import ValidationReport
+import yael.profiling
 import yael.util
 
 __author__ = "Alberto Pettarin"
@@ -53,23 +74,40 @@ class Publication(JSONAble):
     Recognized options are listed in :class:`yael.parsing.Parsing`.
     If `parsing_options` is empty or None, full parsing will be performed.
 
-    :param path:            The path of the file or directory to be read.
-    :type path:             str
-    :param parsing_options: parsing options
-    :type parsing_options:  list of :class:`yael.parsing.Parsing` options
+    If `rendition_criteria` is not None,
+    or if the :data:`yael.parsing.Parsing.LAZY_RENDITIONS` option is given,
+    only the Rendition best matching the criteria
+    (see :func:`yael.container.Container.select_rendition`)
+    is parsed, and the other Renditions are parsed on demand
+    (see :func:`yael.publication.Publication.rendition`
+    and :func:`yael.publication.Publication.parse_renditions`).
+
+    :param path:               The path of the file or directory to be read.
+    :type path:                str
+    :param parsing_options:    parsing options
+    :type parsing_options:     list of :class:`yael.parsing.Parsing` options
+    :param rendition_criteria: the criteria selecting the Rendition to be parsed,
+                               e.g. `{"layout": "pre-paginated", "language": "en"}`
+    :type rendition_criteria:  dict
 
     """
 
-    def __init__(self, path=None, parsing_options=None):
+    def __init__(self, path=None, parsing_options=None, rendition_criteria=None):
         self.parsing_options = parsing_options
         if self.parsing_options == None:
             self.parsing_options = []
+        self.rendition_criteria = rendition_criteria
         self.path = None
+        self.directory_index = None
         self.assets = {}
         self.container = None
         self.manifestation = None
         self.metadata = None
         self.encryption = None
+        self.__audio_maps = {}
+        self.__fingerprints = {}
+        self.__statistics_cache = {}
+        self.__intern_table = InternTable()
 
         if path == None:
             self.manifestation = Manifestation.MEMORY
@@ -78,6 +116,7 @@ class Publication(JSONAble):
                 self.path = path
                 if os.path.isdir(path):
                     self.manifestation = Manifestation.UNCOMPRESSED
+                    self.directory_index = DirectoryIndex(path)
                 else:
                     self.manifestation = Manifestation.COMPRESSED
                 self.parse()
@@ -163,6 +202,21 @@ class Publication(JSONAble):
     def path(self, path):
         self.__path = path
 
+    @property
+    def directory_index(self):
+        """
+        The snapshot of the files of this Publication,
+        for a :const:`yael.manifestation.Manifestation.UNCOMPRESSED`
+        publication (None otherwise).
+
+        :rtype: :class:`yael.directoryindex.DirectoryIndex`
+        """
+        return self.__directory_index
+
+    @directory_index.setter
+    def directory_index(self, directory_index):
+        self.__directory_index = directory_index
+
     @property
     def assets(self):
         """
@@ -178,6 +232,20 @@ class Publication(JSONAble):
     def assets(self, assets):
         self.__assets = assets
 
+    @property
+    def default_rendition(self):
+        """
+        The Default Rendition of this Publication,
+        parsed first if it has not been parsed yet
+        (see :data:`yael.parsing.Parsing.LAZY_RENDITIONS`),
+        or None if there are no Renditions.
+
+        :rtype: :class:`yael.rendition.Rendition`
+        """
+        if self.container == None:
+            return None
+        return self._ensure_parsed(self.container.default_rendition)
+
     @property
     def version(self):
         """
@@ -188,7 +256,7 @@ class Publication(JSONAble):
         :rtype: str
         """
         try:
-            return self.container.default_rendition.pac_document.v_version
+            return self.default_rendition.pac_document.v_version
         except:
             pass
         return None
@@ -215,7 +283,7 @@ class Publication(JSONAble):
                 unique_identifier = self.metadata.v_unique_identifier
             else:
                 # use unique identifier from default rendition
-                p_doc = self.container.default_rendition.pac_document
+                p_doc = self.default_rendition.pac_document
                 unique_identifier = p_doc.v_unique_identifier
         except:
             pass
@@ -238,12 +306,39 @@ class Publication(JSONAble):
                 if dcterms_modified != None:
                     return dcterms_modified
             # use v_dcterms_modified from default rendition
-            p_doc = self.container.default_rendition.pac_document
+            p_doc = self.default_rendition.pac_document
             dcterms_modified = p_doc.metadata.dcterms_modified
         except:
             pass
         return dcterms_modified
 
+    @property
+    def intern_table(self):
+        """
+        The table interning the attribute values
+        repeated across this Publication
+        (e.g., media types and `properties` values).
+
+        :rtype: :class:`yael.interning.InternTable`
+        """
+        return self.__intern_table
+
+    @property
+    def rendition_criteria(self):
+        """
+        The criteria selecting the Rendition parsed
+        when this Publication is parsed
+        (see :func:`yael.container.Container.select_rendition`),
+        or None to parse all the Renditions.
+
+        :rtype: dict
+        """
+        return self.__rendition_criteria
+
+    @rendition_criteria.setter
+    def rendition_criteria(self, rendition_criteria):
+        self.__rendition_criteria = rendition_criteria
+
     @property
     def release_identifier(self):
         """
@@ -304,59 +399,101 @@ class Publication(JSONAble):
         :rtype: str
         """
         try:
-            pac_document = self.container.default_rendition.pac_document
+            pac_document = self.default_rendition.pac_document
             return pac_document.internal_path_cover_image
         except:
             pass
         return None
 
+    @staticmethod
+    def open_async(path, parsing_options=None, executor=None, rendition_criteria=None):
+        """
+        Return an awaitable opening and parsing
+        the Publication at the given path,
+        off the `asyncio` event loop
+        (see :mod:`yael.aio`, Python 3.5 or later):
+
+            publication = await Publication.open_async("book.epub")
+
+        :param path:            the path of the file or directory to be read
+        :type  path:            str
+        :param parsing_options: parsing options
+        :type  parsing_options: list of :class:`yael.parsing.Parsing` options
+        :param executor:        the executor running the I/O and the parsing
+                                (if None, the default one)
+        :type  executor:        :class:`concurrent.futures.Executor`
+        :param rendition_criteria: the criteria selecting the Rendition to be parsed
+        :type  rendition_criteria: dict
+        :rtype:                 awaitable of :class:`yael.publication.Publication`
+        """
+        # imported here, as yael.aio requires Python 3.5 or later
+        import yael.aio
+        return yael.aio.open_publication(
+            path,
+            parsing_options,
+            executor,
+            rendition_criteria)
+
     def parse(self):
         """
         Parse the Publication.
+
+        The repeated attribute values are interned
+        in the intern table of this Publication
+        (see :class:`yael.interning.InternTable`).
         """
 
-        # add mimetype
-        i_p_mimetype = EPUB.INTERNAL_PATH_MIMETYPE
-        mimetype_a = Asset(
-            absolute_path=self.path,
-            relative_path=i_p_mimetype,
-            internal_path=i_p_mimetype)
-        self.assets[i_p_mimetype] = mimetype_a
+        with self.intern_table, yael.profiling.span("parse"):
+            with yael.profiling.span("container"):
+                # add mimetype
+                i_p_mimetype = EPUB.INTERNAL_PATH_MIMETYPE
+                mimetype_a = self._new_asset(i_p_mimetype)
+                self.assets[i_p_mimetype] = mimetype_a
+
+                # parse container.xml (requied)
+                i_p_container = EPUB.INTERNAL_PATH_CONTAINER_XML
+                container_a = self._new_asset(i_p_container)
+                self.container = Container(
+                    string=container_a.contents,
+                    internal_path=i_p_container)
+                self.container.asset = container_a
+                self.assets[i_p_container] = container_a
+
+            # parse multiple renditions (if any)
+            if (
+                    (Parsing.MULTIPLE_RENDITIONS in self.parsing_options) or
+                    (not Parsing.NO_MULTIPLE_RENDITIONS in self.parsing_options)):
+                with yael.profiling.span("multiple_renditions"):
+                    self.parse_multiple_renditions()
+                if (
+                        (Parsing.LAZY_RENDITIONS in self.parsing_options) or
+                        (self.rendition_criteria != None)):
+                    # parse only the selected rendition
+                    rendition = self.container.select_rendition(
+                        **(self.rendition_criteria or {}))
+                    if rendition != None:
+                        self.parse_rendition(rendition)
+                else:
+                    # parse all renditions
+                    for rendition in self.container.renditions:
+                        self.parse_rendition(rendition)
+            else:
+                # parse only the first rendition
+                if len(self.container.renditions) > 0:
+                    self.parse_rendition(self.container.renditions[0])
 
-        # parse container.xml (requied)
-        i_p_container = EPUB.INTERNAL_PATH_CONTAINER_XML
-        container_a = Asset(
-            absolute_path=self.path,
-            relative_path=i_p_container,
-            internal_path=i_p_container)
-        self.container = Container(
-            string=container_a.contents,
-            internal_path=i_p_container)
-        self.container.asset = container_a
-        self.assets[i_p_container] = container_a
-
-        # parse multiple renditions (if any)
-        if (
-                (Parsing.MULTIPLE_RENDITIONS in self.parsing_options) or
-                (not Parsing.NO_MULTIPLE_RENDITIONS in self.parsing_options)):
-            self.parse_multiple_renditions()
-            # parse all renditions
-            for rendition in self.container.renditions:
-                self.parse_rendition(rendition)
-        else:
-            # parse only the first rendition
-            if len(self.container.renditions) > 0:
-                self.parse_rendition(self.container.renditions[0])
+            # parse encryption.xml (if any)
+            if (
+                    (Parsing.ENCRYPTION in self.parsing_options) or
+                    (not Parsing.NO_ENCRYPTION in self.parsing_options)):
+                with yael.profiling.span("encryption"):
+                    self.parse_encryption()
 
-        # parse encryption.xml (if any)
-        if (
-                (Parsing.ENCRYPTION in self.parsing_options) or
-                (not Parsing.NO_ENCRYPTION in self.parsing_options)):
-            self.parse_encryption()
+            # TODO parse: manifest.xml
+            # TODO parse: rights.xml
+            # TODO parse: signatures.xml
 
-        # TODO parse: manifest.xml
-        # TODO parse: rights.xml
-        # TODO parse: signatures.xml
+        self._record_fingerprints()
 
     def parse_encryption(self):
         """
@@ -364,10 +501,7 @@ class Publication(JSONAble):
         """
 
         i_p_encryption = EPUB.INTERNAL_PATH_ENCRYPTION_XML
-        encryption_a = Asset(
-            absolute_path=self.path,
-            relative_path=i_p_encryption,
-            internal_path=i_p_encryption)
+        encryption_a = self._new_asset(i_p_encryption)
         encryption_a_contents = encryption_a.contents
         if encryption_a_contents != None:
             self.encryption = Encryption(
@@ -375,18 +509,29 @@ class Publication(JSONAble):
                 internal_path=i_p_encryption)
             self.encryption.asset = encryption_a
             self.assets[i_p_encryption] = encryption_a
-
-            # TODO refactor this
-            for i_p_asset in self.encryption.adobe_obfuscated_assets:
-                if i_p_asset in self.assets:
-                    obf_asset = self.assets[i_p_asset]
-                    obf_asset.obfuscation_key = self.unique_identifier
-                    obf_asset.obfuscation_algorithm = Obfuscation.ADOBE
-            for i_p_asset in self.encryption.idpf_obfuscated_assets:
-                if i_p_asset in self.assets:
-                    obf_asset = self.assets[i_p_asset]
-                    obf_asset.obfuscation_key = self.unique_identifier
-                    obf_asset.obfuscation_algorithm = Obfuscation.IDPF
+            self._apply_obfuscation()
+
+    def _apply_obfuscation(self):
+        # set the obfuscation key and algorithm
+        # of the obfuscated assets created so far
+        # (the assets of a rendition parsed later get them
+        # at the end of its parsing, see parse_rendition)
+        if self.encryption == None:
+            return
+        obfuscated = []
+        for i_p_asset in self.encryption.adobe_obfuscated_assets:
+            if i_p_asset in self.assets:
+                obfuscated.append((self.assets[i_p_asset], Obfuscation.ADOBE))
+        for i_p_asset in self.encryption.idpf_obfuscated_assets:
+            if i_p_asset in self.assets:
+                obfuscated.append((self.assets[i_p_asset], Obfuscation.IDPF))
+        if len(obfuscated) == 0:
+            return
+        # computed only if needed, as it might parse the default rendition
+        unique_identifier = self.unique_identifier
+        for obf_asset, algorithm in obfuscated:
+            obf_asset.obfuscation_key = unique_identifier
+            obf_asset.obfuscation_algorithm = algorithm
 
     def parse_multiple_renditions(self):
         """
@@ -394,10 +539,7 @@ class Publication(JSONAble):
         """
         # parse metadata.xml (if any)
         i_p_metadata = EPUB.INTERNAL_PATH_METADATA_XML
-        metadata_a = Asset(
-            absolute_path=self.path,
-            relative_path=i_p_metadata,
-            internal_path=i_p_metadata)
+        metadata_a = self._new_asset(i_p_metadata)
         metadata_a_contents = metadata_a.contents
         if metadata_a_contents != None:
             self.metadata = Metadata(
@@ -410,10 +552,7 @@ class Publication(JSONAble):
         rmd = self.container.rm_document
         if rmd != None:
             i_p_rmd = rmd.internal_path
-            rmd_a = Asset(
-                absolute_path=self.path,
-                relative_path=i_p_rmd,
-                internal_path=i_p_rmd)
+            rmd_a = self._new_asset(i_p_rmd)
             rmd_a_contents = rmd_a.contents
             if rmd_a_contents != None:
                 rmd = RMDocument(
@@ -427,88 +566,587 @@ class Publication(JSONAble):
         """
         Parse the given Rendition object.
         """
-        if rendition.v_media_type == MediaType.OPF:
-            # parse OPF
+        with self.intern_table, yael.profiling.span(
+                "rendition",
+                internal_path=rendition.v_full_path):
+            if rendition.v_media_type == MediaType.OPF:
+                # parse OPF
+                self._parse_pac_document(rendition)
+
+                # parse Navigation Document
+                if (
+                        (Parsing.NAV in self.parsing_options) or
+                        (not Parsing.NO_NAV in self.parsing_options)):
+                    with yael.profiling.span("nav_document"):
+                        self._parse_nav_document(rendition)
+
+                # parse NCX
+                if (
+                        (Parsing.NCX in self.parsing_options) or
+                        (not Parsing.NO_NCX in self.parsing_options)):
+                    with yael.profiling.span("ncx_toc"):
+                        self._parse_ncx_toc(rendition)
+
+                # parse Media Overlay Documents
+                if (
+                        (Parsing.MEDIA_OVERLAY in self.parsing_options) or
+                        (not Parsing.NO_MEDIA_OVERLAY in self.parsing_options)):
+                    with yael.profiling.span("media_overlays"):
+                        self._parse_mo_documents(rendition)
+            rendition.parsed = True
+
+            # the assets of this rendition need their obfuscation data,
+            # if encryption.xml has been parsed already
+            self._apply_obfuscation()
+
+    def _parse_pac_document(self, rendition):
+        # parse the Package Document of the given rendition,
+        # and add one asset for each manifest item
+        with yael.profiling.span("pac_document", internal_path=rendition.v_full_path):
             i_p_opf = rendition.v_full_path
-            opf_a = Asset(
-                absolute_path=self.path,
-                relative_path=i_p_opf,
-                internal_path=i_p_opf)
+            opf_a = self._asset(i_p_opf)
             opf = OPFPacDocument(string=opf_a.contents, internal_path=i_p_opf)
             opf.asset = opf_a
-            self.assets[i_p_opf] = opf_a
             rendition.pac_document = opf
 
-            # add one asset for each manifest item
-            if (
-                    (Parsing.ASSET_REFS in self.parsing_options) or
-                    (not Parsing.NO_ASSET_REFS in self.parsing_options)):
+        if (
+                (Parsing.ASSET_REFS in self.parsing_options) or
+                (not Parsing.NO_ASSET_REFS in self.parsing_options)):
+            with yael.profiling.span("asset_refs"):
                 for item in opf.manifest.items:
                     i_p_item = yael.util.norm_join_parent(i_p_opf, item.v_href)
-                    asset = Asset(
-                        absolute_path=self.path,
-                        relative_path=i_p_item,
-                        internal_path=i_p_item)
-                    item.asset = asset
-                    self.assets[i_p_item] = asset
-
-            # parse Navigation Document
-            if (
-                    (Parsing.NAV in self.parsing_options) or
-                    (not Parsing.NO_NAV in self.parsing_options)):
-                i_p_nav = opf.internal_path_nav_document
-                if i_p_nav != None:
-                    nav_a = Asset(
-                        absolute_path=self.path,
-                        relative_path=i_p_nav,
-                        internal_path=i_p_nav)
-                    nav = NavDocument(
-                        string=nav_a.contents,
-                        internal_path=i_p_nav)
-                    nav.asset = nav_a
-                    self.assets[i_p_nav] = nav_a
-                    rendition.nav_document = nav
-
-            # parse NCX
-            if (
-                    (Parsing.NCX in self.parsing_options) or
-                    (not Parsing.NO_NCX in self.parsing_options)):
-                i_p_ncx = opf.internal_path_ncx_toc
-                if i_p_ncx != None:
-                    ncx_a = Asset(
-                        absolute_path=self.path,
-                        relative_path=i_p_ncx,
-                        internal_path=i_p_ncx)
-                    ncx = NCXToc(
-                        string=ncx_a.contents,
-                        internal_path=i_p_ncx)
-                    ncx.asset = ncx_a
-                    self.assets[i_p_ncx] = ncx_a
-                    rendition.ncx_toc = ncx
-
-            # parse Media Overlay Documents
-            if (
-                    (Parsing.MEDIA_OVERLAY in self.parsing_options) or
-                    (not Parsing.NO_MEDIA_OVERLAY in self.parsing_options)):
-                for smil_item in opf.manifest.mo_document_items:
-                    smil_item_parsed = None
-                    try:
-                        i_p_smil = yael.util.norm_join_parent(
-                            i_p_opf,
-                            smil_item.v_href)
-                        smil_a = Asset(
-                            absolute_path=self.path,
-                            relative_path=i_p_smil,
-                            internal_path=i_p_smil)
-                        smil_item_parsed = MODocument(
-                            string=smil_a.contents,
-                            internal_path=i_p_smil)
-                        smil_item_parsed.asset = smil_a
-                        self.assets[i_p_smil] = smil_a
-                    except:
-                        pass
-                    if smil_item_parsed != None:
-                        rendition.add_mo_document(smil_item_parsed)
+                    item.asset = self._asset(i_p_item)
+
+    def _parse_nav_document(self, rendition):
+        # parse the Navigation Document of the given rendition, if any
+        i_p_nav = rendition.pac_document.internal_path_nav_document
+        rendition.nav_document = None
+        if i_p_nav != None:
+            rendition.nav_document = self._parse_document(NavDocument, self._asset(i_p_nav))
+
+    def _parse_ncx_toc(self, rendition):
+        # parse the NCX TOC of the given rendition, if any
+        i_p_ncx = rendition.pac_document.internal_path_ncx_toc
+        rendition.ncx_toc = None
+        if i_p_ncx != None:
+            rendition.ncx_toc = self._parse_document(NCXToc, self._asset(i_p_ncx))
+
+    def _parse_mo_documents(self, rendition, reusable=None):
+        # parse the Media Overlay Documents of the given rendition,
+        # reusing the given ones (a dictionary mapping internal paths
+        # to the already parsed documents), if any
+        mo_documents = []
+        for smil_item in rendition.pac_document.manifest.mo_document_items:
+            smil_item_parsed = None
+            try:
+                i_p_smil = yael.util.norm_join_parent(
+                    rendition.v_full_path,
+                    smil_item.v_href)
+                if (reusable != None) and (i_p_smil in reusable):
+                    smil_item_parsed = reusable[i_p_smil]
+                else:
+                    smil_item_parsed = self._parse_document(MODocument, self._asset(i_p_smil))
+            except:
+                pass
+            if smil_item_parsed != None:
+                mo_documents.append(smil_item_parsed)
+        rendition.mo_documents = mo_documents
+
+    def rendition(self, layout=None, language=None, media=None, accessmode=None):
+        """
+        Return the Rendition best matching the given criteria
+        (see :func:`yael.container.Container.select_rendition`),
+        parsing it first if it has not been parsed yet.
+
+        :param layout:     the `rendition:layout` value
+        :type  layout:     str
+        :param language:   the `rendition:language` value
+        :type  language:   str
+        :param media:      the `rendition:media` value
+        :type  media:      str
+        :param accessmode: the `rendition:accessMode` value
+        :type  accessmode: str
+        :rtype:            :class:`yael.rendition.Rendition`
+        """
+        if self.container == None:
+            return None
+        rendition = self.container.select_rendition(
+            layout=layout,
+            language=language,
+            media=media,
+            accessmode=accessmode)
+        return self._ensure_parsed(rendition)
+
+    def _ensure_parsed(self, rendition):
+        # parse the given rendition, if it has not been parsed yet
+        if (rendition != None) and (not rendition.parsed):
+            self.parse_rendition(rendition)
+            self._record_fingerprints()
+        return rendition
+
+    def parse_renditions(self, renditions=None, max_workers=None):
+        """
+        Parse the given Renditions
+        (if None, all the Renditions of this Publication)
+        which have not been parsed yet.
+
+        The Renditions are parsed in parallel (using threads),
+        unless `max_workers` is 1 or `concurrent.futures`
+        is not available.
+
+        :param renditions:  the Renditions
+        :type  renditions:  list of :class:`yael.rendition.Rendition`
+        :param max_workers: the maximum number of parsing threads
+                            (None for the `concurrent.futures` default)
+        :type  max_workers: int
+        """
+        if renditions == None:
+            if self.container == None:
+                return
+            renditions = self.container.renditions
+        renditions = [r for r in renditions if not r.parsed]
+        if (
+                (ThreadPoolExecutor != None) and
+                (max_workers != 1) and
+                (len(renditions) > 1)):
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = []
+                for rendition in renditions:
+                    function = self.parse_rendition
+                    if copy_context != None:
+                        # propagate the context variables (e.g., the active profiler)
+                        # to the worker thread
+                        function = functools.partial(copy_context().run, function)
+                    futures.append(executor.submit(function, rendition))
+                for future in futures:
+                    future.result()
+        else:
+            for rendition in renditions:
+                self.parse_rendition(rendition)
+        self._record_fingerprints()
+
+    def refresh(self):
+        """
+        Parse again only the documents of this Publication
+        whose contents changed since they were parsed
+        (or since the last call to this function),
+        and invalidate the indices depending on the changed assets.
+
+        The changed assets are detected by comparing their fingerprints
+        (see :func:`yael.asset.Asset.fingerprint`)
+        with the ones recorded when they were parsed:
+
+        1. if `META-INF/container.xml` changed,
+           the whole Publication is parsed again;
+        2. if the Package Document of a Rendition changed,
+           its manifest, spine, and metadata are parsed again,
+           while its Navigation Document, NCX TOC,
+           and Media Overlay Documents are parsed again
+           only if they changed (or if their internal path changed),
+           and the assets no longer referenced by any Rendition
+           are removed;
+        3. each changed Navigation Document, NCX TOC,
+           or Media Overlay Document is parsed again;
+        4. `META-INF/encryption.xml`, `META-INF/metadata.xml`,
+           and the Rendition Mapping Document
+           are parsed again if they changed;
+        5. for the other changed assets (e.g., Content Documents),
+           the cached document order of their ids
+           (see :func:`yael.rendition.Rendition.id_order`),
+           the indices using it, and their audio maps are dropped.
+
+        Only the Renditions already parsed are refreshed.
+        A Publication not read from a file or directory is never refreshed.
+
+        :returns: the internal paths of the changed assets, sorted
+        :rtype:   list of str
+        """
+
+        if self.path == None:
+            return []
+        with yael.profiling.span("refresh"):
+            if self.directory_index != None:
+                self.directory_index.refresh()
+            fingerprints = self._fingerprints(list(self.assets.keys()))
+            changed = set(
+                internal_path for internal_path, fingerprint in fingerprints.items()
+                if fingerprint != self.__fingerprints.get(internal_path, fingerprint))
+            if len(changed) == 0:
+                return []
+
+            if EPUB.INTERNAL_PATH_CONTAINER_XML in changed:
+                # parse everything again
+                self.assets = {}
+                self.container = None
+                self.metadata = None
+                self.encryption = None
+                self.__audio_maps = {}
+                self.__fingerprints = {}
+                self.parse()
+                return sorted(changed)
+
+            with self.intern_table:
+                opf_changed = False
+                for rendition in self.container.renditions:
+                    if rendition.parsed and (rendition.v_media_type == MediaType.OPF):
+                        opf_changed |= (rendition.v_full_path in changed)
+                        self._refresh_rendition(rendition, changed)
+
+                if (
+                        (Parsing.MULTIPLE_RENDITIONS in self.parsing_options) or
+                        (not Parsing.NO_MULTIPLE_RENDITIONS in self.parsing_options)):
+                    i_p_rmd = None
+                    if self.container.rm_document != None:
+                        i_p_rmd = self.container.rm_document.internal_path
+                    if (
+                            (EPUB.INTERNAL_PATH_METADATA_XML in changed) or
+                            (i_p_rmd in changed)):
+                        self.parse_multiple_renditions()
+
+                # drop the assets of the items removed from a manifest
+                if opf_changed:
+                    self._prune_assets()
+
+                # the assets added by a new manifest need their obfuscation data
+                if (
+                        (Parsing.ENCRYPTION in self.parsing_options) or
+                        (not Parsing.NO_ENCRYPTION in self.parsing_options)):
+                    if (EPUB.INTERNAL_PATH_ENCRYPTION_XML in changed) or opf_changed:
+                        self.parse_encryption()
+
+            for internal_path in changed:
+                self.__audio_maps.pop(internal_path, None)
+            self.__fingerprints.update(
+                (p, f) for p, f in fingerprints.items() if p in self.assets)
+            self._record_fingerprints()
+        return sorted(changed)
+
+    def _refresh_rendition(self, rendition, changed):
+        # parse again the changed documents of the given (parsed) rendition
+        i_p_nav_parsed = None
+        if rendition.nav_document != None:
+            i_p_nav_parsed = rendition.nav_document.internal_path
+        i_p_ncx_parsed = None
+        if rendition.ncx_toc != None:
+            i_p_ncx_parsed = rendition.ncx_toc.internal_path
+        mo_documents = rendition.mo_documents
+        if rendition.v_full_path in changed:
+            self._parse_pac_document(rendition)
+        opf = rendition.pac_document
+
+        if (
+                (Parsing.NAV in self.parsing_options) or
+                (not Parsing.NO_NAV in self.parsing_options)):
+            i_p_nav = opf.internal_path_nav_document
+            if (i_p_nav in changed) or (i_p_nav != i_p_nav_parsed):
+                self._parse_nav_document(rendition)
+
+        if (
+                (Parsing.NCX in self.parsing_options) or
+                (not Parsing.NO_NCX in self.parsing_options)):
+            i_p_ncx = opf.internal_path_ncx_toc
+            if (i_p_ncx in changed) or (i_p_ncx != i_p_ncx_parsed):
+                self._parse_ncx_toc(rendition)
+
+        if (
+                (Parsing.MEDIA_OVERLAY in self.parsing_options) or
+                (not Parsing.NO_MEDIA_OVERLAY in self.parsing_options)):
+            reusable = dict(
+                (mo_document.internal_path, mo_document) for mo_document in mo_documents
+                if mo_document.internal_path not in changed)
+            if (rendition.v_full_path in changed) or (len(reusable) < len(mo_documents)):
+                self._parse_mo_documents(rendition, reusable)
+
+        for internal_path in changed:
+            rendition.invalidate(internal_path)
+
+    def _prune_assets(self):
+        # remove the assets not referenced by the container,
+        # by the META-INF files, or by any parsed rendition,
+        # together with their fingerprints and audio maps
+        referenced = set([
+            EPUB.INTERNAL_PATH_MIMETYPE,
+            EPUB.INTERNAL_PATH_CONTAINER_XML,
+            EPUB.INTERNAL_PATH_ENCRYPTION_XML,
+            EPUB.INTERNAL_PATH_METADATA_XML,
+        ])
+        if self.container.rm_document != None:
+            referenced.add(self.container.rm_document.internal_path)
+        for rendition in self.container.renditions:
+            referenced.add(rendition.v_full_path)
+            opf = rendition.pac_document
+            if opf == None:
+                continue
+            for item in opf.manifest.items:
+                referenced.add(yael.util.norm_join_parent(opf.internal_path, item.v_href))
+            for document in [rendition.nav_document, rendition.ncx_toc] + rendition.mo_documents:
+                if document != None:
+                    referenced.add(document.internal_path)
+        for internal_path in list(self.assets.keys()):
+            if internal_path not in referenced:
+                del self.assets[internal_path]
+                self.__fingerprints.pop(internal_path, None)
+                self.__audio_maps.pop(internal_path, None)
+
+    def _fingerprints(self, internal_paths):
+        # return the fingerprints of the assets at the given internal paths,
+        # reading the ZIP central directory only once
+        fingerprints = {}
+        zip_file = None
+        try:
+            if self.manifestation == Manifestation.COMPRESSED:
+                zip_file = zipfile.ZipFile(self.path, mode="r")
+        except:
+            pass
+        try:
+            for internal_path in internal_paths:
+                fingerprints[internal_path] = self.assets[internal_path].fingerprint(
+                    zip_file=zip_file)
+        finally:
+            if zip_file != None:
+                zip_file.close()
+        return fingerprints
+
+    def _record_fingerprints(self):
+        # record the fingerprints of the assets without one
+        self.__fingerprints.update(self._fingerprints(list(
+            p for p in self.assets if p not in self.__fingerprints)))
+
+    def _asset(self, internal_path):
+        # return the asset at the given internal path,
+        # creating (and adding) it if needed;
+        # setdefault is atomic, hence renditions parsed in parallel
+        # threads and sharing a file get the same asset
+        asset = self.assets.get(internal_path)
+        if asset == None:
+            asset = self.assets.setdefault(internal_path, self._new_asset(internal_path))
+        return asset
+
+    def _new_asset(self, internal_path):
+        # create the asset at the given internal path,
+        # inside the file or directory of this Publication
+        asset = Asset(
+            absolute_path=self.path,
+            relative_path=internal_path,
+            internal_path=internal_path)
+        asset.directory_index = self.directory_index
+        return asset
+
+    def _parse_document(self, element_class, asset):
+        # parse the given asset as an element of the given class,
+        # in streaming mode if requested
+        if Parsing.STREAMING in self.parsing_options:
+            element = element_class(internal_path=asset.internal_path)
+            stream = asset.open_stream()
+            if stream != None:
+                try:
+                    element.parse_stream(stream)
+                finally:
+                    stream.close()
+        else:
+            element = element_class(
+                string=asset.contents,
+                internal_path=asset.internal_path)
+        element.asset = asset
+        return element
+
+    def audio_map(self, internal_path):
+        """
+        Return the time-to-byte map of the audio asset
+        with the given internal path.
+
+        The map (and its frame/sample tables)
+        is computed once per audio asset, and then cached.
+
+        :param internal_path: the internal path of the audio asset
+        :type  internal_path: str
+        :returns:             the map, or None if the asset does not exist
+        :rtype:               :class:`yael.audiomap.AudioMap`
+        """
+
+        if internal_path in self.__audio_maps:
+            return self.__audio_maps[internal_path]
+        if not internal_path in self.assets:
+            return None
+        audio_map = AudioMap(asset=self.assets[internal_path])
+        self.__audio_maps[internal_path] = audio_map
+        return audio_map
+
+    def audio_clip_byte_range(self, mo_document, mo_audio):
+        """
+        Return the byte range `(start, end)`
+        (`start` inclusive, `end` exclusive)
+        of the audio asset referenced by the given
+        Media Overlay `<audio>` element,
+        covering its `clipBegin`/`clipEnd` interval.
+
+        :param mo_document: the Media Overlay Document
+                            containing the `<audio>` element
+        :type  mo_document: :class:`yael.modocument.MODocument`
+        :param mo_audio:    the `<audio>` element
+        :type  mo_audio:    :class:`yael.moaudio.MOAudio`
+        :returns:           the byte range, or None if it cannot be computed
+        :rtype:             tuple of int
+        """
+
+        audio_map = self._audio_map_for_clip(mo_document, mo_audio)
+        if audio_map == None:
+            return None
+        return audio_map.byte_range(
+            mo_audio.clip_begin_seconds,
+            mo_audio.clip_end_seconds)
+
+    def audio_clip_contents(self, mo_document, mo_audio):
+        """
+        Return the bytes of the audio asset referenced by the given
+        Media Overlay `<audio>` element,
+        covering its `clipBegin`/`clipEnd` interval.
+
+        Only the bytes in the clip are read from the audio asset.
+
+        :param mo_document: the Media Overlay Document
+                            containing the `<audio>` element
+        :type  mo_document: :class:`yael.modocument.MODocument`
+        :param mo_audio:    the `<audio>` element
+        :type  mo_audio:    :class:`yael.moaudio.MOAudio`
+        :returns:           the clip bytes, or None if they cannot be read
+        :rtype:             bytes
+        """
+
+        audio_map = self._audio_map_for_clip(mo_document, mo_audio)
+        if audio_map == None:
+            return None
+        return audio_map.read(
+            mo_audio.clip_begin_seconds,
+            mo_audio.clip_end_seconds)
+
+    def _audio_map_for_clip(self, mo_document, mo_audio):
+        i_p_audio = mo_audio.v_src
+        if (mo_document != None) and (mo_document.internal_path != None):
+            i_p_audio = yael.util.norm_join_parent(
+                mo_document.internal_path,
+                mo_audio.v_src)
+        if i_p_audio == None:
+            return None
+        return self.audio_map(i_p_audio)
+
+    def statistics(
+            self,
+            rendition=None,
+            words_per_minute=ContentStatistics.DEFAULT_WORDS_PER_MINUTE,
+            max_workers=None):
+        """
+        Compute the word, character, and image counts,
+        and the estimated reading time,
+        of each Content Document in the spine,
+        of the whole spine, and of each TOC entry.
+
+        The counts of each Content Document are cached,
+        keyed by its internal path and by the CRC-32 of its contents,
+        so that calling this function again
+        only parses the changed Content Documents.
+
+        :param rendition:        the Rendition (if None, the default Rendition)
+        :type  rendition:        :class:`yael.rendition.Rendition`
+        :param words_per_minute: the reading speed, in words per minute
+        :type  words_per_minute: int
+        :param max_workers:      the maximum number of parsing threads
+                                 (None for the `concurrent.futures` default)
+        :type  max_workers:      int
+        :rtype:                  :class:`yael.contentstats.ContentStatistics`
+        """
+        return ContentStatistics(
+            publication=self,
+            rendition=rendition,
+            words_per_minute=words_per_minute,
+            max_workers=max_workers,
+            cache=self.__statistics_cache)
+
+    def validate(self):
+        """
+        Check the structural rules of the Package Documents,
+        Navigation Documents, and NCX TOCs
+        of the parsed Renditions of this Publication
+        (see :mod:`yael.validate`).
+
+        :rtype: :class:`yael.validate.ValidationReport`
+        """
+        return ValidationReport(publication=self)
+
+    def verify(self, max_workers=None):
+        """
+        Check the integrity of the container of this Publication.
+
+        For a compressed Publication,
+        decompress every ZIP entry and check its CRC-32,
+        and check the rules for the `mimetype` entry
+        (first entry, stored, no extra field).
+        The manifests of the parsed Renditions
+        are cross-checked against the files in the container.
+
+        Unlike reading the assets, which returns None on error,
+        the errors are listed in the returned report.
+
+        :param max_workers: the maximum number of checking threads
+                            (None for the `concurrent.futures` default)
+        :type  max_workers: int
+        :rtype:             :class:`yael.integrityreport.IntegrityReport`
+        """
+        return IntegrityReport(publication=self, max_workers=max_workers)
+
+    def text_chunks(self, rendition=None, linear=True, extractor=None):
+        """
+        Yield the text of the Content Documents in the spine,
+        in spine order, as
+        `(spine_index, internal_path, element_id, text)` chunks.
+
+        The `spine_index` is the index of the Content Document
+        in the (full) spine.
+        The Content Documents are parsed one at a time,
+        in streaming mode (see :class:`yael.textextractor.TextExtractor`),
+        hence the memory usage does not depend on their size.
+
+        :param rendition: the Rendition (if None, the default Rendition)
+        :type  rendition: :class:`yael.rendition.Rendition`
+        :param linear:    if True, skip the spine items
+                          with `linear="no"`
+        :type  linear:    bool
+        :param extractor: the text extractor, setting the
+                          segmentation and skipping options
+                          (if None, extract all the text,
+                          in one chunk per block-level element)
+        :type  extractor: :class:`yael.textextractor.TextExtractor`
+        :rtype:           generator of tuple
+        """
+
+        if rendition == None:
+            rendition = self.default_rendition
+        if extractor == None:
+            extractor = TextExtractor()
+        pac_document = rendition.pac_document
+
+        # read the ZIP central directory only once
+        zip_file = None
+        if self.manifestation == Manifestation.COMPRESSED:
+            zip_file = zipfile.ZipFile(self.path, mode="r")
+        try:
+            for spine_index, itemref in enumerate(pac_document.spine.itemrefs):
+                if linear and (itemref.v_linear == OPFSpine.V_NO):
+                    continue
+                item = pac_document.manifest.item_by_id(itemref.v_idref)
+                if (item == None) or (item.asset == None):
+                    continue
+                stream = item.asset.open_stream(zip_file=zip_file)
+                if stream == None:
+                    continue
+                try:
+                    for element_id, text in extractor.chunks(stream):
+                        yield (spine_index, item.internal_path, element_id, text)
+                finally:
+                    stream.close()
+        finally:
+            if zip_file != None:
+                zip_file.close()
 
     @property
     def size(self):
@@ -532,6 +1170,8 @@ class Publication(JSONAble):
             return os.path.getsize(self.path)
 
         if self.manifestation == Manifestation.UNCOMPRESSED:
+            if self.directory_index != None:
+                return self.directory_index.size
             return yael.util.directory_size(self.path)
 
         # TODO perhaps some sort of memory footprint size might be useful
@@ -12,8 +12,13 @@ An abstract Rendition, holding:
 
 """
 
+import lxml.etree
+
 from yael.element import Element
 from yael.jsonable import JSONAble
+from yael.pagelistindex import PageListIndex
+from yael.tocindex import TOCIndex
+import yael.util
 
 __author__ = "Alberto Pettarin"
 __copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
@@ -29,6 +34,10 @@ class Rendition(Element):
     """
 
     def __init__(self, internal_path=None, obj=None, string=None):
+        self.__id_orders = {}
+        self.__locate_index = None
+        self.__page_list_index = None
+        self.__toc_index = None
         self.v_full_path = None
         self.v_media_type = None
         self.v_rendition_accessmode = None
@@ -37,6 +46,7 @@ class Rendition(Element):
         self.v_rendition_layout = None
         self.v_rendition_media = None
         self.mo_documents = []
+        self.parsed = False
         self.nav_document = None
         self.ncx_toc = None
         self.pac_document = None
@@ -184,6 +194,21 @@ class Rendition(Element):
     def mo_documents(self, mo_documents):
         self.__mo_documents = mo_documents
 
+    @property
+    def parsed(self):
+        """
+        True if the documents of this Rendition
+        have been parsed
+        (see :func:`yael.publication.Publication.parse_rendition`).
+
+        :rtype: bool
+        """
+        return self.__parsed
+
+    @parsed.setter
+    def parsed(self, parsed):
+        self.__parsed = parsed
+
     @property
     def nav_document(self):
         """
@@ -197,6 +222,9 @@ class Rendition(Element):
     @nav_document.setter
     def nav_document(self, nav_document):
         self.__nav_document = nav_document
+        self.__locate_index = None
+        self.__page_list_index = None
+        self.__toc_index = None
 
     @property
     def ncx_toc(self):
@@ -211,6 +239,8 @@ class Rendition(Element):
     @ncx_toc.setter
     def ncx_toc(self, ncx_toc):
         self.__ncx_toc = ncx_toc
+        self.__locate_index = None
+        self.__toc_index = None
 
     @property
     def pac_document(self):
@@ -225,6 +255,9 @@ class Rendition(Element):
     @pac_document.setter
     def pac_document(self, pac_document):
         self.__pac_document = pac_document
+        self.__id_orders = {}
+        self.__locate_index = None
+        self.__page_list_index = None
 
     @property
     def toc(self):
@@ -250,6 +283,46 @@ class Rendition(Element):
             return self.ncx_toc
         return None
 
+    @property
+    def toc_index(self):
+        """
+        The flattened index of the TOC associated with this Rendition
+        (see :func:`yael.rendition.Rendition.toc`),
+        or None if the TOC is not present.
+
+        The index is computed once, and then cached
+        until the Navigation Document or the NCX TOC are replaced.
+
+        :rtype: :class:`yael.tocindex.TOCIndex`
+        """
+        if self.__toc_index == None:
+            toc = self.toc
+            if toc != None:
+                self.__toc_index = TOCIndex(toc=toc)
+        return self.__toc_index
+
+    @property
+    def page_list_index(self):
+        """
+        The index of the page-list `<nav>` of this Rendition,
+        or None if the page-list is not present.
+
+        The index is computed once, and then cached
+        until the Package Document or the Navigation Document are replaced.
+
+        :rtype: :class:`yael.pagelistindex.PageListIndex`
+        """
+        if self.__page_list_index == None:
+            try:
+                page_list = self.nav_document.page_list
+                if page_list != None:
+                    self.__page_list_index = PageListIndex(
+                        page_list=page_list,
+                        rendition=self)
+            except:
+                pass
+        return self.__page_list_index
+
     @property
     def landmarks(self):
         """
@@ -264,4 +337,213 @@ class Rendition(Element):
             pass
         return None
 
+    def locate(self, reference):
+        """
+        Locate the given reference inside this Rendition.
+
+        The reference is an internal path (relative to the Container root),
+        optionally followed by a fragment,
+        for example `OEBPS/Text/ch07.xhtml#p123`.
+
+        Return a dictionary with keys:
+
+        1. `internal_path`: the internal path of the reference
+        2. `fragment`: the fragment of the reference, or None
+        3. `spine_index`: the index in the spine, or -1
+        4. `spine_linear_index`: the index in the linear spine, or -1
+        5. `toc_index`: the index of the nearest TOC entry
+           in :func:`yael.rendition.Rendition.toc_index`, or -1
+        6. `toc_label`: the label of the nearest TOC entry, or None
+        7. `page_label`: the label of the page containing the reference,
+           or None
+
+        The nearest TOC entry is the entry pointing to the reference,
+        if any, or the entry pointing to its internal path
+        which most closely precedes it in document order
+        (see :func:`yael.rendition.Rendition.id_order`),
+        or the last entry pointing to the nearest preceding spine item.
+
+        The page containing the reference is found by binary search
+        in :func:`yael.rendition.Rendition.page_list_index`.
+
+        The lookups use indices computed on first use,
+        and then cached until the Package Document,
+        the Navigation Document or the NCX TOC are replaced.
+
+        :param reference: the reference to be located
+        :type  reference: str
+        :rtype:           dict
+        """
+        dic = yael.util.split_reference(reference)
+        internal_path = dic.get("base")
+        fragment = dic.get("fragment")
+        spine_index = -1
+        spine_linear_index = -1
+        try:
+            spine_index = self.pac_document.spine_index_by_internal_path(
+                internal_path)
+            spine_linear_index = self.pac_document.spine_linear_index_by_internal_path(
+                internal_path)
+        except:
+            pass
+
+        order = None
+        if fragment == None:
+            order = PageListIndex.ORDER_START
+        elif internal_path != None:
+            order = self.id_order(internal_path).get(fragment)
+
+        index = self._locate_index()
+        toc_index = index["toc"].get((internal_path, fragment), -1)
+        if (toc_index == -1) and (self.toc_index != None):
+            toc_index = self._nearest_toc_index(
+                internal_path,
+                spine_index,
+                order)
+        toc_label = None
+        if toc_index > -1:
+            toc_label = self.toc_index.labels[toc_index]
+
+        page_label = None
+        if (spine_index > -1) and (self.page_list_index != None):
+            if order == None:
+                order = PageListIndex.ORDER_START
+            page_index = self.page_list_index.index_at(spine_index, order)
+            if page_index > -1:
+                page_label = self.page_list_index.labels[page_index]
+
+        return {
+            "internal_path":      internal_path,
+            "fragment":           fragment,
+            "spine_index":        spine_index,
+            "spine_linear_index": spine_linear_index,
+            "toc_index":          toc_index,
+            "toc_label":          toc_label,
+            "page_label":         page_label,
+        }
+
+    def _nearest_toc_index(self, internal_path, spine_index, order):
+        # the entry pointing to internal_path
+        # at the greatest document order not after order, if any
+        toc_index = -1
+        best = None
+        ids = None
+        for i in self.toc_index.indices_by_internal_path(internal_path):
+            fragment = self.toc_index.fragments[i]
+            if fragment == None:
+                i_order = PageListIndex.ORDER_START
+            else:
+                if ids == None:
+                    ids = self.id_order(internal_path)
+                i_order = ids.get(fragment)
+            if i_order == None:
+                continue
+            if order == None:
+                # the reference is not in the document order:
+                # use the first entry pointing to internal_path
+                return i
+            if (i_order <= order) and ((best == None) or (i_order >= best)):
+                toc_index = i
+                best = i_order
+        if (toc_index == -1) and (spine_index > 0):
+            # the last entry pointing to the nearest preceding spine item
+            toc_index = self._locate_index()["toc_by_spine"][spine_index - 1]
+        return toc_index
+
+    def _locate_index(self):
+        # compute the indices used by locate()
+        if self.__locate_index == None:
+            toc = {}
+            toc_by_spine = []
+
+            toc_index = self.toc_index
+            if toc_index != None:
+                for i in range(len(toc_index)):
+                    key = (toc_index.internal_paths[i], toc_index.fragments[i])
+                    if key not in toc:
+                        toc[key] = i
+                try:
+                    # the last entry pointing to each spine item,
+                    # or to the nearest preceding one
+                    toc_by_spine = [-1] * len(self.pac_document.spine)
+                    for internal_path in toc_index.internal_paths_referenced:
+                        spine_index = self.pac_document.spine_index_by_internal_path(
+                            internal_path)
+                        if spine_index > -1:
+                            toc_by_spine[spine_index] = toc_index.indices_by_internal_path(
+                                internal_path)[-1]
+                    last = -1
+                    for spine_index in range(len(toc_by_spine)):
+                        if toc_by_spine[spine_index] == -1:
+                            toc_by_spine[spine_index] = last
+                        last = toc_by_spine[spine_index]
+                except:
+                    pass
+
+            self.__locate_index = {
+                "toc":          toc,
+                "toc_by_spine": toc_by_spine,
+            }
+        return self.__locate_index
+
+    def invalidate(self, internal_path):
+        """
+        Drop the cached data depending on the contents
+        of the content document at the given internal path,
+        that is, the document order of its ids
+        (see :func:`yael.rendition.Rendition.id_order`)
+        and, if it was computed, the page-list index,
+        for example after the content document has changed.
+
+        :param internal_path: the internal path of the content document
+        :type  internal_path: str
+        """
+        if internal_path in self.__id_orders:
+            del self.__id_orders[internal_path]
+            self.__page_list_index = None
+
+    def id_order(self, internal_path):
+        """
+        Return a dictionary mapping each `id` value
+        in the content document at the given internal path
+        to the position (starting from 0) of its element
+        in document order.
+
+        The content document is scanned once,
+        and the result is cached until the Package Document is replaced.
+
+        :param internal_path: the internal path of the content document
+        :type  internal_path: str
+        :returns:             the dictionary (empty if the document
+                              cannot be read)
+        :rtype:               dict
+        """
+        if internal_path in self.__id_orders:
+            return self.__id_orders[internal_path]
+        order = {}
+        stream = None
+        try:
+            item = self.pac_document.manifest.item_by_internal_path(internal_path)
+            stream = item.asset.open_stream()
+            position = 0
+            for event, elem in lxml.etree.iterparse(
+                    stream,
+                    events=("start", "end"),
+                    recover=True):
+                if event == "start":
+                    v_id = elem.get("id")
+                    if (v_id != None) and (v_id not in order):
+                        order[v_id] = position
+                        position += 1
+                else:
+                    # only the ids are needed, not the tail
+                    # (clear(keep_tail=True) requires lxml 4.4)
+                    elem.clear()
+        except:
+            pass
+        if stream != None:
+            stream.close()
+        self.__id_orders[internal_path] = order
+        return order
+
 
@@ -3,8 +3,15 @@
 
 """
 The EPUB 3 Multiple Renditions Rendition Mapping Document.
+
+The Rendition Mapping Locations are indexed
+by rendition, internal path, and fragment of their points,
+so that a location can be mapped to the equivalent location
+in another rendition without scanning all the points.
 """
 
+import os
+
 from yael.element import Element
 from yael.jsonable import JSONAble
 from yael.namespace import Namespace
@@ -35,6 +42,7 @@ class RMDocument(Element):
     V_RESOURCE_MAP = "resource-map"
 
     def __init__(self, internal_path=None, obj=None, string=None):
+        self.__index = {}
         self.v_epub_type = None
         self.locations = []
         Element.__init__(
@@ -99,6 +107,102 @@ class RMDocument(Element):
 
         """
         self.locations.append(location)
+        self._index_location(location)
+
+    def _index_location(self, location):
+        """
+        Add the points of the given location to the index,
+        keeping the first location for each key.
+        """
+        for point in location.points:
+            key = self._point_key(point)
+            if (key != None) and (key not in self.__index):
+                self.__index[key] = location
+
+    def _point_key(self, point):
+        """
+        Return the `(rendition, internal path, fragment)` key
+        of the given point, or None if it cannot be indexed.
+        """
+        if (point.v_epub_rendition == None) or (point.v_href == None):
+            return None
+        dic = yael.util.split_reference(point.v_href)
+        base = dic.get("base", "")
+        if len(base) == 0:
+            return None
+        # the href and the rendition are relative to this document
+        rendition = point.v_epub_rendition.strip()
+        if self.internal_path != None:
+            internal_path = yael.util.norm_join_parent(self.internal_path, base)
+            rendition = yael.util.norm_join_parent(self.internal_path, rendition)
+        else:
+            internal_path = os.path.normpath(base)
+            rendition = os.path.normpath(rendition)
+        return (
+            rendition,
+            internal_path,
+            dic.get("fragment"))
+
+    def location(self, rendition, reference):
+        """
+        Return the Rendition Mapping Location
+        containing the given reference in the given rendition,
+        or None if there is no such location.
+
+        If the reference has a fragment, and no point
+        refers to it, the location of its internal path
+        (with no fragment) is returned, if any.
+
+        :param rendition: the full path of the Package Document
+                          of the rendition (e.g., `OEBPS/fixed.opf`)
+        :type  rendition: str
+        :param reference: the internal path (relative to the Container root),
+                          optionally followed by a fragment,
+                          for example `OEBPS/Text/ch07.xhtml#p123`
+        :type  reference: str
+        :rtype:           :class:`yael.rmlocation.RMLocation`
+        """
+        if (rendition == None) or (reference == None):
+            return None
+        rendition = os.path.normpath(rendition)
+        dic = yael.util.split_reference(reference)
+        internal_path = os.path.normpath(dic.get("base", ""))
+        fragment = dic.get("fragment")
+        location = self.__index.get((rendition, internal_path, fragment))
+        if (location == None) and (fragment != None):
+            location = self.__index.get((rendition, internal_path, None))
+        return location
+
+    def map_reference(self, reference, source_rendition, target_rendition):
+        """
+        Map the given reference in the source rendition
+        to the equivalent reference in the target rendition,
+        as an internal path (relative to the Container root),
+        optionally followed by a fragment.
+
+        Return None if the reference is not mapped.
+
+        :param reference:        the reference in the source rendition
+        :type  reference:        str
+        :param source_rendition: the full path of the Package Document
+                                 of the source rendition
+        :type  source_rendition: str
+        :param target_rendition: the full path of the Package Document
+                                 of the target rendition
+        :type  target_rendition: str
+        :rtype:                  str
+        """
+        location = self.location(source_rendition, reference)
+        if location == None:
+            return None
+        target_rendition = os.path.normpath(target_rendition)
+        for point in location.points:
+            key = self._point_key(point)
+            if (key != None) and (key[0] == target_rendition):
+                if key[2] == None:
+                    return key[1]
+                return "%s#%s" % (key[1], key[2])
+        return None
 
     @property
     def locations(self):
@@ -112,6 +216,9 @@ class RMDocument(Element):
     @locations.setter
     def locations(self, locations):
         self.__locations = locations
+        self.__index = {}
+        for location in locations:
+            self._index_location(location)
 
     @property
     def v_epub_type(self):
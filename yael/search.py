@@ -0,0 +1,426 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+An inverted index of the text of the Content Documents
+in the spine of a Rendition,
+supporting term, phrase, and prefix queries.
+
+The text is extracted in streaming mode
+(see :func:`yael.publication.Publication.text_chunks`),
+and each term is mapped to its postings,
+that is, for each spine index,
+the (chunk, position, offset) triples of its occurrences,
+where chunk is the index of the text chunk
+(hence of its element id) inside the Content Document,
+position is the index of the term in the Content Document,
+and offset is the index of its first character in the chunk.
+
+The index can be saved to (and loaded from)
+a gzip-compressed JSON file,
+for example next to the EPUB file,
+and it can be updated one Content Document at a time.
+"""
+
+import bisect
+import gzip
+import itertools
+import json
+import re
+
+from yael.jsonable import JSONAble
+from yael.textextractor import TextExtractor
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+class SearchIndex(JSONAble):
+    """
+    Build a search index of the given `publication`.
+
+    :param publication: the Publication to be indexed
+    :type  publication: :class:`yael.publication.Publication`
+    :param rendition:   the Rendition (if None, the default Rendition)
+    :type  rendition:   :class:`yael.rendition.Rendition`
+    :param extractor:   the text extractor
+                        (if None, index all the text,
+                        in one chunk per block-level element)
+    :type  extractor:   :class:`yael.textextractor.TextExtractor`
+
+    """
+
+    FORMAT_VERSION = 1
+    """ The version of the serialization format. """
+
+    FILE_EXTENSION = ".search.json.gz"
+    """ The suggested extension for a saved index. """
+
+    PREFIX_WILDCARD = "*"
+    """ The suffix marking a prefix query term. """
+
+    TERM_RE = re.compile(r"\w+", re.UNICODE)
+    """ The regular expression matching a term. """
+
+    def __init__(self, publication=None, rendition=None, extractor=None):
+        self._reset()
+        if publication != None:
+            self.build(publication, rendition, extractor)
+
+    def json_object(self, recursive=True):
+        obj = {
+            "version":   SearchIndex.FORMAT_VERSION,
+            "documents": len(self.documents),
+            "terms":     len(self.postings),
+        }
+        if recursive:
+            obj["documents"] = dict(
+                (str(k), v) for k, v in self.documents.items())
+            obj["terms"] = dict(
+                (t, dict((str(k), v) for k, v in p.items()))
+                for t, p in self.postings.items())
+        return obj
+
+    def __len__(self):
+        return len(self.postings)
+
+    def build(self, publication, rendition=None, extractor=None):
+        """
+        Index the Content Documents in the spine
+        of the given Publication,
+        replacing the current contents of this index.
+
+        :param publication: the Publication to be indexed
+        :type  publication: :class:`yael.publication.Publication`
+        :param rendition:   the Rendition (if None, the default Rendition)
+        :type  rendition:   :class:`yael.rendition.Rendition`
+        :param extractor:   the text extractor
+        :type  extractor:   :class:`yael.textextractor.TextExtractor`
+        """
+
+        self._reset()
+        chunks = publication.text_chunks(
+            rendition=rendition,
+            linear=False,
+            extractor=extractor)
+        for key, group in itertools.groupby(chunks, key=lambda c: (c[0], c[1])):
+            self._add_document(key[0], key[1], ((c[2], c[3]) for c in group))
+
+    def update_document(self, publication, internal_path, rendition=None, extractor=None):
+        """
+        Re-index the Content Document at the given internal path,
+        for example after its asset has changed,
+        leaving the other Content Documents untouched.
+
+        If the Content Document is no longer in the spine
+        (or its asset is missing), it is removed from the index.
+
+        :param publication:   the Publication
+        :type  publication:   :class:`yael.publication.Publication`
+        :param internal_path: the internal path of the Content Document
+        :type  internal_path: str
+        :param rendition:     the Rendition (if None, the default Rendition)
+        :type  rendition:     :class:`yael.rendition.Rendition`
+        :param extractor:     the text extractor
+        :type  extractor:     :class:`yael.textextractor.TextExtractor`
+        """
+
+        if rendition == None:
+            rendition = publication.default_rendition
+        if extractor == None:
+            extractor = TextExtractor()
+        self.remove_document(internal_path)
+        spine_index = rendition.pac_document.spine_index_by_internal_path(internal_path)
+        asset = publication.assets.get(internal_path)
+        if (spine_index < 0) or (asset == None):
+            return
+        stream = asset.open_stream()
+        if stream == None:
+            return
+        try:
+            self.update_asset(spine_index, internal_path, stream, extractor)
+        finally:
+            stream.close()
+
+    def update_asset(self, spine_index, internal_path, source, extractor=None):
+        """
+        Index the given Content Document source
+        at the given spine index,
+        replacing the current postings of that spine index.
+
+        :param spine_index:   the spine index of the Content Document
+        :type  spine_index:   int
+        :param internal_path: the internal path of the Content Document
+        :type  internal_path: str
+        :param source:        the Content Document, as a binary file-like object
+                              or a file path
+        :type  source:        file-like object or str
+        :param extractor:     the text extractor
+        :type  extractor:     :class:`yael.textextractor.TextExtractor`
+        """
+
+        if extractor == None:
+            extractor = TextExtractor()
+        self.remove_spine_index(spine_index)
+        self._add_document(spine_index, internal_path, extractor.chunks(source))
+
+    def remove_document(self, internal_path):
+        """
+        Remove the Content Document at the given internal path
+        from the index.
+
+        :param internal_path: the internal path of the Content Document
+        :type  internal_path: str
+        """
+        for spine_index, document in list(self.documents.items()):
+            if document["internal_path"] == internal_path:
+                self.remove_spine_index(spine_index)
+
+    def remove_spine_index(self, spine_index):
+        """
+        Remove the Content Document at the given spine index
+        from the index.
+
+        :param spine_index: the spine index of the Content Document
+        :type  spine_index: int
+        """
+        if spine_index not in self.documents:
+            return
+        del self.documents[spine_index]
+        for term in self.__document_terms.pop(spine_index, []):
+            postings = self.postings[term]
+            del postings[spine_index]
+            if len(postings) == 0:
+                del self.postings[term]
+                self.__sorted_terms = None
+
+    def _reset(self):
+        self.documents = {}
+        self.postings = {}
+        self.__document_terms = {}
+        self.__sorted_terms = None
+
+    def _add_document(self, spine_index, internal_path, chunks):
+        # index the given (element_id, text) chunks,
+        # collecting the postings of the document locally first
+        element_ids = []
+        local = {}
+        position = 0
+        finditer = SearchIndex.TERM_RE.finditer
+        for element_id, text in chunks:
+            chunk = len(element_ids)
+            element_ids.append(element_id)
+            for match in finditer(text):
+                term = match.group(0).lower()
+                triples = local.get(term)
+                if triples == None:
+                    triples = local[term] = []
+                triples.extend((chunk, position, match.start()))
+                position += 1
+        self.documents[spine_index] = {
+            "internal_path": internal_path,
+            "element_ids": element_ids,
+        }
+        self._add_postings(spine_index, local)
+
+    def _add_postings(self, spine_index, local):
+        # merge the postings of a document
+        postings = self.postings
+        for term, triples in local.items():
+            if term not in postings:
+                postings[term] = {}
+                self.__sorted_terms = None
+            postings[term][spine_index] = triples
+        self.__document_terms[spine_index] = set(local)
+
+    @staticmethod
+    def tokenize(string):
+        """
+        Split the given string into (lowercased) terms.
+
+        :param string: the string
+        :type  string: str
+        :rtype:        list of str
+        """
+        return list(m.group(0).lower() for m in SearchIndex.TERM_RE.finditer(string))
+
+    def terms_with_prefix(self, prefix):
+        """
+        Return the indexed terms starting with the given prefix,
+        in lexicographic order.
+
+        :param prefix: the prefix
+        :type  prefix: str
+        :rtype:        list of str
+        """
+        if self.__sorted_terms == None:
+            self.__sorted_terms = sorted(self.postings)
+        terms = self.__sorted_terms
+        prefix = prefix.lower()
+        i = bisect.bisect_left(terms, prefix)
+        j = i
+        while (j < len(terms)) and (terms[j].startswith(prefix)):
+            j += 1
+        return terms[i:j]
+
+    def _occurrences(self, term, prefix=False):
+        # map each spine index to the dict position -> (chunk, offset)
+        # of the occurrences of the given term (or prefix)
+        terms = [term]
+        if prefix:
+            terms = self.terms_with_prefix(term)
+        occurrences = {}
+        for t in terms:
+            for spine_index, triples in self.postings.get(t, {}).items():
+                if spine_index not in occurrences:
+                    occurrences[spine_index] = {}
+                positions = occurrences[spine_index]
+                for i in range(0, len(triples), 3):
+                    positions[triples[i + 1]] = (triples[i], triples[i + 2])
+        return occurrences
+
+    def search(self, query, prefix=False):
+        """
+        Search the given query,
+        and return the list of hits, in spine and document order.
+
+        A query consisting of several terms is a phrase query,
+        matching only consecutive terms in the same chunk.
+        If `prefix` is True, or if the query ends with
+        :const:`yael.search.SearchIndex.PREFIX_WILDCARD`,
+        its last term is matched as a prefix.
+
+        Each hit is a dictionary with keys
+        `spine_index`, `internal_path`, `element_id`,
+        `chunk`, `position`, and `offset`
+        (of the first term of the phrase).
+
+        :param query:  the query
+        :type  query:  str
+        :param prefix: if True, match the last term as a prefix
+        :type  prefix: bool
+        :rtype:        list of dict
+        """
+        query = query.strip()
+        if query.endswith(SearchIndex.PREFIX_WILDCARD):
+            prefix = True
+        terms = SearchIndex.tokenize(query)
+        if len(terms) == 0:
+            return []
+
+        # the occurrences of each term, stopping at the first missing one
+        occurrences = []
+        for i, term in enumerate(terms):
+            is_prefix = prefix and (i == len(terms) - 1)
+            occurrences.append(self._occurrences(term, is_prefix))
+            if len(occurrences[-1]) == 0:
+                return []
+
+        hits = []
+        first = occurrences[0]
+        for spine_index in sorted(first):
+            if any(spine_index not in o for o in occurrences[1:]):
+                continue
+            document = self.documents[spine_index]
+            for position in sorted(first[spine_index]):
+                chunk, offset = first[spine_index][position]
+                matched = True
+                for k in range(1, len(terms)):
+                    other = occurrences[k][spine_index].get(position + k)
+                    if (other == None) or (other[0] != chunk):
+                        matched = False
+                        break
+                if matched:
+                    hits.append({
+                        "spine_index":   spine_index,
+                        "internal_path": document["internal_path"],
+                        "element_id":    document["element_ids"][chunk],
+                        "chunk":         chunk,
+                        "position":      position,
+                        "offset":        offset,
+                    })
+        return hits
+
+    def save(self, path, compresslevel=6):
+        """
+        Save this index to the given path,
+        as a gzip-compressed JSON file.
+
+        :param path:          the path of the output file
+        :type  path:          str
+        :param compresslevel: the gzip compression level (1 to 9)
+        :type  compresslevel: int
+        """
+        data = json.dumps(self.json_object(recursive=True), separators=(",", ":"))
+        with gzip.open(path, "wb", compresslevel=compresslevel) as output_file:
+            output_file.write(data.encode("utf-8"))
+
+    @staticmethod
+    def load(path):
+        """
+        Load an index from the given gzip-compressed JSON file,
+        created by :func:`yael.search.SearchIndex.save`.
+
+        Return None if the file cannot be read
+        or it has a different format version.
+
+        :param path: the path of the input file
+        :type  path: str
+        :rtype:      :class:`yael.search.SearchIndex`
+        """
+        try:
+            with gzip.open(path, "rb") as input_file:
+                obj = json.loads(input_file.read().decode("utf-8"))
+            if obj.get("version") != SearchIndex.FORMAT_VERSION:
+                return None
+            index = SearchIndex()
+            local = {}
+            for k, document in obj["documents"].items():
+                index.documents[int(k)] = document
+                local[int(k)] = {}
+            for term, postings in obj["terms"].items():
+                for k, triples in postings.items():
+                    local[int(k)][term] = triples
+            for spine_index, document_postings in local.items():
+                index._add_postings(spine_index, document_postings)
+            return index
+        except:
+            pass
+        return None
+
+    @property
+    def documents(self):
+        """
+        The indexed Content Documents,
+        as a dictionary mapping each spine index
+        to a dictionary with keys `internal_path`
+        and `element_ids` (the element id of each chunk).
+
+        :rtype: dict
+        """
+        return self.__documents
+
+    @documents.setter
+    def documents(self, documents):
+        self.__documents = documents
+
+    @property
+    def postings(self):
+        """
+        The postings, as a dictionary mapping each term
+        to a dictionary mapping each spine index
+        to the flat list of (chunk, position, offset) triples
+        of the occurrences of the term.
+
+        :rtype: dict
+        """
+        return self.__postings
+
+    @postings.setter
+    def postings(self, postings):
+        self.__postings = postings
+
+
@@ -13,6 +13,9 @@ If you need Multiple Renditions or more control,
 you should use :class:`yael.publication.Publication` instead.
 """
 
+import copy
+
+from yael.contentstats import ContentStatistics
 from yael.dc import DC
 from yael.navnode import NavNode
 from yael.ncxtocnode import NCXTocNode
@@ -43,6 +46,7 @@ class SimpleEPUB(object):
         self.parsing_options = parsing_options
         if parsing_options == None:
             self.parsing_options = [Parsing.NO_MEDIA_OVERLAY]
+        self.__resolved = {}
         self.ebook = Publication(
             path=self.path,
             parsing_options=self.parsing_options)
@@ -244,7 +248,7 @@ class SimpleEPUB(object):
         :rtype: :class:`yael.navelement.NavElement` or
                 :class:`yael.ncxtoc.NCXToc`
         """
-        return self.ebook.container.default_rendition.toc
+        return self.ebook.default_rendition.toc
 
     @property
     def resolved_toc(self):
@@ -253,15 +257,31 @@ class SimpleEPUB(object):
         into the corresponding internal paths
         (relative to the container root).
 
+        The resolved TOC is a copy of :func:`yael.simpleepub.SimpleEPUB.toc`,
+        computed once and then cached.
+
         :rtype: :class:`yael.navelement.NavElement` or
                 :class:`yael.ncxtoc.NCXToc`
         """
-        resolved_toc = self.toc
-        if resolved_toc != None:
-            i_p_toc = resolved_toc.internal_path
-            for node in resolved_toc.children:
-                self._resolve_reference(i_p_toc, node)
-        return resolved_toc
+        return self._resolved_copy(self.toc)
+
+    @property
+    def toc_index(self):
+        """
+        The flattened TOC, with resolved internal paths and fragments.
+
+        :rtype: :class:`yael.tocindex.TOCIndex`
+        """
+        return self.ebook.default_rendition.toc_index
+
+    @property
+    def page_list_index(self):
+        """
+        The index of the page-list (EPUB 3 only).
+
+        :rtype: :class:`yael.pagelistindex.PageListIndex`
+        """
+        return self.ebook.default_rendition.page_list_index
 
     @property
     def landmarks(self):
@@ -270,7 +290,7 @@ class SimpleEPUB(object):
 
         :rtype: :class:`yael.navelement.NavElement`
         """
-        return self.ebook.container.default_rendition.landmarks
+        return self.ebook.default_rendition.landmarks
 
     @property
     def resolved_landmarks(self):
@@ -282,12 +302,7 @@ class SimpleEPUB(object):
 
         :rtype: :class:`yael.navelement.NavElement`
         """
-        resolved_landmarks = self.landmarks
-        if resolved_landmarks != None:
-            i_p_landmarks = resolved_landmarks.internal_path
-            for node in resolved_landmarks.children:
-                self._resolve_reference(i_p_landmarks, node)
-        return resolved_landmarks
+        return self._resolved_copy(self.landmarks)
 
     @property
     def resolved_spine(self):
@@ -297,7 +312,7 @@ class SimpleEPUB(object):
 
         :rtype: list of str
         """
-        return self.ebook.container.default_rendition.pac_document.files_referenced_spine
+        return self.ebook.default_rendition.pac_document.files_referenced_spine
 
     def spine_index_by_internal_path(self, internal_path):
         """
@@ -309,7 +324,7 @@ class SimpleEPUB(object):
         :returns:             the index in the spine, or -1 if not found
         :rtype:               int
         """
-        return self.ebook.container.default_rendition.pac_document.spine_index_by_internal_path(internal_path)
+        return self.ebook.default_rendition.pac_document.spine_index_by_internal_path(internal_path)
 
     @property
     def resolved_spine_linear(self):
@@ -320,7 +335,7 @@ class SimpleEPUB(object):
 
         :rtype: list of str
         """
-        return self.ebook.container.default_rendition.pac_document.files_referenced_spine_linear
+        return self.ebook.default_rendition.pac_document.files_referenced_spine_linear
 
     def spine_linear_index_by_internal_path(self, internal_path):
         """
@@ -332,19 +347,107 @@ class SimpleEPUB(object):
         :returns:             the index in the spine, or -1 if not found
         :rtype:               int
         """
-        return self.ebook.container.default_rendition.pac_document.spine_linear_index_by_internal_path(internal_path)
+        return self.ebook.default_rendition.pac_document.spine_linear_index_by_internal_path(internal_path)
+
+    def statistics(
+            self,
+            words_per_minute=ContentStatistics.DEFAULT_WORDS_PER_MINUTE,
+            max_workers=None):
+        """
+        Compute the word, character, and image counts,
+        and the estimated reading time,
+        of each Content Document in the spine,
+        of the whole spine, and of each TOC entry.
+
+        See :func:`yael.publication.Publication.statistics`.
+
+        :param words_per_minute: the reading speed, in words per minute
+        :type  words_per_minute: int
+        :param max_workers:      the maximum number of parsing threads
+        :type  max_workers:      int
+        :rtype:                  :class:`yael.contentstats.ContentStatistics`
+        """
+        return self.ebook.statistics(
+            words_per_minute=words_per_minute,
+            max_workers=max_workers)
+
+    def text_chunks(self, linear=True, extractor=None):
+        """
+        Yield the text of the Content Documents in the spine,
+        as `(spine_index, internal_path, element_id, text)` chunks.
+
+        See :func:`yael.publication.Publication.text_chunks`.
+
+        :param linear:    if True, skip the spine items
+                          with `linear="no"`
+        :type  linear:    bool
+        :param extractor: the text extractor
+        :type  extractor: :class:`yael.textextractor.TextExtractor`
+        :rtype:           generator of tuple
+        """
+        return self.ebook.text_chunks(linear=linear, extractor=extractor)
+
+    def locate(self, reference):
+        """
+        Return the position of the given reference
+        (internal path, optionally followed by a fragment)
+        in the spine, in the TOC and in the page-list.
+
+        See :func:`yael.rendition.Rendition.locate`.
+
+        :param reference: the reference to be located
+        :type  reference: str
+        :rtype:           dict
+        """
+        return self.ebook.default_rendition.locate(reference)
+
+    def _resolved_copy(self, nav):
+        # resolve a copy of `nav` only once,
+        # so that resolved paths are not resolved again
+        # and the original tree is left untouched
+        if nav == None:
+            return None
+        key = id(nav)
+        if (key not in self.__resolved) or (self.__resolved[key][0] is not nav):
+            resolved = SimpleEPUB._copy_tree(nav)
+            i_p_nav = resolved.internal_path
+            for node in resolved.children:
+                self._resolve_reference(i_p_nav, node)
+            self.__resolved[key] = (nav, resolved)
+        return self.__resolved[key][1]
+
+    @staticmethod
+    def _copy_tree(root):
+        # copy the given tree, node by node, without recursion,
+        # hence arbitrarily deep trees can be copied;
+        # the other attributes (e.g., the asset) are shared
+        root_copy = copy.copy(root)
+        root_copy.children = []
+        # each item is (original node, copy of its parent)
+        stack = list((child, root_copy) for child in reversed(root.children))
+        while len(stack) > 0:
+            node, parent_copy = stack.pop()
+            node_copy = copy.copy(node)
+            node_copy.children = []
+            parent_copy.children.append(node_copy)
+            stack.extend((child, node_copy) for child in reversed(node.children))
+        return root_copy
 
     def _resolve_reference(self, internal_path, node):
-        if (isinstance(node, NavNode)) and (node.v_href != None):
-            node.v_href = yael.util.norm_join_parent(
-                internal_path,
-                node.v_href)
-        if (isinstance(node, NCXTocNode)) and (node.v_src != None):
-            node.v_src = yael.util.norm_join_parent(
-                internal_path,
-                node.v_src)
-        for child in node.children:
-            self._resolve_reference(internal_path, child)
+        # resolve the references of the given node and of its descendants,
+        # without recursion
+        stack = [node]
+        while len(stack) > 0:
+            node = stack.pop()
+            if (isinstance(node, NavNode)) and (node.v_href != None):
+                node.v_href = yael.util.norm_join_parent(
+                    internal_path,
+                    node.v_href)
+            if (isinstance(node, NCXTocNode)) and (node.v_src != None):
+                node.v_src = yael.util.norm_join_parent(
+                    internal_path,
+                    node.v_src)
+            stack.extend(node.children)
 
     def get_dc_metadatum(self, tag, only_first=True, as_string=True):
         """
@@ -359,7 +462,7 @@ class SimpleEPUB(object):
         :type  as_string:  bool
         :rtype:            (list of) str or :class:`yael.opfdc.OPFDC`
         """
-        metadata = self.ebook.container.default_rendition.pac_document.metadata
+        metadata = self.ebook.default_rendition.pac_document.metadata
         titles = metadata.metadata_by_tag(tag)
         if not as_string:
             return titles
@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+A streaming extractor of the text of a Content Document.
+
+The document is parsed with `lxml.etree.iterparse`,
+and each element is cleared (and removed from its parent)
+as soon as its text has been consumed,
+so that the memory usage does not depend
+on the size of the document.
+
+The text is yielded in chunks,
+one for each block-level element (e.g., `<p>` or `<h1>`),
+each with the `id` of the block element
+or of its nearest ancestor having one.
+"""
+
+import lxml.etree
+
+from yael.namespace import Namespace
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+class TextExtractor(object):
+    """
+    Build a text extractor with the given options.
+
+    :param segment_blocks:  if True, yield one chunk
+                            for each block-level element,
+                            otherwise yield one chunk per document
+    :type  segment_blocks:  bool
+    :param skip_epub_types: skip the elements (and their descendants)
+                            having one of these `epub:type` values
+                            (e.g., :const:`yael.textextractor.TextExtractor.NOTES_AND_PAGE_BREAKS`)
+    :type  skip_epub_types: list of str
+    :param block_elements:  the local names of the block-level elements
+                            (if None,
+                            :const:`yael.textextractor.TextExtractor.BLOCK_ELEMENTS`)
+    :type  block_elements:  list of str
+    :param normalize:       if True, collapse whitespace
+                            and omit whitespace-only chunks
+    :type  normalize:       bool
+
+    """
+
+    A_NS_EPUB_TYPE = "{{{0}}}{1}".format(Namespace.EPUB, "type")
+
+    BLOCK_ELEMENTS = frozenset([
+        "address", "article", "aside", "blockquote", "body", "caption",
+        "dd", "details", "div", "dt", "figcaption", "figure", "footer",
+        "h1", "h2", "h3", "h4", "h5", "h6", "header", "li", "nav",
+        "p", "pre", "section", "summary", "td", "th",
+    ])
+    """ The default block-level elements. """
+
+    SKIP_ELEMENTS = frozenset(["head", "script", "style"])
+    """ The elements whose text is never extracted. """
+
+    NOTES_AND_PAGE_BREAKS = [
+        "endnote", "endnotes", "footnote", "footnotes",
+        "note", "pagebreak", "rearnote", "rearnotes",
+    ]
+    """ The `epub:type` values of notes and page breaks. """
+
+    def __init__(
+            self,
+            segment_blocks=True,
+            skip_epub_types=None,
+            block_elements=None,
+            normalize=True):
+        self.segment_blocks = segment_blocks
+        self.skip_epub_types = frozenset(skip_epub_types or [])
+        self.block_elements = TextExtractor.BLOCK_ELEMENTS
+        if block_elements != None:
+            self.block_elements = frozenset(block_elements)
+        self.normalize = normalize
+
+    def chunks(self, source, counts=None):
+        """
+        Yield the text of the given Content Document
+        in `(element_id, text)` chunks, in document order.
+
+        If `counts` is not None, it is updated
+        with the number of (not skipped) elements
+        with each local name, in the same pass.
+
+        :param source: the Content Document, as a binary file-like object
+                       or a file path
+        :type  source: file-like object or str
+        :param counts: the dictionary mapping local names to counts
+        :type  counts: dict
+        :rtype:        generator of tuple
+        """
+
+        # each frame is [element, skipped, block, effective id]
+        stack = []
+        buf = []
+        events = lxml.etree.iterparse(
+            source,
+            events=("start", "end"),
+            recover=True,
+            remove_comments=True,
+            remove_pis=True)
+        for event, elem in events:
+            if event == "start":
+                parent = None
+                if len(stack) > 0:
+                    parent = stack[-1]
+                    # the text of the parent or the tail of the previous
+                    # sibling is complete only now
+                    previous = elem.getprevious()
+                    if previous == None:
+                        pending = parent[0].text
+                    else:
+                        pending = previous.tail
+                        # release the previous siblings, already consumed
+                        while elem.getprevious() != None:
+                            del parent[0][0]
+                    if (pending != None) and (not parent[1]):
+                        buf.append(pending)
+                name = TextExtractor._local_name(elem)
+                skipped = (
+                    ((parent != None) and parent[1]) or
+                    (name in TextExtractor.SKIP_ELEMENTS) or
+                    self._has_skipped_type(elem))
+                block = name in self.block_elements
+                if (counts != None) and (not skipped):
+                    counts[name] = counts.get(name, 0) + 1
+                v_id = elem.get("id")
+                if (v_id == None) and (parent != None):
+                    v_id = parent[3]
+                if block and (not skipped):
+                    chunk = self._flush(buf, parent)
+                    if chunk != None:
+                        yield chunk
+                elif (name == "br") and (not skipped):
+                    buf.append("\n")
+                stack.append([elem, skipped, block, v_id])
+            else:
+                frame = stack.pop()
+                if not frame[1]:
+                    if len(elem) == 0:
+                        pending = elem.text
+                    else:
+                        pending = elem[-1].tail
+                    if pending != None:
+                        buf.append(pending)
+                    if frame[2]:
+                        chunk = self._flush(buf, frame)
+                        if chunk != None:
+                            yield chunk
+                if len(stack) > 0:
+                    # keep the tail, read by the parent
+                    # (as clear(keep_tail=True), which requires lxml 4.4)
+                    tail = elem.tail
+                    elem.clear()
+                    elem.tail = tail
+        if not self.segment_blocks:
+            chunk = self._flush(buf, None, final=True)
+            if chunk != None:
+                yield chunk
+
+    def _flush(self, buf, frame, final=False):
+        # return the chunk for the text accumulated in buf (if any),
+        # attributed to the element of the given frame
+        if (not self.segment_blocks) and (not final):
+            # only separate the blocks
+            buf.append("\n")
+            return None
+        text = "".join(buf)
+        del buf[:]
+        if self.normalize:
+            text = " ".join(text.split())
+            if len(text) == 0:
+                return None
+        elif len(text) == 0:
+            return None
+        v_id = None
+        if (frame != None) and (self.segment_blocks):
+            v_id = frame[3]
+        return (v_id, text)
+
+    def _has_skipped_type(self, elem):
+        if len(self.skip_epub_types) == 0:
+            return False
+        v_type = elem.get(TextExtractor.A_NS_EPUB_TYPE)
+        if v_type == None:
+            return False
+        for value in v_type.split():
+            if value in self.skip_epub_types:
+                return True
+        return False
+
+    @staticmethod
+    def _local_name(elem):
+        tag = elem.tag
+        if not isinstance(tag, str):
+            return None
+        if tag.startswith("{"):
+            return tag.split("}", 1)[1]
+        return tag
+
+    @property
+    def segment_blocks(self):
+        """
+        If True, yield one chunk for each block-level element,
+        otherwise yield one chunk per document.
+
+        :rtype: bool
+        """
+        return self.__segment_blocks
+
+    @segment_blocks.setter
+    def segment_blocks(self, segment_blocks):
+        self.__segment_blocks = segment_blocks
+
+    @property
+    def skip_epub_types(self):
+        """
+        The `epub:type` values of the elements to be skipped.
+
+        :rtype: frozenset of str
+        """
+        return self.__skip_epub_types
+
+    @skip_epub_types.setter
+    def skip_epub_types(self, skip_epub_types):
+        self.__skip_epub_types = skip_epub_types
+
+    @property
+    def block_elements(self):
+        """
+        The local names of the block-level elements.
+
+        :rtype: frozenset of str
+        """
+        return self.__block_elements
+
+    @block_elements.setter
+    def block_elements(self, block_elements):
+        self.__block_elements = block_elements
+
+    @property
+    def normalize(self):
+        """
+        If True, collapse whitespace and omit whitespace-only chunks.
+
+        :rtype: bool
+        """
+        return self.__normalize
+
+    @normalize.setter
+    def normalize(self, normalize):
+        self.__normalize = normalize
+
+
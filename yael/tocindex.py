@@ -0,0 +1,300 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+A flattened, array-backed representation of a TOC tree,
+either a `<nav>` (:class:`yael.navelement.NavElement`)
+or an NCX TOC (:class:`yael.ncxtoc.NCXToc`).
+
+The entries are stored in preorder,
+each with its depth, the index of its parent entry,
+its label, and the resolved internal path and fragment
+of its target.
+The entries whose target is a given internal path
+can be retrieved in constant time.
+"""
+
+import array
+
+from yael.jsonable import JSONAble
+from yael.ncxtocnode import NCXTocNode
+import yael.util
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+class TOCIndex(JSONAble):
+    """
+    Build a flattened TOC index from the given `toc`.
+
+    :param toc: the TOC tree to be flattened
+    :type  toc: :class:`yael.navelement.NavElement` or
+                :class:`yael.ncxtoc.NCXToc`
+
+    """
+
+    NO_PARENT = -1
+    """ The parent index of the top-level entries. """
+
+    def __init__(self, toc=None):
+        self._reset()
+        if toc != None:
+            self.build(toc)
+
+    def json_object(self, recursive=True):
+        obj = {
+            "entries": len(self),
+        }
+        if recursive:
+            obj["entries"] = self.entries
+        return obj
+
+    def __len__(self):
+        return len(self.labels)
+
+    def build(self, toc):
+        """
+        Flatten the given TOC tree,
+        replacing the current contents of this index.
+
+        The tree is visited iteratively,
+        hence arbitrarily deep trees can be flattened.
+
+        :param toc: the TOC tree to be flattened
+        :type  toc: :class:`yael.navelement.NavElement` or
+                    :class:`yael.ncxtoc.NCXToc`
+        """
+
+        self._reset()
+        i_p_toc = toc.internal_path
+        # local aliases, to avoid property lookups in the loop
+        depths = self.depths
+        parents = self.parents
+        ends = self.ends
+        labels = self.labels
+        internal_paths = self.internal_paths
+        fragments = self.fragments
+        nodes = self.nodes
+        by_internal_path = self.__by_internal_path
+        # resolved internal path of each base, sharing equal path strings
+        paths = {}
+        # stack of (node, depth, parent index)
+        stack = list((n, 0, TOCIndex.NO_PARENT) for n in reversed(toc.children))
+        # open entries, whose subtree end is not known yet
+        open_entries = []
+        while len(stack) > 0:
+            node, depth, parent = stack.pop()
+            index = len(labels)
+            while (len(open_entries) > 0) and (
+                    depths[open_entries[-1]] >= depth):
+                ends[open_entries.pop()] = index
+            if isinstance(node, NCXTocNode):
+                label = node.v_text
+                reference = node.v_src
+            else:
+                label = node.v_label
+                reference = node.v_href
+            internal_path = None
+            fragment = None
+            if reference != None:
+                dic = yael.util.split_reference(reference)
+                fragment = dic.get("fragment")
+                base = dic.get("base", "")
+                if base not in paths:
+                    paths[base] = i_p_toc
+                    if len(base) > 0:
+                        paths[base] = yael.util.norm_join_parent(i_p_toc, base)
+                internal_path = paths[base]
+            depths.append(depth)
+            parents.append(parent)
+            ends.append(index + 1)
+            labels.append(label)
+            internal_paths.append(internal_path)
+            fragments.append(fragment)
+            nodes.append(node)
+            if internal_path != None:
+                if internal_path not in by_internal_path:
+                    by_internal_path[internal_path] = []
+                by_internal_path[internal_path].append(index)
+            open_entries.append(index)
+            for child in reversed(node.children):
+                stack.append((child, depth + 1, index))
+        for index in open_entries:
+            ends[index] = len(labels)
+
+    def _reset(self):
+        self.depths = array.array("i")
+        self.parents = array.array("i")
+        self.ends = array.array("i")
+        self.labels = []
+        self.internal_paths = []
+        self.fragments = []
+        self.nodes = []
+        self.__by_internal_path = {}
+
+    def entry(self, index):
+        """
+        Return the entry at the given (preorder) index,
+        as a dictionary with keys
+        `index`, `depth`, `parent`, `label`, `internal_path`, and `fragment`.
+
+        :param index: the index of the entry
+        :type  index: int
+        :rtype:       dict
+        """
+        return {
+            "index":         index,
+            "depth":         self.depths[index],
+            "parent":        self.parents[index],
+            "label":         self.labels[index],
+            "internal_path": self.internal_paths[index],
+            "fragment":      self.fragments[index],
+        }
+
+    @property
+    def entries(self):
+        """
+        The list of entries, in preorder.
+
+        See :func:`yael.tocindex.TOCIndex.entry`.
+
+        :rtype: list of dict
+        """
+        return list(self.entry(i) for i in range(len(self)))
+
+    def indices_by_internal_path(self, internal_path):
+        """
+        Return the (preorder) indices of the entries
+        whose target is the given internal path,
+        with or without fragment.
+
+        :param internal_path: the internal path
+        :type  internal_path: str
+        :returns:             the list of indices (possibly empty)
+        :rtype:               list of int
+        """
+        return self.__by_internal_path.get(internal_path, [])
+
+    def entries_by_internal_path(self, internal_path):
+        """
+        Return the entries whose target is the given internal path,
+        with or without fragment.
+
+        :param internal_path: the internal path
+        :type  internal_path: str
+        :returns:             the list of entries (possibly empty)
+        :rtype:               list of dict
+        """
+        return list(
+            self.entry(i) for i in self.indices_by_internal_path(internal_path))
+
+    @property
+    def internal_paths_referenced(self):
+        """
+        The set of internal paths referenced by at least one entry.
+
+        :rtype: set of str
+        """
+        return set(self.__by_internal_path.keys())
+
+    @property
+    def depths(self):
+        """
+        The depth of each entry (0 for top-level entries).
+
+        :rtype: array of int
+        """
+        return self.__depths
+
+    @depths.setter
+    def depths(self, depths):
+        self.__depths = depths
+
+    @property
+    def parents(self):
+        """
+        The index of the parent of each entry
+        (:const:`yael.tocindex.TOCIndex.NO_PARENT` for top-level entries).
+
+        :rtype: array of int
+        """
+        return self.__parents
+
+    @parents.setter
+    def parents(self, parents):
+        self.__parents = parents
+
+    @property
+    def ends(self):
+        """
+        For each entry, the index following its last descendant,
+        so that its subtree spans the indices `[index, ends[index])`.
+
+        :rtype: array of int
+        """
+        return self.__ends
+
+    @ends.setter
+    def ends(self, ends):
+        self.__ends = ends
+
+    @property
+    def labels(self):
+        """
+        The label of each entry.
+
+        :rtype: list of str
+        """
+        return self.__labels
+
+    @labels.setter
+    def labels(self, labels):
+        self.__labels = labels
+
+    @property
+    def internal_paths(self):
+        """
+        The resolved internal path of the target of each entry,
+        or None if the entry has no target.
+
+        :rtype: list of str
+        """
+        return self.__internal_paths
+
+    @internal_paths.setter
+    def internal_paths(self, internal_paths):
+        self.__internal_paths = internal_paths
+
+    @property
+    def fragments(self):
+        """
+        The fragment of the target of each entry,
+        or None if the target has no fragment.
+
+        :rtype: list of str
+        """
+        return self.__fragments
+
+    @fragments.setter
+    def fragments(self, fragments):
+        self.__fragments = fragments
+
+    @property
+    def nodes(self):
+        """
+        The original TOC node of each entry.
+
+        :rtype: list of :class:`yael.navnode.NavNode` or
+                :class:`yael.ncxtocnode.NCXTocNode`
+        """
+        return self.__nodes
+
+    @nodes.setter
+    def nodes(self, nodes):
+        self.__nodes = nodes
+
+
@@ -5,11 +5,14 @@
 Common utility (static) functions.
 """
 
+import binascii
 import hashlib
 import os
 import re
+import shutil
 
 from yael.obfuscation import Obfuscation
+import yael.profiling
 
 __author__ = "Alberto Pettarin"
 __copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
@@ -43,6 +46,66 @@ def directory_size(path):
             total += os.path.getsize(os.path.join(dir_path, file_name))
     return total
 
+def copy_file(source_path, destination_path):
+    """
+    Copy the file at `source_path` to `destination_path`
+    (overwriting it, if it exists),
+    in kernel space if possible,
+    with `os.copy_file_range` or `os.sendfile`,
+    falling back to a copy in user space.
+
+    The copy continues until the end of the source file,
+    even if the file grows while it is being copied.
+
+    :param source_path:      the path of the file to be copied
+    :type  source_path:      str
+    :param destination_path: the path of the copy
+    :type  destination_path: str
+
+    """
+
+    block_size = 1048576
+    with open(source_path, "rb") as source:
+        with open(destination_path, "wb") as destination:
+            # the size of the file actually open
+            size = os.fstat(source.fileno()).st_size
+            for name in ["copy_file_range", "sendfile"]:
+                function = getattr(os, name, None)
+                if function == None:
+                    continue
+                try:
+                    # copy until the end of the file (count 0)
+                    copied = 0
+                    while True:
+                        if name == "sendfile":
+                            count = function(
+                                destination.fileno(),
+                                source.fileno(),
+                                copied,
+                                max(size - copied, block_size))
+                        else:
+                            count = function(
+                                source.fileno(),
+                                destination.fileno(),
+                                max(size - copied, block_size),
+                                copied,
+                                copied)
+                        if count == 0:
+                            break
+                        copied += count
+                    # some file systems report the end of the file
+                    # before it, then try the next function
+                    if copied >= size:
+                        return
+                except OSError:
+                    # not supported by the file systems,
+                    # try the next function
+                    pass
+                destination.seek(0)
+                destination.truncate()
+            source.seek(0)
+            shutil.copyfileobj(source, destination)
+
 def list_all_files(path):
     """
     List all files in the filesystem tree
@@ -185,7 +248,16 @@ def query_xpath(obj, query, args, nsp, required=None, formatted_query=None):
         xpath_query = query.format(*args)
     else:
         xpath_query = formatted_query
-    result = obj.xpath(xpath_query, namespaces=nsp)
+    profiler = yael.profiling.active_profiler()
+    if profiler == None:
+        result = obj.xpath(xpath_query, namespaces=nsp)
+    else:
+        start = yael.profiling.wall_clock()
+        result = obj.xpath(xpath_query, namespaces=nsp)
+        profiler.add_counter(profiler.COUNTER_XPATH_QUERIES)
+        profiler.add_counter(
+            profiler.COUNTER_XPATH_TIME,
+            yael.profiling.wall_clock() - start)
 
     if (required != None) and (len(result) < 1):
         raise Exception("Cannot find '%s' element" % required)
@@ -279,6 +351,11 @@ def obfuscate_data(data, key, algorithm):
     """
     Obfuscate/deobfuscate data with the given key and algorithm.
 
+    For the "adobe" algorithm, the key is the 16 bytes
+    of the UUID in the given key (e.g., `urn:uuid:...`);
+    if the key is not a hex UUID (e.g., an ISBN),
+    the bytes of the cleaned key are used instead.
+
     :param data:      the data to be obfuscated/deobfuscated
     :type  data:      bytes
     :param key:       the string to be used as the obfuscation key
@@ -295,7 +372,12 @@ def obfuscate_data(data, key, algorithm):
         clean_key = clean_key.replace(u"urn:uuid:", "") # TODO check this
         clean_key = clean_key.replace(u"-", "")
         clean_key = clean_key.replace(u":", "")
-        digest = clean_key
+        try:
+            # the key is the (16 byte) UUID
+            digest = binascii.unhexlify(clean_key.encode("ascii"))
+        except (binascii.Error, TypeError, UnicodeError, ValueError):
+            # not a hex UUID (e.g., an ISBN)
+            digest = clean_key.encode("utf-8")
     elif algorithm == Obfuscation.IDPF:
         outer_max = 52
         inner_max = 20
@@ -0,0 +1,447 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+A report of the violations of the structural rules
+of the Package Documents, Navigation Documents, and NCX TOCs
+of a Publication.
+
+The container must have at least one OPF rootfile,
+and each Package Document must be parsed (`parse` error otherwise).
+The rules are then checked on the parsed model,
+in one pass over each list, using its indexes:
+
+1. the `id` values in each Package Document are unique,
+   and each manifest item has one;
+2. the spine `idref` values and the spine `toc` value
+   resolve to manifest items;
+3. the `unique-identifier` attribute resolves
+   to a `<dc:identifier>` element;
+4. the `refines` values resolve to
+   a metadatum or to a manifest item;
+5. the NCX `playOrder` values are integers,
+   not decreasing in document order,
+   and equal only for navigation points with the same target;
+6. an EPUB 3 Package Document has exactly one Navigation Document
+   with a `toc` nav, an EPUB 2 Package Document has an NCX TOC.
+
+To validate many files quickly,
+build the report from the path of the file:
+the Publication is parsed with
+:data:`yael.validate.ValidationReport.PARSING_OPTIONS`,
+that is, only the documents needed by the rules,
+with the Navigation Documents and the NCX TOCs in streaming mode.
+"""
+
+from yael.dc import DC
+from yael.epub import EPUB
+from yael.jsonable import JSONAble
+from yael.mediatype import MediaType
+from yael.opfitem import OPFItem
+from yael.opfmeta3 import OPFMeta3
+from yael.parsing import Parsing
+
+__author__ = "Alberto Pettarin"
+__copyright__ = "Copyright 2015, Alberto Pettarin (www.albertopettarin.it)"
+__license__ = "MIT"
+__version__ = "0.0.9"
+__email__ = "alberto@albertopettarin.it"
+__status__ = "Development"
+
+class ValidationReport(JSONAble):
+    """
+    Build the validation report of the given `publication`,
+    or of the Publication at the given `path`.
+
+    If the Publication at the given `path` cannot be parsed,
+    the report contains one `parse` error.
+
+    :param publication: the Publication
+    :type  publication: :class:`yael.publication.Publication`
+    :param path:        the path of the EPUB file or directory
+    :type  path:        str
+
+    """
+
+    ERROR = "error"
+    """ The severity of a violation making the Publication invalid. """
+
+    WARNING = "warning"
+    """ The severity of a violation not making the Publication invalid. """
+
+    PARSE = "parse"
+    """ The Publication, or one of its Package Documents, cannot be parsed. """
+
+    CONTAINER = "container"
+    """ The container has no (OPF) rootfile. """
+
+    DUPLICATE_ID = "duplicate-id"
+    """ An `id` value is used more than once in a Package Document. """
+
+    MISSING_ID = "missing-id"
+    """ A manifest item has no `id`. """
+
+    SPINE_IDREF = "spine-idref"
+    """ A spine `idref` does not resolve to a manifest item. """
+
+    SPINE_TOC = "spine-toc"
+    """ The spine `toc` does not resolve to a manifest item. """
+
+    UNIQUE_IDENTIFIER = "unique-identifier"
+    """ The `unique-identifier` does not resolve to a `<dc:identifier>`. """
+
+    REFINES = "refines"
+    """ A `refines` value does not resolve to a metadatum or to an item. """
+
+    PLAY_ORDER = "play-order"
+    """ The NCX `playOrder` values are not consistent. """
+
+    NAV = "nav"
+    """ An EPUB 3 Package Document has no (valid) Navigation Document. """
+
+    NCX = "ncx"
+    """ An EPUB 2 Package Document has no NCX TOC. """
+
+    PARSING_OPTIONS = [
+        Parsing.NO_ASSET_REFS,
+        Parsing.NO_ENCRYPTION,
+        Parsing.NO_MEDIA_OVERLAY,
+        Parsing.STREAMING,
+    ]
+    """ The parsing options used when validating the file at a path. """
+
+    def __init__(self, publication=None, path=None):
+        self._reset()
+        if publication != None:
+            self.build(publication)
+        elif path != None:
+            self.build_from_path(path)
+
+    def json_object(self, recursive=True):
+        obj = {
+            "valid":    self.valid,
+            "errors":   len(self.errors),
+            "warnings": len(self.warnings),
+        }
+        if recursive:
+            obj["errors"] = self.errors
+            obj["warnings"] = self.warnings
+        return obj
+
+    def build_from_path(self, path):
+        """
+        Parse the Publication at the given path
+        with :data:`yael.validate.ValidationReport.PARSING_OPTIONS`,
+        and check it,
+        replacing the current contents of this report.
+
+        :param path: the path of the EPUB file or directory
+        :type  path: str
+        """
+        # imported here, as the Publication module imports this one
+        from yael.publication import Publication
+        try:
+            publication = Publication(
+                path=path,
+                parsing_options=ValidationReport.PARSING_OPTIONS)
+        except Exception as exc:
+            self._reset()
+            self._add(ValidationReport.ERROR, ValidationReport.PARSE, path, str(exc))
+            return
+        self.build(publication)
+
+    def build(self, publication):
+        """
+        Check the parsed Renditions of the given Publication,
+        replacing the current contents of this report.
+
+        :param publication: the Publication
+        :type  publication: :class:`yael.publication.Publication`
+        """
+        self._reset()
+        container = publication.container
+        if (container == None) or (len(container.renditions) == 0):
+            self._add(
+                ValidationReport.ERROR,
+                ValidationReport.CONTAINER,
+                EPUB.INTERNAL_PATH_CONTAINER_XML,
+                "The container has no rootfile")
+            return
+        if not any(r.v_media_type == MediaType.OPF for r in container.renditions):
+            self._add(
+                ValidationReport.ERROR,
+                ValidationReport.CONTAINER,
+                EPUB.INTERNAL_PATH_CONTAINER_XML,
+                "The container has no OPF Package Document rootfile")
+        for rendition in container.renditions:
+            if (rendition.v_media_type != MediaType.OPF) or (not rendition.parsed):
+                # not a Package Document, or not parsed (lazy renditions)
+                continue
+            pac_document = rendition.pac_document
+            if (
+                    (pac_document == None) or
+                    (pac_document.metadata == None) or
+                    (pac_document.manifest == None) or
+                    (pac_document.spine == None)):
+                self._add(
+                    ValidationReport.ERROR,
+                    ValidationReport.PARSE,
+                    rendition.v_full_path,
+                    "The Package Document is missing or it cannot be parsed")
+                continue
+            self._check_ids(rendition.pac_document)
+            self._check_spine(rendition.pac_document)
+            self._check_unique_identifier(rendition.pac_document)
+            self._check_refines(rendition.pac_document)
+            self._check_navigation(rendition)
+            if rendition.ncx_toc != None:
+                self._check_play_order(rendition.ncx_toc)
+
+    def _reset(self):
+        self.messages = []
+
+    def _add(self, severity, rule, internal_path, message):
+        self.messages.append({
+            "severity":      severity,
+            "rule":          rule,
+            "internal_path": internal_path,
+            "message":       message,
+        })
+
+    def _check_ids(self, pac_document):
+        # rule 1: unique `id` values, manifest items with `id`
+        i_p_opf = pac_document.internal_path
+        ids = set()
+        def check(v_id, kind):
+            if v_id == None:
+                return
+            if v_id in ids:
+                self._add(
+                    ValidationReport.ERROR,
+                    ValidationReport.DUPLICATE_ID,
+                    i_p_opf,
+                    "Duplicate id '%s' (%s)" % (v_id, kind))
+            ids.add(v_id)
+        check(pac_document.v_id, "package")
+        for metadatum in pac_document.metadata.metadata:
+            check(metadatum.v_id, "metadatum")
+        for link in pac_document.metadata.links:
+            check(link.v_id, "link")
+        for item in pac_document.manifest.items:
+            if item.v_id == None:
+                self._add(
+                    ValidationReport.ERROR,
+                    ValidationReport.MISSING_ID,
+                    i_p_opf,
+                    "Manifest item '%s' has no id" % item.v_href)
+            check(item.v_id, "manifest item")
+        for itemref in pac_document.spine.itemrefs:
+            check(itemref.v_id, "spine itemref")
+
+    def _check_spine(self, pac_document):
+        # rule 2: spine `idref` and `toc` values resolve
+        i_p_opf = pac_document.internal_path
+        manifest = pac_document.manifest
+        for itemref in pac_document.spine.itemrefs:
+            if manifest.item_by_id(itemref.v_idref) == None:
+                self._add(
+                    ValidationReport.ERROR,
+                    ValidationReport.SPINE_IDREF,
+                    i_p_opf,
+                    "Spine idref '%s' does not resolve to a manifest item" % itemref.v_idref)
+        v_toc = pac_document.spine.v_toc
+        if v_toc != None:
+            item = manifest.item_by_id(v_toc)
+            if item == None:
+                self._add(
+                    ValidationReport.ERROR,
+                    ValidationReport.SPINE_TOC,
+                    i_p_opf,
+                    "Spine toc '%s' does not resolve to a manifest item" % v_toc)
+            elif item.v_media_type != MediaType.NCX:
+                self._add(
+                    ValidationReport.ERROR,
+                    ValidationReport.SPINE_TOC,
+                    i_p_opf,
+                    "Spine toc '%s' is not an NCX TOC" % v_toc)
+
+    def _check_unique_identifier(self, pac_document):
+        # rule 3: `unique-identifier` resolves to a `<dc:identifier>`
+        i_p_opf = pac_document.internal_path
+        u_i_id = pac_document.v_unique_identifier_id
+        if u_i_id == None:
+            self._add(
+                ValidationReport.ERROR,
+                ValidationReport.UNIQUE_IDENTIFIER,
+                i_p_opf,
+                "The package has no unique-identifier attribute")
+            return
+        metadatum = pac_document.metadata.metadatum_by_id(u_i_id)
+        if metadatum == None:
+            self._add(
+                ValidationReport.ERROR,
+                ValidationReport.UNIQUE_IDENTIFIER,
+                i_p_opf,
+                "The unique-identifier '%s' does not resolve to a metadatum" % u_i_id)
+        elif getattr(metadatum, "v_tag", None) != DC.E_NS_IDENTIFIER:
+            self._add(
+                ValidationReport.ERROR,
+                ValidationReport.UNIQUE_IDENTIFIER,
+                i_p_opf,
+                "The unique-identifier '%s' does not resolve to a dc:identifier" % u_i_id)
+        elif not metadatum.v_text:
+            self._add(
+                ValidationReport.ERROR,
+                ValidationReport.UNIQUE_IDENTIFIER,
+                i_p_opf,
+                "The unique-identifier '%s' is empty" % u_i_id)
+
+    def _check_refines(self, pac_document):
+        # rule 4: `refines` values resolve to a metadatum or an item
+        i_p_opf = pac_document.internal_path
+        ids = set(m.v_id for m in pac_document.metadata.metadata if m.v_id != None)
+        ids.update(i.v_id for i in pac_document.manifest.items if i.v_id != None)
+        refining = list(m for m in pac_document.metadata.metadata if isinstance(m, OPFMeta3))
+        refining.extend(pac_document.metadata.links)
+        for metadatum in refining:
+            v_refines = metadatum.v_refines
+            if (v_refines == None) or (not v_refines.startswith("#")):
+                # only same-document references can be checked
+                continue
+            if v_refines[1:] not in ids:
+                self._add(
+                    ValidationReport.ERROR,
+                    ValidationReport.REFINES,
+                    i_p_opf,
+                    "The refines '%s' does not resolve to a metadatum or an item" % v_refines)
+
+    def _check_navigation(self, rendition):
+        # rule 6: Navigation Document (EPUB 3) or NCX TOC (EPUB 2)
+        pac_document = rendition.pac_document
+        i_p_opf = pac_document.internal_path
+        v_version = pac_document.v_version or ""
+        if v_version.startswith("3"):
+            nav_items = list(
+                i for i in pac_document.manifest.items
+                if OPFItem.V_NAV in i.properties)
+            if len(nav_items) == 0:
+                self._add(
+                    ValidationReport.ERROR,
+                    ValidationReport.NAV,
+                    i_p_opf,
+                    "No manifest item has the nav property")
+                return
+            if len(nav_items) > 1:
+                self._add(
+                    ValidationReport.ERROR,
+                    ValidationReport.NAV,
+                    i_p_opf,
+                    "%d manifest items have the nav property" % len(nav_items))
+            if nav_items[0].v_media_type != MediaType.XHTML:
+                self._add(
+                    ValidationReport.ERROR,
+                    ValidationReport.NAV,
+                    i_p_opf,
+                    "The Navigation Document is not an XHTML Content Document")
+            # the Navigation Document is None if it was not parsed
+            if (rendition.nav_document != None) and (rendition.nav_document.toc == None):
+                self._add(
+                    ValidationReport.ERROR,
+                    ValidationReport.NAV,
+                    rendition.nav_document.internal_path,
+                    "The Navigation Document has no toc nav")
+        elif v_version.startswith("2"):
+            if pac_document.internal_path_ncx_toc == None:
+                self._add(
+                    ValidationReport.ERROR,
+                    ValidationReport.NCX,
+                    i_p_opf,
+                    "The EPUB 2 Package Document has no NCX TOC")
+
+    def _check_play_order(self, ncx_toc):
+        # rule 5: NCX `playOrder` values, in document order
+        i_p_ncx = ncx_toc.internal_path
+        targets = {}
+        previous = None
+        # depth-first, in document order, without recursion
+        stack = list(reversed(ncx_toc.children))
+        while len(stack) > 0:
+            node = stack.pop()
+            stack.extend(reversed(node.children))
+            if node.v_play_order == None:
+                self._add(
+                    ValidationReport.WARNING,
+                    ValidationReport.PLAY_ORDER,
+                    i_p_ncx,
+                    "The navPoint '%s' has no playOrder" % node.v_id)
+                continue
+            try:
+                play_order = int(node.v_play_order)
+            except ValueError:
+                self._add(
+                    ValidationReport.ERROR,
+                    ValidationReport.PLAY_ORDER,
+                    i_p_ncx,
+                    "The navPoint '%s' has a non-integer playOrder '%s'" % (
+                        node.v_id, node.v_play_order))
+                continue
+            target = targets.setdefault(play_order, node.v_src)
+            if target != node.v_src:
+                self._add(
+                    ValidationReport.ERROR,
+                    ValidationReport.PLAY_ORDER,
+                    i_p_ncx,
+                    "The navPoint '%s' has playOrder %d, as a navPoint with a different target" % (
+                        node.v_id, play_order))
+            if (previous != None) and (play_order < previous):
+                self._add(
+                    ValidationReport.ERROR,
+                    ValidationReport.PLAY_ORDER,
+                    i_p_ncx,
+                    "The navPoint '%s' has playOrder %d, after playOrder %d" % (
+                        node.v_id, play_order, previous))
+            previous = play_order
+
+    @property
+    def valid(self):
+        """
+        True if no error was found.
+
+        :rtype: bool
+        """
+        return len(self.errors) == 0
+
+    @property
+    def errors(self):
+        """
+        The violations with severity `error`.
+
+        :rtype: list of dict
+        """
+        return list(m for m in self.messages if m["severity"] == ValidationReport.ERROR)
+
+    @property
+    def warnings(self):
+        """
+        The violations with severity `warning`.
+
+        :rtype: list of dict
+        """
+        return list(m for m in self.messages if m["severity"] == ValidationReport.WARNING)
+
+    @property
+    def messages(self):
+        """
+        The violations, in the order they were found,
+        as a list of dictionaries with keys
+        `severity`, `rule`, `internal_path`, and `message`.
+
+        :rtype: list of dict
+        """
+        return self.__messages
+
+    @messages.setter
+    def messages(self, messages):
+        self.__messages = messages
+
+